@@ -0,0 +1,40 @@
+"""
+Throughput of jolang.batch as the number of worker processes grows.
+
+    python -m benchmarks.batch [-n 200] [-e tree] [-j 1 2 4]
+"""
+import os
+import time
+import argparse
+from jolang import batch
+from jolang.interpreter import engines
+
+
+def script(i):
+    # a few milliseconds of work each, and every tenth fails
+    return (f"s{i}.jo", f"total = 0\nfor (j = 0; j < 2000; j += 1) {{\ntotal += j * {i} % 7\n}}\nprint(total)"
+                        + ("\nprint(total + 'a')" if i % 10 == 0 else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=200, help="number of scripts")
+    parser.add_argument("-e", "--engine", default="tree", choices=sorted(engines))
+    cores = os.cpu_count() or 1
+    parser.add_argument("-j", "--workers", type=int, nargs="+",
+                        default=sorted({1, *(2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores), cores}))
+    args = parser.parse_args(argv)
+    scripts = [script(i) for i in range(args.n)]
+    print(f"{args.n} scripts, {cores} cores")
+    base = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = list(batch.run(scripts, args.engine, workers))
+        elapsed = time.perf_counter() - start
+        assert sum(not result.ok for result in results) == len(range(0, args.n, 10))
+        base = base or elapsed
+        print(f"{workers:>3} workers {elapsed:8.2f}s {args.n / elapsed:10.1f} scripts/s   x{base / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Bytes per element of a JoLang Array holding n boxed values.
+
+    python -m benchmarks.memory [-n 1000000]
+"""
+import argparse
+import gc
+import tracemalloc
+from jolang.interpreter.stdlib.builtin_types.Array import Array
+from jolang.interpreter.stdlib.builtin_types.Integer import Integer, Float
+from jolang.interpreter.stdlib.builtin_types.String import String
+
+# past the shared small ints, so every element is a box of its own
+START = 10 ** 6
+
+cases = {
+    "int (python list)": lambda n: [START + i for i in range(n)],
+    "Integer": lambda n: Array([Integer(START + i) for i in range(n)]),
+    "Float": lambda n: Array([Float(START + i + .5) for i in range(n)]),
+    "String": lambda n: Array([String(str(START + i)) for i in range(n)]),
+}
+
+
+def measure(build, n):
+    gc.collect()
+    tracemalloc.start()
+    value = build(n)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size / n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=1_000_000, help="number of elements")
+    args = parser.parse_args(argv)
+    for name, build in cases.items():
+        print(f"{name:<20}{measure(build, args.n):8.1f} bytes/element")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Parse time of programs of more and more array literals, constant per literal when parsing is linear.
+
+    python -m benchmarks.scaling [--literals 100000] [--steps 4]
+
+Programs of literals / 2 ** (steps - 1) up to literals lines are parsed, each line assigning an array literal.
+"""
+import time
+import argparse
+from jolang.tokenizer import Tokenizer
+from jolang.preprocessor import preprocess
+from jolang.parser import Parser
+
+
+def arrays(n):
+    return "\n".join(f"a{i % 100} = [{i}, {i} + 1, x{i % 7}]" for i in range(n))
+
+
+def parse_time(n):
+    # tokenized beforehand, only parsing is timed
+    tokens = list(preprocess(Tokenizer(arrays(n)).tokenize()))
+    start = time.perf_counter()
+    Parser(iter(tokens)).parse()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--literals", type=int, default=100_000, help="array literals of the largest program")
+    parser.add_argument("--steps", type=int, default=4, help="programs parsed, each twice the previous one")
+    args = parser.parse_args(argv)
+    print(f"{'literals':>10}{'seconds':>10}{'us/literal':>12}")
+    for step in reversed(range(args.steps)):
+        n = args.literals >> step
+        seconds = parse_time(n)
+        print(f"{n:>10}{seconds:>10.3f}{seconds / n * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
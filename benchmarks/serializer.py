@@ -0,0 +1,51 @@
+"""
+Encode/decode throughput of jolang.parser.serializer against pickle, on a synthetic program of n functions.
+
+    python -m benchmarks.serializer [-n 2000] [-r 5]
+"""
+import argparse
+import pickle
+import timeit
+from jolang.tokenizer import Tokenizer
+from jolang.preprocessor import preprocess
+from jolang.parser import Parser, serializer
+
+
+def program(n):
+    return "\n".join(
+        f"func f{i}(a, b) {{\n"
+        f"    c = a * {i} + b / 2.5\n"
+        f"    for (j = 0; j < c; j += 1) {{\n"
+        f"        if (j % 3 == 0) {{c -= 1}} elif (j > {i}) {{break}} else {{print(\"f{i}\", [j, c][0])}}\n"
+        f"    }}\n"
+        f"    return c\n"
+        f"}}\n"
+        f"print(f{i}({i}, -2))"
+        for i in range(n)
+    )
+
+
+formats = {
+    "jolang.parser.serializer": (serializer.dumps, serializer.loads),
+    "pickle": (lambda node: pickle.dumps(node, pickle.HIGHEST_PROTOCOL), pickle.loads),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000, help="number of functions")
+    parser.add_argument("-r", type=int, default=5, help="repeats, the best one counts")
+    args = parser.parse_args(argv)
+    node = Parser(preprocess(Tokenizer(program(args.n)).tokenize())).parse()
+    print(f"{'':<26}{'bytes':>10}{'encode MB/s':>14}{'decode MB/s':>14}")
+    for name, (dumps, loads) in formats.items():
+        data = dumps(node)
+        assert repr(loads(data)) == repr(node)
+        encode = min(timeit.repeat(lambda: dumps(node), number=1, repeat=args.r))
+        decode = min(timeit.repeat(lambda: loads(data), number=1, repeat=args.r))
+        print(f"{name:<26}{len(data):>10}{len(data) / encode / 1e6:>14.1f}{len(data) / decode / 1e6:>14.1f}"
+              f"   ({encode * 1e3:.1f}ms / {decode * 1e3:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Peak RSS of tokenizing and preprocessing a large generated source read whole, from its path or from an mmap.
+
+    python -m benchmarks.streaming [--size 100] [--chunk-size 65536] [--modes string path mmap]
+
+Every mode runs in a process of its own, so the peak is that run's. The pages of an mmap count in its RSS once read,
+but the kernel can drop them as they're clean.
+"""
+import os
+import sys
+import json
+import mmap
+import time
+import pathlib
+import argparse
+import resource
+import tempfile
+import subprocess
+from jolang.tokenizer import Tokenizer
+from jolang.preprocessor import preprocess
+from benchmarks.suite import generated
+
+MODES = ("string", "path", "mmap")
+
+
+def write(path, size):
+    # the generated program repeated until it's size bytes long
+    block = (generated(10_000) + "\n").encode()
+    with open(path, "wb") as f:
+        for _ in range(size // len(block) + 1):
+            f.write(block)
+
+
+def run(mode, path, chunk_size):
+    start = time.perf_counter()
+    if mode == "string":
+        with open(path, encoding="utf-8") as f:
+            tokenizer = Tokenizer(f.read())
+    elif mode == "path":
+        tokenizer = Tokenizer(pathlib.Path(path), chunk_size=chunk_size)
+    else:
+        f = open(path, "rb")
+        tokenizer = Tokenizer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), chunk_size=chunk_size)
+    # the last item preprocess yields is the macros
+    count = sum(1 for _ in preprocess(tokenizer.tokenize())) - 1
+    return {
+        "tokens": count, "seconds": time.perf_counter() - start,
+        "peak": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100, help="megabytes of source")
+    parser.add_argument("--chunk-size", type=int, default=Tokenizer.CHUNK_SIZE, help="bytes read at a time")
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        print(json.dumps(run(*args.child, args.chunk_size)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "generated.jo")
+        write(path, args.size * 1024 * 1024)
+        print(f"{'mode':<10}{'tokens':>12}{'seconds':>10}{'peak MiB':>10}")
+        for mode in args.modes:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.streaming", "--chunk-size", str(args.chunk_size), "--child", mode,
+                 path], check=True, capture_output=True, text=True).stdout
+            result = json.loads(out)
+            print(f"{mode:<10}{result['tokens']:>12}{result['seconds']:>10.2f}{result['peak'] / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
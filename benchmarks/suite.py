@@ -0,0 +1,154 @@
+"""
+Times the tokenizer, preprocessor, parser and interpreter on canonical JoLang programs.
+
+    python -m benchmarks.suite [-e tree] [-r 3] [--lines 100000] [--only fib loops...] [--output results.json]
+                               [--baseline benchmarks/baseline.json] [--threshold 0.2] [--save]
+
+Every stage runs once traced with tracemalloc for its peak memory, then `repeat` times for the best time.
+With a baseline (--save writes one), a stage more than `threshold` slower or bigger than it fails the run.
+"""
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+import tracemalloc
+import jolang
+from jolang.tokenizer import Tokenizer
+from jolang.preprocessor import preprocess
+from jolang.parser import Parser
+from jolang.interpreter import engines, file
+from jolang.interpreter.errors import Exit
+
+PROGRAMS = os.path.join(os.path.dirname(__file__), "programs")
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def macros(n):
+    # n macros, every line after them expanding three
+    lines = ["total = 0"]
+    lines += [f"%macro M{i} ({i} * {i % 5 + 1} + {i % 3})" for i in range(n)]
+    lines += [f"total += M{i % n} + M{(i * 7) % n} - M{(i * 13) % n}" for i in range(n * 10)]
+    lines.append("print(total)")
+    return "\n".join(lines)
+
+
+def generated(lines):
+    # a long program of small functions, each defined and called once
+    out = ["total = 0"]
+    i = 0
+    while len(out) < lines - 1:
+        out += [f"func f{i}(a, b) {{", f"c = a * {i % 7 + 1} + b", "if (c % 2 == 0) {", "c = c / 2", "}", "return c % 1000", "}",
+                f"v{i} = f{i}({i}, {i % 13}) + {i % 100}", f"total += v{i} % 10"]
+        i += 1
+    out.append("print(total)")
+    return "\n".join(out)
+
+
+def programs(lines):
+    found = {}
+    for name in sorted(os.listdir(PROGRAMS)):
+        if name.endswith(".jo"):
+            with open(os.path.join(PROGRAMS, name), encoding="utf-8") as f:
+                found[name[:-3]] = f.read()
+    found["macros"] = macros(200)
+    found["generated"] = generated(lines)
+    return found
+
+
+def stages(code, engine):
+    # the stages in order, each a function of the previous one's result
+    yield "tokenize", lambda _: list(Tokenizer(code).tokenize())
+    yield "preprocess", lambda tokens: list(preprocess(iter(tokens)))
+    yield "parse", lambda tokens: Parser(iter(tokens)).parse()
+
+    def interpret(node):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return engines[engine](file.File(code, "benchmark", node)).eval()
+        except Exit as e:
+            # its traceback went to the discarded output
+            raise SystemExit(e.error.format().rstrip()) from None
+    yield "interpret", interpret
+
+
+def measure(code, engine, repeat):
+    results, value = {}, None
+    for stage, run in stages(code, engine):
+        tracemalloc.start()
+        result = run(value)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(value)
+            best = min(best, time.perf_counter() - start)
+        results[stage] = {"seconds": best, "peak": peak}
+        value = result
+    return results
+
+
+def compare(results, baseline, threshold):
+    # (program, stage, what, ratio) of everything over the threshold
+    regressions = []
+    for program, measured in results.items():
+        for stage, values in measured.items():
+            base = baseline.get(program, {}).get(stage)
+            if base is None:
+                continue
+            for what in ("seconds", "peak"):
+                if base[what] and values[what] / base[what] > 1 + threshold:
+                    regressions.append((program, stage, what, values[what] / base[what]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-e", "--engine", default="tree", choices=sorted(engines))
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="timed runs of every stage, the best one counts")
+    parser.add_argument("--lines", type=int, default=100_000, help="lines of the generated program")
+    parser.add_argument("--only", nargs="+", default=None, help="the programs to run")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="the results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="how much slower or bigger than the baseline fails")
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'program':<12}{'stage':<12}{'seconds':>10}{'peak KiB':>12}")
+    for name, code in programs(args.lines).items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = measure(code, args.engine, args.repeat)
+        for stage, values in results[name].items():
+            print(f"{name:<12}{stage:<12}{values['seconds']:>10.4f}{values['peak'] / 1024:>12.1f}")
+    report = {
+        "jolang": jolang.__version__, "python": platform.python_version(), "engine": args.engine,
+        "repeat": args.repeat, "lines": args.lines, "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if (baseline["engine"], baseline["lines"]) != (args.engine, args.lines):
+        print(f"the baseline is of the {baseline['engine']} engine and {baseline['lines']} lines, not compared")
+        return 0
+    regressions = compare(results, baseline["results"], args.threshold)
+    for program, stage, what, ratio in regressions:
+        print(f"regression: {program} {stage} {what} is {ratio:.2f}x the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
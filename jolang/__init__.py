@@ -1 +1,4 @@
+__version__ = "0.1.0"
+
 from .main import main
+from .embed import Runtime
@@ -0,0 +1 @@
+from .batch import Result, run, run_script
@@ -0,0 +1,47 @@
+"""
+Runs JoLang scripts in parallel.
+
+    python -m jolang.batch [-e ENGINE] [-j WORKERS] [--cache DIRECTORY] [--steps N] [--seconds S] [--memory BYTES]
+                           [--json] script.jo...
+"""
+import sys
+import json
+import argparse
+from .batch import run
+from ..interpreter.budget import Budget
+from ..interpreter import engines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scripts", nargs="+", help="the scripts to run")
+    parser.add_argument("-e", "--engine", default="tree", choices=sorted(engines))
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of processes, one per core by default")
+    parser.add_argument("--cache", default=None, help="directory to cache parsed scripts in")
+    parser.add_argument("--steps", type=int, default=None, help="most loop iterations and calls a script may run")
+    parser.add_argument("--seconds", type=float, default=None, help="most time a script may run for")
+    parser.add_argument("--memory", type=int, default=None, help="most bytes a script may allocate")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per script")
+    args = parser.parse_args(argv)
+    scripts = []
+    for path in args.scripts:
+        with open(path, encoding="utf-8") as f:
+            scripts.append((path, f.read()))
+    budget = None
+    if args.steps is not None or args.seconds is not None or args.memory is not None:
+        budget = Budget(args.steps, args.seconds, args.memory)
+    failed = 0
+    for result in run(scripts, args.engine, args.workers, args.cache, budget=budget):
+        failed += not result.ok
+        if args.json:
+            print(json.dumps(result._asdict()))
+        else:
+            print(f"==> {result.name} ({'ok' if result.ok else 'failed'}, {result.elapsed:.3f}s)")
+            sys.stdout.write(result.stdout)
+            if not result.ok:
+                sys.stdout.write(result.error)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
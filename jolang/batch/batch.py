@@ -0,0 +1,80 @@
+import io
+import os
+import sys
+import time
+import typing
+import contextlib
+import collections
+import concurrent.futures
+import traceback
+from ..main import main
+from ..cache import Cache
+from ..interpreter.budget import Budget
+from ..interpreter.errors import Exit, print_traceback
+
+# ok: whether the script ran to the end; stdout: everything it printed; error: the JoLang traceback
+# or Python exception it stopped with, None if ok; elapsed: seconds spent running it in the worker
+Result = collections.namedtuple("Result", "name ok stdout error elapsed")
+
+# the settings of the worker process, see warm_up
+worker = {"engine": "tree", "cache": None, "budget": None}
+
+
+def run_script(name: str, code: str, engine: str = None, cache: typing.Optional[Cache] = None, stdin: str = "",
+               budget: typing.Optional[Budget] = None) -> Result:
+    # runs one script with its stdout captured, whatever way it fails
+    engine = engine or worker["engine"]
+    cache = cache or worker["cache"]
+    budget = budget or worker["budget"]
+    stdout = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    token = print_traceback.set(False)
+    with contextlib.redirect_stdout(stdout), replace_stdin(stdin), budget or contextlib.nullcontext():
+        try:
+            main(code, engine, cache=cache, name=name)
+        except Exit as e:
+            error = e.error.format()
+        except Exception as e:
+            error = "".join(traceback.format_exception_only(type(e), e))
+        finally:
+            print_traceback.reset(token)
+    return Result(name, error is None, stdout.getvalue(), error, time.perf_counter() - start)
+
+
+@contextlib.contextmanager
+def replace_stdin(text: str):
+    # what input() reads, the worker's own stdin isn't the script's
+    stdin, sys.stdin = sys.stdin, io.StringIO(text)
+    try:
+        yield
+    finally:
+        sys.stdin = stdin
+
+
+def warm_up(engine: str, cache_directory: typing.Optional[str], budget: typing.Optional[Budget] = None):
+    # the initializer of every worker: settings, and a first run so imports and per-class tables are ready
+    worker["engine"] = engine
+    worker["cache"] = Cache(cache_directory) if cache_directory else None
+    worker["budget"] = budget
+    run_script("warm-up", "func f(n) {\nreturn n * 2 + 1\n}\nprint(f(1) < f(2), 'a' * 2, [1.5][0])", engine, None)
+
+
+def run_pair(script: typing.Tuple[str, str]) -> Result:
+    return run_script(*script)
+
+
+def run(scripts: typing.Iterable[typing.Tuple[str, str]], engine: str = "tree", workers: int = None,
+        cache: str = None, chunksize: int = None, budget: Budget = None) -> typing.Iterator[Result]:
+    """
+    Runs (name, code) scripts on a pool of processes, yields their Results in order.
+    cache: a directory for jolang.cache, shared by the workers
+    budget: the limits every script runs with, one going over them fails with a BudgetError
+    """
+    scripts = list(scripts)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # a few chunks per worker, so a slow chunk doesn't hold the others back
+        chunksize = max(1, len(scripts) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=warm_up, initargs=(engine, cache, budget)) as executor:
+        yield from executor.map(run_pair, scripts, chunksize=chunksize)
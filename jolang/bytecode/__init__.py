@@ -0,0 +1,2 @@
+from .compiler import Compiler, Code
+from .dis import dis
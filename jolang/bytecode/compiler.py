@@ -0,0 +1,224 @@
+import builtins
+from ..parser import ast
+from ..interpreter.stdlib.builtin_types.Integer import Integer, Float
+from ..interpreter.stdlib.builtin_types.String import String
+from .opcodes import *
+
+
+class Code:
+    def __init__(self, name: str, parameters: list, body: list):
+        self.name = name
+        self.parameters = parameters
+        self.body = body
+        self.instructions = []
+        self.consts = []
+        self.names = []
+        # (line, column) of the node each instruction came from, for error stacks
+        self.positions = []
+
+    def __repr__(self):
+        return f"<code {self.name!r}>"
+
+
+class Compiler:
+    statements = (ast.Function, ast.If, ast.While, ast.For, ast.Break, ast.Continue, ast.Return)
+
+    def __init__(self, code: Code, function: bool = False):
+        self.code = code
+        self.function = function  # return isn't a tail call in the module
+        self.loops = []  # (continue jumps, break jumps) of the enclosing loops, patched once the loop is done
+        self.const_indexes = {}
+
+    @classmethod
+    def compile(cls, node: ast.Body, name: str = "module") -> Code:
+        self = cls(Code(name, [], node.statements))
+        self.compile_block(node.statements)
+        self.emit(LOAD_NULL, 0, node)
+        self.emit(RETURN_VALUE, 0, node)
+        return self.code
+
+    def emit(self, op: int, arg: int, node) -> int:
+        offset = len(self.code.instructions)
+        self.code.instructions += [op, arg]
+        self.code.positions.append((node.line, node.column))
+        return offset
+
+    def patch(self, offset: int, target: int = None):
+        self.code.instructions[offset + 1] = len(self.code.instructions) if target is None else target
+
+    def const(self, value) -> int:
+        key = (type(value), getattr(value, "_obj", id(value)))
+        if key not in self.const_indexes:
+            self.const_indexes[key] = len(self.code.consts)
+            self.code.consts.append(value)
+        return self.const_indexes[key]
+
+    def name(self, name: str) -> int:
+        if name not in self.code.names:
+            self.code.names.append(name)
+        return self.code.names.index(name)
+
+    def compile_block(self, statements):
+        for statement in statements:
+            self.compile_statement(statement)
+
+    def compile_statement(self, node):
+        self.compile_node(node)
+        if not isinstance(node, self.statements):
+            self.emit(POP_TOP, 0, node)
+
+    def compile_node(self, node):
+        for cls in type(node).__mro__:
+            if compiler := self.compilers.get(cls):
+                return compiler(self, node)
+        raise builtins.RuntimeError("Unknown node")
+
+    def compile_continue(self, node):
+        self.loops[-1][0].append(self.emit(JUMP, 0, node))
+
+    def compile_break(self, node):
+        self.loops[-1][1].append(self.emit(JUMP, 0, node))
+
+    def compile_return(self, node):
+        if isinstance(node.argument, ast.Call) and self.function:
+            self.compile_call(node.argument, TAIL_CALL)
+        elif node.argument:
+            self.compile_node(node.argument)
+        else:
+            self.emit(LOAD_NULL, 0, node)
+        self.emit(RETURN_VALUE, 0, node)
+
+    def compile_name(self, node):
+        self.emit(LOAD_NAME, self.name(node.argument), node)
+
+    def compile_assignment(self, node):
+        name = self.name(node.name.argument)
+        if isinstance(node.op, ast.Assign):
+            self.compile_node(node.content)
+        else:
+            self.emit(LOAD_INPLACE, name, node)
+            self.compile_node(node.content)
+            self.emit(INPLACE_OP, self.name(node.op.__class__.__name__), node)
+        self.emit(STORE_NAME, name, node)
+
+    def compile_call(self, node, op=CALL):
+        self.compile_node(node.name)
+        args = [arg for arg in node.args.items if arg]
+        for arg in args:
+            self.compile_node(arg)
+        self.emit(op, len(args), node)
+
+    def compile_spawn(self, node):
+        self.compile_call(node.argument, SPAWN)
+
+    def compile_constant(self, node):
+        box = {ast.Integer: Integer, ast.String: String, ast.Float: Float}[type(node)]
+        self.emit(LOAD_CONST, self.const(box(node.argument)), node)
+
+    def compile_binary_node(self, node):
+        self.compile_node(node.left)
+        if isinstance(node.op, (ast.LogicAnd, ast.LogicOr)):
+            jump = self.emit(JUMP_IF_FALSE_OR_POP if isinstance(node.op, ast.LogicAnd) else JUMP_IF_TRUE_OR_POP, 0, node)
+            self.compile_node(node.right)
+            self.emit(REBOX, 0, node)
+            self.patch(jump)
+        else:
+            self.compile_node(node.right)
+            self.emit(BINARY_OP, self.name(node.op.__class__.__name__), node)
+
+    def compile_unary_node(self, node):
+        if type(node) is ast.Node:
+            self.emit(LOAD_NULL, 0, node)
+        else:
+            self.compile_node(node.argument)
+            self.emit(UNARY_OP, self.name(node.__class__.__name__), node)
+
+    def compile_function(self, node):
+        compiler = Compiler(Code(node.name.argument, node.params.items, node.body), function=True)
+        compiler.compile_block(node.body)
+        compiler.emit(LOAD_NULL, 0, node)
+        compiler.emit(RETURN_VALUE, 0, node)
+        self.emit(MAKE_FUNCTION, self.const(compiler.code), node)
+
+    def compile_if(self, node):
+        self.compile_node(node.condition)
+        orelse = self.emit(POP_JUMP_IF_FALSE, 0, node.condition)
+        self.compile_block(node.body)
+        end = self.emit(JUMP, 0, node.condition)
+        self.patch(orelse)
+        # like Interpreter.eval_if, every elif gets evaluated once the condition is false
+        for elif_node in node.elifs:
+            self.compile_if(elif_node)
+        self.compile_block(node.else_block or [])
+        self.patch(end)
+
+    def compile_loop(self, node, condition, body, step=None):
+        start = len(self.code.instructions)
+        exit_jump = None
+        if type(condition) is not ast.Node:
+            self.compile_node(condition)
+            exit_jump = self.emit(POP_JUMP_IF_FALSE, 0, node)
+        self.loops.append(([], []))
+        self.compile_block(body)
+        continues, breaks = self.loops.pop()
+        for offset in continues:
+            self.patch(offset)
+        if step is not None and type(step) is not ast.Node:
+            self.compile_statement(step)
+        # where a loop running out of budget is reported, the loop node is at its end
+        self.emit(JUMP, start, condition)
+        for offset in breaks + ([exit_jump] if exit_jump is not None else []):
+            self.patch(offset)
+
+    def compile_while(self, node):
+        self.emit(ENTER_SCOPE, 0, node)
+        self.compile_loop(node, node.condition, node.body)
+        self.emit(EXIT_SCOPE, 0, node)
+
+    def compile_for(self, node):
+        init, condition, step = node.parts
+        self.emit(ENTER_SCOPE, 0, node)
+        if type(init) is not ast.Node:
+            self.compile_statement(init)
+        self.compile_loop(node, condition, node.body, step)
+        self.emit(EXIT_SCOPE, 0, node)
+
+    def compile_array(self, node):
+        for item in node.items:
+            self.compile_node(item)
+        self.emit(BUILD_ARRAY, len(node.items), node)
+
+    def compile_index(self, node):
+        self.compile_node(node.obj)
+        given = 0
+        for bit, part in enumerate((node.start, node.end, node.step)):
+            if part:
+                self.compile_node(part)
+                given |= 1 << bit
+        self.emit(INDEX, given, node)
+
+    def compile_attribute(self, node):
+        self.compile_node(node.obj)
+        self.emit(GET_ATTR, self.const(String(node.attribute.argument)), node.attribute)
+
+    compilers = {
+        ast.Continue: compile_continue,
+        ast.Break: compile_break,
+        ast.Return: compile_return,
+        ast.Name: compile_name,
+        ast.Assignment: compile_assignment,
+        ast.Call: compile_call,
+        ast.Spawn: compile_spawn,
+        ast.Integer: compile_constant,
+        ast.String: compile_constant,
+        ast.Float: compile_constant,
+        ast.BinaryNode: compile_binary_node,
+        ast.Node: compile_unary_node,
+        ast.Function: compile_function,
+        ast.If: compile_if,
+        ast.While: compile_while,
+        ast.For: compile_for,
+        ast.Array: compile_array,
+        ast.Index: compile_index,
+        ast.Attribute: compile_attribute,
+    }
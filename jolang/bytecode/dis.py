@@ -0,0 +1,35 @@
+import sys
+from .opcodes import *
+from .compiler import Code
+
+
+def argrepr(code: Code, op: int, arg: int) -> str:
+    if op in (LOAD_CONST, MAKE_FUNCTION, GET_ATTR):
+        return repr(code.consts[arg])
+    if op in (LOAD_NAME, STORE_NAME, LOAD_INPLACE, INPLACE_OP, BINARY_OP, UNARY_OP):
+        return code.names[arg]
+    if op in jumps:
+        return f"to {arg}"
+    if op == INDEX:
+        return ":".join(part if arg & 1 << bit else "" for bit, part in enumerate(("start", "stop", "step")))
+    return ""
+
+
+def dis(code: Code, file=None):
+    file = file or sys.stdout
+    print(f"Disassembly of {code!r}:", file=file)
+    targets = {code.instructions[offset + 1] for offset in range(0, len(code.instructions), 2) if code.instructions[offset] in jumps}
+    last_line = None
+    for offset in range(0, len(code.instructions), 2):
+        op, arg = code.instructions[offset], code.instructions[offset + 1]
+        line = code.positions[offset // 2][0]
+        print(
+            f"{line if line != last_line else '':>4} {'>>' if offset in targets else '':>3} {offset:>4} "
+            f"{opnames[op]:<21}{'' if op in without_arg else arg:<5}{argrepr(code, op, arg)}".rstrip(),
+            file=file
+        )
+        last_line = line
+    for const in code.consts:
+        if isinstance(const, Code):
+            print(file=file)
+            dis(const, file)
@@ -0,0 +1,30 @@
+# every instruction is two ints, an opcode and its argument (0 when it takes none)
+
+LOAD_CONST = 0  # push consts[arg]
+LOAD_NAME = 1  # push the value of names[arg]
+STORE_NAME = 2  # bind names[arg] to the top of the stack, leaving it there
+LOAD_INPLACE = 3  # push the value of names[arg], the target of an in-place assignment
+INPLACE_OP = 4  # pop right and left, push left.operate(names[arg], right)
+BINARY_OP = 5  # pop right and left, push left.operate(names[arg], right)
+UNARY_OP = 6  # pop value, push value.operate(names[arg])
+POP_TOP = 7
+JUMP = 8  # jump to instruction arg
+POP_JUMP_IF_FALSE = 9  # pop value, jump to arg if its content is falsy
+JUMP_IF_FALSE_OR_POP = 10  # the short-circuit of '&&'
+JUMP_IF_TRUE_OR_POP = 11  # the short-circuit of '||'
+REBOX = 12  # replace the top of the stack with a new box of its content, the result of '&&'/'||'
+CALL = 13  # call the function under arg arguments
+RETURN_VALUE = 14
+LOAD_NULL = 15
+MAKE_FUNCTION = 16  # register the function whose code is consts[arg] in the current scope
+ENTER_SCOPE = 17  # run the following instructions in a copy of the current scope (loops)
+EXIT_SCOPE = 18
+BUILD_ARRAY = 19  # pop arg items, push an Array of them
+INDEX = 20  # arg is a bitmask of which of start (1), stop (2) and step (4) were given
+GET_ATTR = 21  # pop obj, push obj.operate("GetAttr", consts[arg])
+TAIL_CALL = 22  # CALL in `return f(...)`, a JoLang function replaces the current frame instead of returning to it
+SPAWN = 23  # like CALL, but the call runs on the thread pool and a Future of it is pushed
+
+opnames = {value: name for name, value in dict(globals()).items() if name.isupper()}
+without_arg = {POP_TOP, RETURN_VALUE, LOAD_NULL, ENTER_SCOPE, EXIT_SCOPE, REBOX}
+jumps = {JUMP, POP_JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP}
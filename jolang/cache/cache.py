@@ -0,0 +1,84 @@
+import os
+import typing
+import hashlib
+import tempfile
+from .. import __version__
+from ..tokenizer import Tokenizer
+from ..preprocessor import preprocess
+from ..tokenizer import tokens
+from ..parser import Parser, ast, serializer
+
+# every entry starts with MAGIC and its full key, anything else is a miss
+MAGIC = b"JOLANGC\1"
+
+
+def key(code: str, macros: dict = None) -> bytes:
+    # the same source, macros and JoLang version always parse to the same program
+    digest = hashlib.sha256(f"{__version__}\0".encode())
+    for (name, content), replace_with in sorted((macros or {}).items()):
+        digest.update(f"{name}:{content}={replace_with!r}\0".encode())
+    digest.update(b"\0")
+    digest.update(code.encode())
+    return digest.digest()
+
+
+class Cache:
+    """
+    Parsed programs on disk, like __pycache__: directory holds one file per key,
+    with the ast.Body and the macros the program leaves defined (see jolang.parser.serializer).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, key: bytes) -> str:
+        return os.path.join(self.directory, f"{key.hex()[:32]}.joc")
+
+    def load(self, key: bytes) -> typing.Optional[typing.Tuple[ast.Body, dict]]:
+        try:
+            with open(self.path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        header = MAGIC + key
+        if not data.startswith(header):
+            return None
+        try:
+            node, macros = serializer.loads(data[len(header):])
+        except (ValueError, TypeError):
+            return None
+        return node, {(name, content): [tokens.Token(tokens.kinds[token_name], text, line, col)
+                                        for token_name, line, col, text in replace_with]
+                      for name, content, replace_with in macros}
+
+    def store(self, key: bytes, node: ast.Body, macros: dict) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # written aside and renamed over the entry, a reader never sees half a file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(MAGIC + key + serializer.dumps((node, [
+                        (name, content, [(token.name, token.line, token.col, token.content) for token in replace_with])
+                        for (name, content), replace_with in macros.items()])))
+                os.replace(tmp, self.path(key))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except (OSError, ValueError, TypeError):
+            # a cache that can't be written, or a tree it can't serialize, is just a slower run
+            pass
+
+    def parse(self, code: str, macros: dict = None) -> ast.Body:
+        # what main does, unless this source was parsed with the same macros before;
+        # macros is updated with the program's macros either way
+        if macros is None:
+            macros = {}
+        k = key(code, macros)
+        if (entry := self.load(k)) is None:
+            parser = Parser(preprocess(Tokenizer(code).tokenize(), dict(macros)))
+            entry = parser.parse(), parser.macros
+            self.store(k, *entry)
+        node, defined = entry
+        macros.update(defined)
+        return node
@@ -0,0 +1,2 @@
+from .embed import Runtime, ScriptError, to_jolang, to_python
+from ..interpreter.budget import Budget
@@ -0,0 +1,131 @@
+import typing
+import contextlib
+import collections
+from ..tokenizer import Tokenizer
+from ..preprocessor import preprocess
+from ..parser import Parser
+from ..cache import Cache
+from ..main import engine_options
+from ..interpreter import engines, file
+from ..interpreter.scope import Scope
+from ..interpreter.budget import Budget
+from ..interpreter.errors import Exit, print_traceback
+from ..interpreter.stdlib.std_functions.functions import functions
+from ..interpreter.stdlib.builtin_types.object import Object
+from ..interpreter.stdlib.builtin_types.Integer import Integer
+from ..interpreter.stdlib.builtin_types.String import String
+from ..interpreter.stdlib.builtin_types.Array import Array
+from ..interpreter.stdlib.builtin_types.Null import Null
+from ..interpreter.stdlib.builtin_types.Function import Function
+
+
+class ScriptError(Exception):
+    # a JoLang error the program stopped with, error is the jolang.interpreter.errors.Error
+    def __init__(self, error):
+        super().__init__(error.format())
+        self.error = error
+
+
+def to_jolang(value):
+    if isinstance(value, Object):
+        return value
+    if value is None:
+        return Null()
+    if isinstance(value, (bool, int, float)):
+        return Integer.box(value)
+    if isinstance(value, str):
+        return String(value)
+    if isinstance(value, (list, tuple)):
+        return Array([to_jolang(item) for item in value])
+    raise TypeError(f"can't convert {type(value).__name__!r} to a JoLang value")
+
+
+def to_python(value):
+    if isinstance(value, Null):
+        return None
+    if isinstance(value, Array):
+        return [to_python(item) for item in value._obj]
+    if isinstance(value, Function):
+        return value
+    return value._obj
+
+
+class Runtime:
+    """
+    An interpreter made once and then given any number of programs, which share its globals until reset().
+    Every distinct program is parsed and compiled once, the last `programs` of them are kept ready to run again.
+    """
+
+    def __init__(self, engine: str = "tree", cache: typing.Union[Cache, str] = None, programs: int = 256,
+                 max_depth: int = None):
+        # max_depth: see jolang.main
+        self.engine = engines[engine]
+        self.options = engine_options(engine, max_depth)
+        self.cache = Cache(cache) if isinstance(cache, str) else cache
+        self.builtins = functions.copy()
+        self.scope = Scope("module", self.builtins.copy())
+        self.programs = collections.OrderedDict()
+        self.max_programs = programs
+
+    def register(self, name: str, function: typing.Callable = None, restype: typing.Callable = to_jolang):
+        # makes a Python callable a builtin, it gets the arguments' Python values;
+        # works as a decorator when function is left out
+        if function is None:
+            return lambda f: self.register(name, f, restype) or f
+        f = Function(name, py_bind=function, restype=restype)
+        self.builtins[name] = f
+        self.scope.register(name, f)
+
+    def reset(self):
+        namespace = self.scope.namespace
+        namespace.clear()
+        namespace.update(self.builtins)
+
+    def __getitem__(self, name: str):
+        return to_python(self.scope.get(name))
+
+    def __setitem__(self, name: str, value):
+        self.scope.register(name, to_jolang(value))
+
+    def __contains__(self, name: str):
+        return self.scope.has(name)
+
+    def interpreter(self, code: str, name: str):
+        key = name, code
+        if (interpreter := self.programs.get(key)) is not None:
+            self.programs.move_to_end(key)
+            return interpreter
+        if self.cache is not None:
+            node = self.cache.parse(code)
+        else:
+            node = Parser(preprocess(Tokenizer(code).tokenize())).parse()
+        interpreter = self.programs[key] = self.engine(file.File(code, name, node), **self.options)
+        if len(self.programs) > self.max_programs:
+            self.programs.popitem(last=False)
+        return interpreter
+
+    def run(self, code: str, name: str = "<embedded>", budget: Budget = None):
+        # raises ScriptError instead of printing the traceback and exiting, a BudgetError one once budget runs out
+        interpreter = self.interpreter(code, name)
+        token = print_traceback.set(False)
+        try:
+            with budget or contextlib.nullcontext():
+                interpreter.eval(scope=self.scope)
+        except Exit as e:
+            raise ScriptError(e.error) from None
+        finally:
+            print_traceback.reset(token)
+
+    async def run_async(self, code: str, name: str = "<embedded>", budget: Budget = None):
+        # like run, registered coroutine functions are awaited on the running loop; the vm engine only
+        interpreter = self.interpreter(code, name)
+        if not hasattr(interpreter, "eval_async"):
+            raise TypeError(f"the {type(interpreter).__name__} engine can't run asynchronously, use 'vm'")
+        token = print_traceback.set(False)
+        try:
+            with budget or contextlib.nullcontext():
+                await interpreter.eval_async(scope=self.scope)
+        except Exit as e:
+            raise ScriptError(e.error) from None
+        finally:
+            print_traceback.reset(token)
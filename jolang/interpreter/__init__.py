@@ -1 +1,11 @@
 from .interpreter import Interpreter
+from .closures import ClosureInterpreter
+from .vm import VirtualMachine
+from .transpiled import TranspiledInterpreter
+
+engines = {
+    "tree": Interpreter,
+    "closure": ClosureInterpreter,
+    "vm": VirtualMachine,
+    "python": TranspiledInterpreter,
+}
@@ -0,0 +1,79 @@
+import time
+import typing
+import tracemalloc
+import contextvars
+
+# the Budget of the code running in this context, None when it runs without limits
+current_budget = contextvars.ContextVar("budget", default=None)
+
+
+class Budget:
+    """
+    Limits on a run, while the budget is entered (`with Budget(steps=10 ** 6, seconds=1): ...`) a program stops
+    with a BudgetError once it exceeds one of them.
+    steps: loop iterations and calls of JoLang functions, a program can only run for long by looping or recursing
+    seconds: wall-clock time, a py_bind blocking is only noticed once it returns
+    memory: bytes allocated since entering the budget, traced with tracemalloc (which slows allocations down)
+            and counting what other threads allocate meanwhile
+    The engines tick the budget at every step. Steps alone are only checked every `interval` steps, time and memory
+    at every one of them: a step can take longer than the last (`x *= x`), so `interval` of them can take forever.
+    Entering the budget again starts it over, it limits one run at a time.
+    """
+
+    def __init__(self, steps: typing.Optional[int] = None, seconds: typing.Optional[float] = None,
+                 memory: typing.Optional[int] = None, interval: int = 1000):
+        self.steps = steps
+        self.seconds = seconds
+        self.memory = memory
+        self.interval = interval
+        self.used = 0
+        self.chunk = self.left = 0
+        self.deadline = None
+        self.baseline = 0
+        self.tracing = False
+        self.token = None
+
+    def __enter__(self):
+        self.used = 0
+        self.chunk = self.left = self.next_chunk()
+        if self.seconds is not None:
+            self.deadline = time.perf_counter() + self.seconds
+        if self.memory is not None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.tracing = True
+            self.baseline = tracemalloc.get_traced_memory()[0]
+        self.token = current_budget.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        current_budget.reset(self.token)
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def next_chunk(self):
+        # steps until the next check, it lands on the step going over the limit
+        if self.seconds is not None or self.memory is not None:
+            return 1
+        if self.steps is None:
+            return self.interval
+        return max(1, min(self.interval, self.steps + 1 - self.used))
+
+    def tick(self) -> typing.Optional[str]:
+        # one step, the message of the error to stop with once a limit is exceeded
+        self.left -= 1
+        if self.left > 0:
+            return None
+        return self.check()
+
+    def check(self) -> typing.Optional[str]:
+        self.used += self.chunk
+        if self.steps is not None and self.used > self.steps:
+            return f"exceeded the limit of {self.steps} steps"
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            return f"exceeded the limit of {self.seconds} seconds"
+        if self.memory is not None and tracemalloc.get_traced_memory()[0] - self.baseline > self.memory:
+            return f"exceeded the limit of {self.memory} bytes of memory"
+        self.chunk = self.left = self.next_chunk()
+        return None
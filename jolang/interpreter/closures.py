@@ -0,0 +1,514 @@
+import builtins
+import collections
+from .interpreter import Interpreter, box, wait
+from .scope import SlotScope, LoopScope, FuncScope, TailCall, unbound
+from .resolver import Resolver
+from . import tasks
+from .budget import current_budget
+from .errors import NameError, StackCall, AttributeError, OperatorError, RuntimeError, BudgetError, make_stack
+from ..parser import ast
+from .stdlib.builtin_types.Integer import Integer, Float, kernels
+from .stdlib.builtin_types.String import String
+from .stdlib.builtin_types.Null import Null
+from .stdlib.builtin_types import empty
+from .stdlib.builtin_types.Function import Function
+from .stdlib.builtin_types.Boolean import Boolean
+from .stdlib.builtin_types.Array import Array
+
+
+FunctionCode = collections.namedtuple("FunctionCode", "layout statements")
+
+
+def stopped(scope):
+    # the same check Interpreter.eval does before evaluating any node
+    func, loop = scope.func, scope.loop
+    return (func and not func.active) or (loop and (not loop.active or loop.continue_))
+
+
+def guarded(code):
+    def run(scope):
+        if stopped(scope):
+            return Null()
+        return code(scope)
+    return run
+
+
+def block(codes):
+    codes = tuple(codes)
+
+    def run(scope):
+        for code in codes:
+            if not stopped(scope):
+                code(scope)
+    return run
+
+
+def run_function(f, name, values):
+    # like Interpreter.run_function, tail calls run in this loop
+    while True:
+        layout, statements = f.code
+        func = FuncScope(name)
+        f_scope = SlotScope(name, layout, f.scope, func=func)
+        for slot, value in zip(layout.parameters, values):
+            f_scope.slots[slot] = value
+        for statement in statements:
+            if not stopped(f_scope):
+                statement(f_scope)
+            if not func.active:
+                break
+        else:
+            return Null()
+        if (ret := func.ret).__class__ is not TailCall:
+            return ret
+        f, name, values = ret
+
+
+class ClosureInterpreter(Interpreter):
+    """
+    Same semantics as Interpreter, but every node is compiled once into a closure
+    with its children already resolved, so running a node doesn't dispatch on its type anymore.
+    Names are resolved ahead of time too: function calls and loops run in a SlotScope holding only
+    the names they bind instead of a copy of everything they can see.
+    """
+
+    events = frozenset()
+
+    def __init__(self, file):
+        super().__init__(file)
+        self.code = None
+        self.resolver = Resolver()
+
+    def load(self, node):
+        name = node.argument
+        ref = self.resolver.refs.get(id(node))
+        if ref is None:
+            return lambda scope: scope.globals.get(name, unbound)
+        depth, slot = ref
+        if depth == 0:
+            return lambda scope: scope.slots[slot]
+        if depth == 1:
+            return lambda scope: scope.parent.slots[slot]
+        return lambda scope: scope.get_slot(depth, slot)
+
+    def store(self, node):
+        name = node.argument
+        ref = self.resolver.refs.get(id(node))
+        if ref is None:
+            def store_global(scope, value):
+                scope.globals[name] = value
+            return store_global
+        _, slot = ref
+
+        def store_slot(scope, value):
+            scope.slots[slot] = value
+        return store_slot
+
+    def stack(self, node, scope):
+        return [StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))]
+
+    def compile(self, node):
+        if not node:
+            # Interpreter.eval evaluates the whole program when it gets no node
+            return lambda scope: self.code(scope)
+        for cls in type(node).__mro__:
+            if compiler := self.compilers.get(cls):
+                return compiler(self, node)
+        raise builtins.RuntimeError("Unknown node")
+
+    def compile_body(self, node):
+        return block(self.compile(statement) for statement in node.statements)
+
+    def compile_continue(self, node):
+        def continue_(scope):
+            scope.loop.continue_ = True
+            return node
+        return continue_
+
+    def compile_break(self, node):
+        def break_(scope):
+            scope.loop.active = False
+            return node
+        return break_
+
+    def compile_return(self, node):
+        argument = node.argument and self.compile(node.argument)
+        tail_call = isinstance(node.argument, ast.Call) and self.compile_call(node.argument, tail=True)
+
+        def return_(scope):
+            func = scope.func
+            if tail_call and func and not scope.loop:
+                func.ret = tail_call(scope)
+            else:
+                func.ret = argument(scope) if argument else Null()
+            func.active = False
+            return func.ret
+        return return_
+
+    def compile_name(self, node):
+        name = node.argument
+        load = self.load(node)
+
+        def name_(scope):
+            if (value := load(scope)) is not unbound:
+                return value
+            NameError(f"{name!r} doesn't exist in the current scope", stack=make_stack(self.file, node, scope)).throw()
+        return name_
+
+    def compile_assignment(self, node):
+        name = node.name.argument
+        content = self.compile(node.content)
+        store = self.store(node.name)
+        if isinstance(node.op, ast.Assign):
+            def assign(scope):
+                store(scope, res := content(scope))
+                return res
+            return assign
+        op_name = node.op.__class__.__name__
+        load = self.load(node.name)
+        if kernel := kernels.get(op_name):
+            function, raw, boxes = kernel
+            content = self.compile_number(node.content)
+
+            def inplace_number(scope):
+                if load(scope) is not unbound:
+                    res = content(scope)
+                    value = load(scope)
+                    if value.__class__ in boxes and res.__class__ in raw:
+                        res = Integer.box(function(value._obj, res))
+                    elif (res := value.operate(op_name, box(res))) is empty:
+                        OperatorError(f"Can't {op_name} "
+                                      f"with {value.__class__.__name__!r} and {res.__class__.__name__!r}",
+                                      stack=self.stack(node, scope)).throw()
+                    store(scope, res)
+                    return res
+                NameError(f"{name!r} doesn't exist in the current scope", stack=self.stack(node, scope)).throw()
+            return inplace_number
+
+        def inplace(scope):
+            if load(scope) is not unbound:
+                res = content(scope)
+                if (res := (value := load(scope)).operate(op_name, res)) is empty:
+                    OperatorError(f"Can't {op_name} "
+                                  f"with {value.__class__.__name__!r} and {res.__class__.__name__!r}",
+                                  stack=self.stack(node, scope)).throw()
+                store(scope, res)
+                return res
+            NameError(f"{name!r} doesn't exist in the current scope", stack=self.stack(node, scope)).throw()
+        return inplace
+
+    def compile_call(self, node, tail=False, spawn=False):
+        callee = self.compile(node.name)
+        # a name evaluates to the same object twice in a row, anything else is evaluated again like eval_call does
+        same_callee = isinstance(node.name, ast.Name)
+        args = [self.compile(arg) for arg in node.args.items if arg]
+        n_args = len(node.args.items)
+
+        def call(scope):
+            f = callee(scope)
+            if f.operate("Call") is empty:
+                OperatorError(f"Object of type {f.__class__.__name__!r} is not callable", stack=self.stack(node, scope)).throw()
+            if not f.py_bind and n_args != len(f.parameters):
+                RuntimeError(f"{f.name} requires {len(f.parameters)} arguments but {n_args} arguments were supplied",
+                             stack=self.stack(node, scope)).throw()
+            if f.py_bind:
+                restype = f.restype
+                if restype is empty:
+                    restype = lambda x: x
+                if (arity := f.arity()) is not None:
+                    if arity != n_args:
+                        RuntimeError(
+                            f"{f.name!r} requires {arity} arguments but {n_args} arguments were supplied",
+                            stack=self.stack(node, scope)).throw()
+                values = []
+                for arg in args:
+                    if (value := getattr(arg(scope), "_obj", empty)) is empty:
+                        value = Null()
+                    values.append(value)
+                if spawn:
+                    return tasks.spawn(self.call_py_bind, f, restype, values, node, scope)
+                ret = self.call_py_bind(f, restype, values, node, scope)
+            else:
+                if (budget := current_budget.get()) is not None and (message := budget.tick()) is not None:
+                    BudgetError(message, stack=self.stack(node, scope)).throw()
+                name = f if same_callee else callee(scope)
+                values = [arg(scope) for arg in args]
+                if spawn:
+                    return tasks.spawn(run_function, f, name, values)
+                if tail:
+                    return TailCall(f, name, values)
+                return run_function(f, name, values)
+            return ret
+        return call
+
+    def call_py_bind(self, f, restype, values, node, scope):
+        ret = restype(wait(f.py_bind(*values)))
+        if isinstance(ret, tuple) and ret[0] is empty:
+            RuntimeError(ret[1], stack=self.stack(node, scope)).throw()
+        return ret
+
+    def compile_spawn(self, node):
+        return self.compile_call(node.argument, spawn=True)
+
+    def compile_integer(self, node):
+        # literals are boxed once, builtin values are never changed in place
+        value = Integer.box(node.argument)
+        return lambda scope: value
+
+    def compile_string(self, node):
+        value = String(node.argument)
+        return lambda scope: value
+
+    def compile_float(self, node):
+        value = Float(node.argument)
+        return lambda scope: value
+
+    def compile_number(self, node):
+        # like Interpreter.eval_number, evaluates to a raw Python number if node evaluates to one
+        if isinstance(node, (ast.Integer, ast.Float)):
+            value = node.argument
+            return lambda scope: value
+        if isinstance(node, ast.BinaryNode) and node.op.__class__.__name__ in kernels:
+            return self.compile_arithmetic(node)
+        code = self.compile(node)
+
+        def number(scope):
+            value = code(scope)
+            if value.__class__ is Integer or value.__class__ is Float:
+                return value._obj
+            return value
+        return number
+
+    def compile_arithmetic(self, node):
+        left, right = self.compile_number(node.left), self.compile_number(node.right)
+        op_name = node.op.__class__.__name__
+        function, raw, _ = kernels[op_name]
+        to_integer = isinstance(node.op, (ast.NotEqual, ast.Equals))
+
+        def arithmetic(scope):
+            lhs, rhs = left(scope), right(scope)
+            if lhs.__class__ in raw and rhs.__class__ in raw:
+                return function(lhs, rhs)
+            lhs, rhs = box(lhs), box(rhs)
+            result = lhs.operate(op_name, rhs)
+            if result is empty:
+                OperatorError(f"Can't {op_name} "
+                              f"with {lhs.__class__.__name__!r} and {rhs.__class__.__name__!r}",
+                              stack=self.stack(node, scope)).throw()
+            if to_integer:
+                return Integer.box(result)
+            return result
+        return arithmetic
+
+    def compile_operate(self, node):
+        left, right = self.compile(node.left), self.compile(node.right)
+        if isinstance(node.op, ast.LogicAnd):
+            def operate(scope):
+                return left(scope)._obj and right(scope)._obj
+        elif isinstance(node.op, ast.LogicOr):
+            def operate(scope):
+                return left(scope)._obj or right(scope)._obj
+        else:
+            op_name = node.op.__class__.__name__
+            to_integer = isinstance(node.op, (ast.NotEqual, ast.Equals))
+
+            def operate(scope):
+                lhs, rhs = left(scope), right(scope)
+                result = lhs.operate(op_name, rhs)
+                if result is empty:
+                    OperatorError(f"Can't {op_name} "
+                                  f"with {lhs.__class__.__name__!r} and {rhs.__class__.__name__!r}",
+                                  stack=self.stack(node, scope)).throw()
+                if to_integer:
+                    return Integer.box(result)
+                return result
+        return operate
+
+    def compile_binary_node(self, node):
+        if node.op.__class__.__name__ in kernels:
+            # numbers are operated on unboxed, only the result of the whole expression is boxed
+            operate = self.compile_arithmetic(node)
+        else:
+            operate = self.compile_operate(node)
+
+        def binary_node(scope):
+            res = operate(scope)
+            if isinstance(res, (int, float)):
+                return Integer.box(res)
+            elif isinstance(res, str):
+                return String(res)
+            return res
+        return binary_node
+
+    def compile_node(self, node):
+        if type(node) is ast.Node:
+            return lambda scope: Null()
+        argument = self.compile(node.argument)
+        op_name = node.__class__.__name__
+        to_boolean = isinstance(node, ast.UnaryLogicalNot)
+
+        def unary_node(scope):
+            obj = argument(scope)
+            result = obj.operate(op_name)
+            if result is empty:
+                OperatorError(f"Can't {op_name} with {obj.__class__.__name__!r}", stack=self.stack(node, scope)).throw()
+            if to_boolean:
+                return Boolean.box(result)
+            return result
+        return unary_node
+
+    def compile_function(self, node):
+        name = node.name.argument
+        params = node.params.items
+        code = FunctionCode(self.resolver.layouts[id(node)], [self.compile(statement) for statement in node.body])
+        store = self.store(node.name)
+
+        def function(scope):
+            store(scope, Function(name, params, node.body, scope=scope, code=code))
+        return function
+
+    def compile_if(self, node, elif_=False):
+        condition = self.compile(node.condition)
+        body = block(self.compile(statement) for statement in node.body)
+        elifs = [self.compile_if(elif_node, elif_=True) for elif_node in node.elifs]
+        else_block = node.else_block and block(self.compile(statement) for statement in node.else_block)
+
+        def if_(scope):
+            if elif_ and stopped(scope):
+                # eval_if enters an elif without checking the scope, but then its condition evaluates to a
+                # (truthy) Null and its body does nothing, so the whole elif boils down to a no-op
+                return
+            if condition(scope)._obj:
+                body(scope)
+                return
+            for elif_code in elifs:
+                elif_code(scope)
+            if else_block:
+                else_block(scope)
+        return if_
+
+    def compile_for(self, node):
+        init, condition, step = (guarded(self.compile(part)) for part in node.parts)
+        body = [self.compile(statement) for statement in node.body]
+        layout = self.resolver.layouts[id(node)]
+
+        def for_(scope):
+            loop = LoopScope("x")
+            for_scope = SlotScope(scope.name, layout, scope, func=scope.func, loop=loop)
+            init(for_scope)
+            budget = current_budget.get()
+            while True:
+                if budget is not None and (message := budget.tick()) is not None:
+                    BudgetError(message, stack=self.stack(node.parts[1], scope)).throw()
+                result = condition(for_scope)
+                if result:
+                    if not result._obj:
+                        break
+                    for statement in body:
+                        if loop.continue_:
+                            loop.continue_ = False
+                            continue
+                        if not loop.active:
+                            break
+                        if not stopped(for_scope):
+                            statement(for_scope)
+                    else:
+                        step(for_scope)
+                        continue
+                    break
+        return for_
+
+    def compile_while(self, node):
+        condition = guarded(self.compile(node.condition))
+        body = [self.compile(statement) for statement in node.body]
+        layout = self.resolver.layouts[id(node)]
+
+        def while_(scope):
+            loop = LoopScope("x")
+            loop_scope = SlotScope(scope.name, layout, scope, func=scope.func, loop=loop)
+            budget = current_budget.get()
+            while True:
+                if budget is not None and (message := budget.tick()) is not None:
+                    BudgetError(message, stack=self.stack(node.condition, scope)).throw()
+                if not condition(loop_scope)._obj:
+                    break
+                for statement in body:
+                    if loop.continue_:
+                        loop.continue_ = False
+                        continue
+                    if not loop.active:
+                        break
+                    if not stopped(loop_scope):
+                        statement(loop_scope)
+                else:
+                    continue
+                break
+        return while_
+
+    def compile_array(self, node):
+        items = [self.compile(item) for item in node.items]
+        return lambda scope: Array([item(scope) for item in items])
+
+    def compile_index(self, node):
+        obj = self.compile(node.obj)
+        start, stop, step = (part and self.compile(part) for part in (node.start, node.end, node.step))
+        op_name = node.__class__.__name__
+
+        def index(scope):
+            value = obj(scope)
+            res = value.operate(op_name, start and start(scope), stop and stop(scope), step and step(scope))
+            if res is empty:
+                OperatorError(f"Can't slice '{value}'", stack=self.stack(node, scope)).throw()
+            return res
+        return index
+
+    def compile_attribute(self, node):
+        obj = self.compile(node.obj)
+        attribute = node.attribute.argument
+        name = String(attribute)
+
+        def attribute_(scope):
+            value = obj(scope)
+            res = value.operate("GetAttr", name)
+            if res is empty:
+                AttributeError(f"{value.__class__.__name__!r} has no attribute {attribute!r}",
+                               stack=self.stack(node.attribute, scope)).throw()
+            return res
+        return attribute_
+
+    compilers = {
+        ast.Body: compile_body,
+        ast.Continue: compile_continue,
+        ast.Break: compile_break,
+        ast.Return: compile_return,
+        ast.Name: compile_name,
+        ast.Assignment: compile_assignment,
+        ast.Call: compile_call,
+        ast.Spawn: compile_spawn,
+        ast.Integer: compile_integer,
+        ast.String: compile_string,
+        ast.Float: compile_float,
+        ast.BinaryNode: compile_binary_node,
+        ast.Node: compile_node,
+        ast.Function: compile_function,
+        ast.If: compile_if,
+        ast.While: compile_while,
+        ast.For: compile_for,
+        ast.Array: compile_array,
+        ast.Index: compile_index,
+        ast.Attribute: compile_attribute,
+    }
+
+    def eval(self, node=None, scope=None):
+        if not node:
+            node = self.node
+        if not scope:
+            scope = self.scope
+        if stopped(scope):
+            return Null()
+        if node is self.node:
+            if self.code is None:
+                self.resolver.resolve(node)
+                self.code = self.compile(node)
+            return self.code(scope)
+        self.resolver.resolve(node)
+        return self.compile(node)(scope)
@@ -1,4 +1,10 @@
 import typing
+import contextvars
+
+# whether Error.throw prints the traceback; whoever turns it off reads it from Exit.error
+print_traceback = contextvars.ContextVar("print_traceback", default=True)
+# the times a call repeated in a row is shown in a traceback
+REPEATS = 3
 
 
 class StackCall:
@@ -15,7 +21,7 @@ class StackCall:
 
 def make_stack(file, node, scope):
     return [
-        StackCall(file.name, frame.line, frame.column, repr(frame.name), file.line(frame.line - 1))
+        StackCall(file.name, frame.line, frame.column, repr(frame.name), file.line(frame.line))
         for frame in scope.frames[:-1][::-1]
     ] + [StackCall(file.name, node.line, node.column, repr(scope.name), file.line(node.line))]
 
@@ -31,12 +37,41 @@ class Error:
     def get_error_class(self):
         return self.__class__.__name__
 
-    def throw(self):
-        print("Traceback (old-to-recent calls):")
+    def format(self):
+        return "".join([
+            "Traceback (old-to-recent calls):\n",
+            *self.format_stack(),
+            f"{self.get_error_class}: {self.message}\n",
+        ])
+
+    def format_stack(self):
+        # like Python's, a call repeated more than REPEATS times in a row (a runaway recursion) is shown REPEATS times
+        last, repeats = None, 0
         for call in self.stack:
-            print("\t", call.repr())
-        print(self.get_error_class + ":", self.message)
-        exit()
+            text = call.repr()
+            if text == last:
+                repeats += 1
+                if repeats > REPEATS:
+                    continue
+            else:
+                if repeats > REPEATS:
+                    yield f"\t [previous call repeated {repeats - REPEATS} more times]\n"
+                last, repeats = text, 1
+            yield f"\t {text}\n"
+        if repeats > REPEATS:
+            yield f"\t [previous call repeated {repeats - REPEATS} more times]\n"
+
+    def throw(self):
+        if print_traceback.get():
+            print(self.format(), end="")
+        raise Exit(self)
+
+
+class Exit(SystemExit):
+    # how a JoLang error stops the program, an uncaught one exits like exit() did
+    def __init__(self, error: Error):
+        super().__init__()
+        self.error = error
 
 
 class InterpretationError(Error):
@@ -57,3 +92,7 @@ class RuntimeError(Error):
 
 class AttributeError(Error):
     pass
+
+
+class BudgetError(Error):
+    pass
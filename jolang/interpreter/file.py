@@ -1,8 +1,26 @@
+import os
+import typing
+import itertools
+
+
 class File:
-    def __init__(self, code: str, name: str, ast):
-        self.lines = code.splitlines()
+    def __init__(self, code: typing.Union[str, os.PathLike], name: str, ast, encoding: str = "utf-8"):
+        # code: the source, or the path of the file it's in, which is only read again for a traceback's lines
+        self.path = code if isinstance(code, os.PathLike) else None
+        self.encoding = encoding
+        self._lines = None if self.path is not None else code.splitlines()
         self.name = name
         self.ast = ast
 
+    @property
+    def lines(self) -> typing.List[str]:
+        if self._lines is None:
+            with open(self.path, encoding=self.encoding) as f:
+                self._lines = f.read().splitlines()
+        return self._lines
+
     def line(self, number):
-        return self.lines[number]
+        if self._lines is not None or number < 0:
+            return self.lines[number]
+        with open(self.path, encoding=self.encoding, newline="\n") as f:
+            return next(itertools.islice(f, number, None), "").rstrip("\r\n")
@@ -0,0 +1,45 @@
+import typing
+from ..parser import ast
+
+# the events callbacks can be added for (see Interpreter.add_hook), a callback gets (event, node, scope name, value):
+# CALL: the Call node, the function about to be called
+# RETURN: the Call node, what the call returned
+# LINE: the node of a statement about to run, None
+# ITERATION: the While or For node, the value of its condition, once per check of the condition
+CALL, RETURN, LINE, ITERATION = "call", "return", "line", "iteration"
+events = frozenset({CALL, RETURN, LINE, ITERATION})
+
+
+def positions(node) -> typing.Tuple[typing.Dict[int, ast.Ast], typing.Dict[int, ast.Ast]]:
+    # the nodes starting a line: id -> the node reported, and loop conditions: id -> the loop.
+    # If, While, For and Function nodes are positioned at another token than their first one, what they start with
+    # stands for them: the condition, the initialization or the name
+    lines, loops = {}, {}
+
+    def statement(node):
+        if isinstance(node, (ast.If, ast.While)):
+            lines[id(node.condition)] = node.condition
+        elif isinstance(node, ast.For):
+            lines[id(node.parts[0])] = node.parts[0]
+        elif isinstance(node, ast.Function):
+            lines[id(node)] = node.name
+        elif isinstance(node, ast.Ast):
+            lines[id(node)] = node
+
+    def walk(value, body=False):
+        if isinstance(value, ast.Ast):
+            if body:
+                statement(value)
+            if isinstance(value, ast.While):
+                loops[id(value.condition)] = value
+            elif isinstance(value, ast.For):
+                loops[id(value.parts[1])] = value
+            for field in value.fields()[2:]:
+                child = getattr(value, field)
+                walk(child, isinstance(child, list) and field in ("statements", "body", "elifs", "else_block"))
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, body)
+
+    walk(node)
+    return lines, loops
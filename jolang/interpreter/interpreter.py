@@ -1,9 +1,12 @@
+import asyncio
 import builtins
 import inspect
-from .scope import Scope, LoopScope, FuncScope
-from .errors import NameError, StackCall, AttributeError, OperatorError, RuntimeError, make_stack
+from .scope import Scope, LoopScope, FuncScope, TailCall
+from . import tasks, hooks
+from .budget import current_budget
+from .errors import NameError, StackCall, AttributeError, OperatorError, RuntimeError, BudgetError, make_stack
 from ..parser import ast
-from .stdlib.builtin_types.Integer import Integer, Float
+from .stdlib.builtin_types.Integer import Integer, Float, kernels, numbers
 from .stdlib.builtin_types.String import String
 from .stdlib.builtin_types.Null import Null
 from .stdlib.builtin_types import empty
@@ -13,11 +16,93 @@ from .stdlib.builtin_types.Boolean import Boolean
 from .stdlib.builtin_types.Array import Array
 
 
+def box(value):
+    # boxes a raw number from the numeric fast path, leaves anything else alone
+    if value.__class__ in numbers:
+        return Integer.box(value)
+    return value
+
+
+async def awaited(awaitable):
+    return await awaitable
+
+
+def wait(value):
+    # a py_bind may return an awaitable; outside of VirtualMachine.eval_async, the call waits for it
+    if inspect.isawaitable(value):
+        return asyncio.run(awaited(value))
+    return value
+
+
 class Interpreter:
+    # what add_hook takes, the engines that don't evaluate the tree themselves have none
+    events = hooks.events
+
     def __init__(self, file):
         self.file = file
         self.node = file.ast
-        self.scope = Scope("module", functions)
+        # a namespace of its own, the module's globals mustn't end up in the builtins
+        self.scope = Scope("module", functions.copy())
+        # id(literal node) -> its value, boxed the first time it's evaluated
+        self.constants = {}
+        # event -> callbacks, see add_hook
+        self.hooks = {}
+        self.lines = self.loops = None
+
+    def add_hook(self, event: str, callback):
+        # callback(event, node, scope name, value) is called on every event of that kind, see hooks.py
+        if event not in self.events:
+            raise ValueError(f"{type(self).__name__} has no {event!r} events")
+        self.hooks.setdefault(event, []).append(callback)
+        self.instrument()
+
+    def remove_hook(self, event: str, callback):
+        self.hooks[event].remove(callback)
+        if not self.hooks[event]:
+            del self.hooks[event]
+        self.instrument()
+
+    def instrument(self):
+        # an instance with hooks gets the traced eval and call instead of the class' ones, the others pay nothing for them
+        self.__dict__.pop("eval", None)
+        self.__dict__.pop("call", None)
+        if hooks.LINE in self.hooks or hooks.ITERATION in self.hooks:
+            if self.lines is None:
+                self.lines, self.loops = hooks.positions(self.node)
+            self.eval = self.traced_eval
+        if hooks.CALL in self.hooks or hooks.RETURN in self.hooks:
+            self.call = self.traced_call
+
+    def fire(self, event, node, scope, value):
+        for callback in self.hooks.get(event, ()):
+            callback(event, node, str(scope.name), value)
+
+    def traced_eval(self, node=None, scope=None):
+        node, scope = node or self.node, scope or self.scope
+        if (line := self.lines.get(id(node))) is not None and hooks.LINE in self.hooks:
+            self.fire(hooks.LINE, line, scope, None)
+        value = type(self).eval(self, node, scope)
+        if (loop := self.loops.get(id(node))) is not None:
+            self.fire(hooks.ITERATION, loop, scope, value)
+        return value
+
+    def traced_call(self, f, node, scope, tail=False, spawn=False):
+        # tail calls run in place, so every call returns
+        self.fire(hooks.CALL, node, scope, f)
+        value = type(self).call(self, f, node, scope, False, spawn)
+        self.fire(hooks.RETURN, node, scope, value)
+        return value
+
+    def eval_constant(self, node):
+        if (value := self.constants.get(id(node))) is None:
+            if isinstance(node, ast.Integer):
+                value = Integer.box(node.argument)
+            elif isinstance(node, ast.Float):
+                value = Float(node.argument)
+            else:
+                value = String(node.argument)
+            self.constants[id(node)] = value
+        return value
 
     def eval_function(self, node, scope):
         name = node.name.argument
@@ -36,8 +121,18 @@ class Interpreter:
             scope.register(node.name.argument, res := self.eval(node.content, scope))
         else:
             if scope.has(node.name.argument):
-                res = self.eval(node.content, scope)
-                if (res := scope.get(node.name.argument).operate(node.op.__class__.__name__, res)) is empty:
+                op_name = node.op.__class__.__name__
+                if kernel := kernels.get(op_name):
+                    res = self.eval_number(node.content, scope)
+                    old = scope.get(node.name.argument)
+                    function, raw, boxes = kernel
+                    if old.__class__ in boxes and res.__class__ in raw:
+                        scope.register(node.name.argument, res := Integer.box(function(old._obj, res)))
+                        return res
+                    res = box(res)
+                else:
+                    res = self.eval(node.content, scope)
+                if (res := scope.get(node.name.argument).operate(op_name, res)) is empty:
                     OperatorError(f"Can't {node.op.__class__.__name__} "
                                   f"with {scope.get(node.name.argument).__class__.__name__!r} and {res.__class__.__name__!r}", stack=[
                         StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
@@ -49,8 +144,27 @@ class Interpreter:
                 ]).throw()
         return res
 
+    def eval_number(self, node, scope):
+        # a raw Python number if node evaluates to one, its value otherwise
+        if isinstance(node, (ast.Integer, ast.Float)):
+            return node.argument
+        if isinstance(node, ast.BinaryNode) and node.op.__class__.__name__ in kernels:
+            return self.eval_binary_node(node, scope)
+        value = self.eval(node, scope)
+        if value.__class__ is Integer or value.__class__ is Float:
+            return value._obj
+        return value
+
     def eval_binary_node(self, node, scope):
-        left, right = self.eval(node.left, scope), self.eval(node.right, scope)
+        if kernel := kernels.get(node.op.__class__.__name__):
+            # numbers are operated on unboxed, the result is boxed once it leaves the expression
+            function, raw, _ = kernel
+            left, right = self.eval_number(node.left, scope), self.eval_number(node.right, scope)
+            if left.__class__ in raw and right.__class__ in raw:
+                return function(left, right)
+            left, right = box(left), box(right)
+        else:
+            left, right = self.eval(node.left, scope), self.eval(node.right, scope)
         result = left.operate(node.op.__class__.__name__, right)
 
         if result is empty:
@@ -59,7 +173,7 @@ class Interpreter:
                 StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
             ]).throw()
         if isinstance(node.op, (ast.NotEqual, ast.Equals)):
-            return Integer(result)
+            return Integer.box(result)
         return result
 
     def eval_node(self, node, scope):
@@ -72,12 +186,15 @@ class Interpreter:
                 StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
             ]).throw()
         if isinstance(node, ast.UnaryLogicalNot):
-            return Boolean(result)
+            return Boolean.box(result)
         return result
 
-    def eval_call(self, node, scope):
+    def eval_call(self, node, scope, tail=False, spawn=False):
+        return self.call(self.eval(node.name, scope), node, scope, tail, spawn)
+
+    def call(self, f, node, scope, tail=False, spawn=False):
+        # spawn: evaluates the arguments, the call runs on the thread pool and this returns a Future
         ret = Null()
-        f = self.eval(node.name, scope)
         if f.operate("Call") is empty:
             OperatorError(f"Object of type {f.__class__.__name__!r} is not callable", stack=[
                 StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
@@ -90,32 +207,59 @@ class Interpreter:
             restype = f.restype
             if restype is empty:
                 restype = lambda x:x
-            if not inspect.isbuiltin(f.py_bind):
-                if len(inspect.getfullargspec(f.py_bind).args) != len(node.args.items):
+            if (arity := f.arity()) is not None:
+                if arity != len(node.args.items):
                     RuntimeError(
-                        f"{f.name!r} requires {len(inspect.getfullargspec(f.py_bind).args)} arguments but {len(node.args.items)} arguments were supplied",
+                        f"{f.name!r} requires {arity} arguments but {len(node.args.items)} arguments were supplied",
                         stack=[
                             StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
                     ]).throw()
-            ret = restype(f.py_bind(*[getattr(self.eval(arg, scope), "_obj", Null()) for arg in node.args.items if arg]))
-            if isinstance(ret, tuple) and ret[0] is empty:
-                RuntimeError(
-                    ret[1],
-                    stack=[
-                        StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
-                    ]).throw()
+            values = [getattr(self.eval(arg, scope), "_obj", Null()) for arg in node.args.items if arg]
+            if spawn:
+                return tasks.spawn(self.call_py_bind, f, restype, values, node, scope)
+            ret = self.call_py_bind(f, restype, values, node, scope)
         else:
+            if (budget := current_budget.get()) is not None and (message := budget.tick()) is not None:
+                BudgetError(message, stack=[
+                    StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
+                ]).throw()
             name = self.eval(node.name, scope)
-            f_scope = f.scope.merge(Scope(name, dict(zip([x.argument for x in f.parameters], [self.eval(arg, scope) for arg in node.args.items if arg]))))
-            f_scope.func = FuncScope(name)
-            # exec body of func within the scope
-            for statement in f.body:
-                self.eval(statement, f_scope)
-                if not f_scope.func.active:
-                    ret = f_scope.func.ret
-                    break
+            args = [self.eval(arg, scope) for arg in node.args.items if arg]
+            if spawn:
+                return tasks.spawn(self.run_function, f, name, args)
+            if tail:
+                return TailCall(f, name, args)
+            ret = self.run_function(f, name, args)
+        return ret
+
+    def call_py_bind(self, f, restype, values, node, scope):
+        ret = restype(wait(f.py_bind(*values)))
+        if isinstance(ret, tuple) and ret[0] is empty:
+            RuntimeError(
+                ret[1],
+                stack=[
+                    StackCall(self.file.name, node.line, node.column, repr(scope), self.file.line(node.line))
+                ]).throw()
         return ret
 
+    def run_function(self, f, name, args):
+        # a tail call comes back as a TailCall and runs in this loop instead of a nested one
+        while True:
+            ret = self.call_function(f, name, args)
+            if ret.__class__ is not TailCall:
+                return ret
+            f, name, args = ret
+
+    def call_function(self, f, name, args):
+        f_scope = f.scope.merge(Scope(name, dict(zip([x.argument for x in f.parameters], args))))
+        f_scope.func = FuncScope(name)
+        # exec body of func within the scope
+        for statement in f.body:
+            self.eval(statement, f_scope)
+            if not f_scope.func.active:
+                return f_scope.func.ret
+        return Null()
+
     def eval_if(self, node, scope):
         condition = self.eval(node.condition, scope)._obj
         success = False
@@ -135,8 +279,13 @@ class Interpreter:
         new_scope = scope.merge(Scope(scope.name, loop=loop, func=scope.func))
         self.eval(node.parts[0], new_scope)
         for_scope = scope.merge(new_scope)
+        budget, at = current_budget.get(), node.parts[1]
 
         while True:
+            if budget is not None and (message := budget.tick()) is not None:
+                BudgetError(message, stack=[
+                    StackCall(self.file.name, at.line, at.column, repr(scope), self.file.line(at.line))
+                ]).throw()
             condition = self.eval(node.parts[1], for_scope)
             if condition:
                 if not condition._obj:
@@ -156,7 +305,12 @@ class Interpreter:
     def eval_while(self, node, scope):
         loop = LoopScope("x")  # for future use so we can break via its name (break x)
         loop_scope = scope.merge(Scope(scope.name, loop=loop, func=scope.func))
+        budget, at = current_budget.get(), node.condition
         while True:
+            if budget is not None and (message := budget.tick()) is not None:
+                BudgetError(message, stack=[
+                    StackCall(self.file.name, at.line, at.column, repr(scope), self.file.line(at.line))
+                ]).throw()
             condition = self.eval(node.condition, loop_scope)
             if not condition._obj:
                 break
@@ -192,7 +346,7 @@ class Interpreter:
 
     def eval_attribute(self, node, scope):
         obj = self.eval(node.obj, scope)
-        res = obj.operate("GetAttr", String(node.attribute.argument))
+        res = obj.operate("GetAttr", self.eval_constant(node.attribute))
         if res is empty:
             AttributeError(f"{obj.__class__.__name__!r} has no attribute {node.attribute.argument!r}", stack=[
                 StackCall(self.file.name, node.attribute.line, node.attribute.column, repr(scope), self.file.line(node.attribute.line))
@@ -219,7 +373,9 @@ class Interpreter:
             return node
         elif isinstance(node, ast.Return):
             scope.func.ret = Null()
-            if node.argument:
+            if isinstance(node.argument, ast.Call) and not scope.loop:
+                scope.func.ret = self.eval_call(node.argument, scope, tail=True)
+            elif node.argument:
                 scope.func.ret = self.eval(node.argument, scope)
             scope.func.active = False
             return scope.func.ret
@@ -229,12 +385,10 @@ class Interpreter:
             return self.eval_assignment(node, scope)
         elif isinstance(node, ast.Call):
             return self.eval_call(node, scope)
-        elif isinstance(node, ast.Integer):
-            return Integer(node.argument)
-        elif isinstance(node, ast.String):
-            return String(node.argument)
-        elif isinstance(node, ast.Float):
-            return Float(node.argument)
+        elif isinstance(node, ast.Spawn):
+            return self.eval_call(node.argument, scope, spawn=True)
+        elif isinstance(node, (ast.Integer, ast.String, ast.Float)):
+            return self.eval_constant(node)
         elif isinstance(node, ast.BinaryNode):
             if isinstance(node.op, ast.LogicAnd):
                 res = self.eval(node.left, scope)._obj and self.eval(node.right, scope)._obj
@@ -242,8 +396,8 @@ class Interpreter:
                 res = self.eval(node.left, scope)._obj or self.eval(node.right, scope)._obj
             else:
                 res = self.eval_binary_node(node, scope)
-            if isinstance(res, int):
-                return Integer(res)
+            if isinstance(res, (int, float)):
+                return Integer.box(res)
             elif isinstance(res, str):
                 return String(res)
             return res
@@ -0,0 +1,90 @@
+import typing
+from ..parser import ast
+
+
+class Layout:
+    """
+    The slots of the scope a function call or a loop runs in, the names it binds itself.
+    Everything else is read from the enclosing scopes, the module's names from its namespace.
+    """
+
+    def __init__(self, parent: typing.Optional["Layout"], parameters=()):
+        self.parent = parent
+        self.slots: typing.Dict[str, int] = {}
+        self.parameters = [self.slot(parameter) for parameter in parameters]
+        self.n_parameters = len(self.slots)
+        # (slot, where the name is in the enclosing scope): the scope starts with a copy of what it can already see
+        self.copy_in: typing.List[typing.Tuple[int, typing.Optional[typing.Tuple[int, int]], str]] = []
+
+    def slot(self, name: str) -> int:
+        return self.slots.setdefault(name, len(self.slots))
+
+    def __len__(self):
+        return len(self.slots)
+
+
+class Resolver:
+    """
+    Maps every ast.Name to (depth, slot), the number of scopes to go up and the slot there,
+    or to None when the name lives in the module's namespace.
+    """
+
+    def __init__(self):
+        self.layouts: typing.Dict[int, Layout] = {}  # id(ast.Function / ast.While / ast.For) -> Layout
+        self.refs: typing.Dict[int, typing.Optional[typing.Tuple[int, int]]] = {}  # id(ast.Name) -> (depth, slot)
+
+    @staticmethod
+    def children(node):
+        for value in vars(node).values():
+            if isinstance(value, list):
+                yield from (item for item in value if isinstance(item, ast.Ast))
+            elif isinstance(value, ast.Ast):
+                yield value
+
+    @staticmethod
+    def lookup(name: str, layout: typing.Optional[Layout]):
+        depth = 0
+        while layout is not None:
+            if name in layout.slots:
+                return depth, layout.slots[name]
+            layout, depth = layout.parent, depth + 1
+        return None
+
+    def bind(self, node, layout: Layout):
+        # the names node binds in the scope it runs in, nested functions and loops get their own
+        if isinstance(node, ast.Function):
+            layout.slot(node.name.argument)
+            return
+        if isinstance(node, ast.Assignment):
+            layout.slot(node.name.argument)
+        if not isinstance(node, (ast.While, ast.For)):
+            for child in self.children(node):
+                self.bind(child, layout)
+
+    def new_layout(self, node, parent: typing.Optional[Layout], statements, parameters=()):
+        layout = self.layouts[id(node)] = Layout(parent, parameters)
+        for statement in statements:
+            self.bind(statement, layout)
+        for name, slot in list(layout.slots.items())[layout.n_parameters:]:
+            layout.copy_in.append((slot, self.lookup(name, parent), name))
+        return layout
+
+    def resolve(self, node, layout: typing.Optional[Layout] = None):
+        if isinstance(node, ast.Function):
+            if layout is not None:
+                self.refs[id(node.name)] = self.lookup(node.name.argument, layout)
+            inner = self.new_layout(node, layout, node.body, [param.argument for param in node.params.items])
+            for statement in node.body:
+                self.resolve(statement, inner)
+            return
+        if isinstance(node, (ast.While, ast.For)):
+            parts = node.parts if isinstance(node, ast.For) else [node.condition]
+            layout = self.new_layout(node, layout, parts + node.body)
+        elif isinstance(node, ast.Attribute):
+            # the attribute isn't a variable
+            self.resolve(node.obj, layout)
+            return
+        if isinstance(node, ast.Name):
+            self.refs[id(node)] = self.lookup(node.argument, layout)
+        for child in self.children(node):
+            self.resolve(child, layout)
@@ -1,4 +1,8 @@
-import copy
+import collections
+
+unbound = object()
+# what a call in tail position (`return f(...)`) evaluates to: the caller runs it in place of the returning function
+TailCall = collections.namedtuple("TailCall", "function name args")
 
 
 class LoopScope:
@@ -46,8 +50,42 @@ class Scope:
 
     def merge(self, other: "Scope"):
         s = Scope(other.name, {**self.namespace, **other.namespace}, other.func, other.loop)
-        s.frames = copy.deepcopy(self.frames)
+        s.frames = self.frames.copy()
         return s
 
+    @property
+    def globals(self):
+        return self.namespace
+
+    def __repr__(self):
+        return f"<scope: {self.name}>"
+
+
+class SlotScope:
+    """
+    The scope of a function call or a loop when names are resolved ahead of time (see resolver.py):
+    its own names live in slots, anything else is in a parent or in the module's namespace.
+    """
+    frames = []
+
+    def __init__(self, name, layout, parent, func=None, loop=None):
+        self.name = name
+        self.parent = parent
+        self.globals = parent.globals
+        self.func = func
+        self.loop = loop
+        self.slots = slots = [unbound] * len(layout)
+        for slot, ref, global_name in layout.copy_in:
+            if ref is None:
+                slots[slot] = self.globals.get(global_name, unbound)
+            else:
+                slots[slot] = parent.get_slot(*ref)
+
+    def get_slot(self, depth, slot):
+        scope = self
+        for _ in range(depth):
+            scope = scope.parent
+        return scope.slots[slot]
+
     def __repr__(self):
         return f"<scope: {self.name}>"
@@ -7,6 +7,8 @@ from .Null import Null
 
 
 class Array(Object):
+    __slots__ = ()
+
     def __init__(self, items):
         super().__init__()
         self._obj = items
@@ -24,7 +26,7 @@ class Array(Object):
         elif item is None:
             item = Null()
         elif isinstance(item, int):
-            item = Integer(item)
+            item = Integer.box(item)
         elif isinstance(item, list):
             item = Array(item)
         self._obj.append(item)
@@ -2,4 +2,13 @@ from .Integer import Integer
 
 
 class Boolean(Integer):
-    pass
+    __slots__ = ()
+
+    true = false = None
+
+    @classmethod
+    def box(cls, value):
+        return Boolean.true if value else Boolean.false
+
+
+Boolean.true, Boolean.false = Boolean(True), Boolean(False)
@@ -1,9 +1,10 @@
+import inspect
 from dataclasses import dataclass, field
 from .object import Object
 from .operator import Operator, Attribute
 
 
-@dataclass
+@dataclass(slots=True)
 class Function(Object):
     def __post_init__(self):
         Object.__init__(self)
@@ -16,6 +17,14 @@ class Function(Object):
     restype: ... = None
     scope: ... = None
     method_of: str = ""
+    code: ... = None
+    n_args: int = None
+
+    def arity(self):
+        # how many arguments py_bind takes, None if inspect can't tell (builtins); it's only inspected once
+        if self.n_args is None and not inspect.isbuiltin(self.py_bind):
+            self.n_args = len(inspect.getfullargspec(self.py_bind).args)
+        return self.n_args
 
     @Operator("Call", compatible=["Function"])
     def call(self, *args):
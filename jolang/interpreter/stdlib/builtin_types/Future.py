@@ -0,0 +1,29 @@
+from .object import Object
+from .operator import Attribute
+from .Boolean import Boolean
+
+
+class Future(Object):
+    """
+    What `spawn f(...)` evaluates to, the call running on the thread pool or in a spawned call waiting for it
+    (see interpreter/tasks.py).
+    """
+    __slots__ = ("future",)
+
+    def __init__(self, future):
+        super().__init__()
+        self.future = future
+        # what a py_bind gets, printing it shows the state at the time
+        self._obj = self
+
+    @Attribute("result")
+    def result(self):
+        # waits for the call, its error stops the program here as well
+        return self.future.result()
+
+    @Attribute("done")
+    def done(self):
+        return Boolean.box(self.future.done())
+
+    def __repr__(self):
+        return f"<Future {'done' if self.future.done() else 'running'}>"
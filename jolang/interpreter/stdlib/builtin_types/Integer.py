@@ -1,109 +1,166 @@
+import operator
 from .object import Object
 from .operator import Operator
 from .String import String
 
 
-class Integer(Object):
+class Number(Object):
+    """
+    What Integer and Float have in common, mixing them gives a Float like in Python.
+    """
+    __slots__ = ()
+
     def __init__(self, number):
         super().__init__()
         self._obj = number
 
-    @Operator("UnarySubtract", compatible=["Integer"])
+    @Operator("UnarySubtract", compatible=["Number"])
     def unary_subtract(self):
-        return Integer(-self._obj)
+        return Integer.box(-self._obj)
 
-    @Operator("UnaryAdd", compatible=["Integer"])
+    @Operator("UnaryAdd", compatible=["Number"])
     def unary_add(self):
-        return Integer(+self._obj)
-
-    @Operator("UnaryTilde", compatible=["Integer"])
-    def unary_tilde(self):
-        return Integer(~self._obj)
+        return Integer.box(+self._obj)
 
-    @Operator("Spaceship", compatible=["Integer"])
+    @Operator("Spaceship", compatible=["Number"])
     def spaceship(self, other):
         if self._obj > other._obj:
-            return Integer(1)
+            return Integer.box(1)
 
         if self._obj < other._obj:
-            return Integer(-1)
+            return Integer.box(-1)
 
-        return Integer(0)
+        return Integer.box(0)
 
 
-    @Operator("InplaceAdd", compatible=["Integer"])
-    @Operator("Add", compatible=["Integer"])
+    @Operator("InplaceAdd", compatible=["Number"])
+    @Operator("Add", compatible=["Number"])
     def add(self, other):
-        return Integer(self._obj + other._obj)
+        return Integer.box(self._obj + other._obj)
 
-    @Operator("InplaceSubtract", compatible=["Integer"])
-    @Operator("Subtract", compatible=["Integer"])
+    @Operator("InplaceSubtract", compatible=["Number"])
+    @Operator("Subtract", compatible=["Number"])
     def subtract(self, other):
-        return Integer(self._obj - other._obj)
+        return Integer.box(self._obj - other._obj)
 
-    @Operator("InplaceDivide", compatible=["Integer"])
-    @Operator("Divide", compatible=["Integer"])
+    @Operator("InplaceDivide", compatible=["Number"])
+    @Operator("Divide", compatible=["Number"])
     def divide(self, other):
-        return Integer(self._obj / other._obj)
+        return Integer.box(self._obj / other._obj)
 
-    @Operator("InplaceMultiply", compatible=["Integer"])
-    @Operator("Multiply", compatible=["Integer", "String"])
+    @Operator("InplaceMultiply", compatible=["Number"])
+    @Operator("Multiply", compatible=["Number"])
     def multiply(self, other):
-        if isinstance(other, String):
-            restype = String
-        else:
-            restype = Integer
-        return restype(self._obj * other._obj)
+        return Integer.box(self._obj * other._obj)
 
-    @Operator("InplaceModulo", compatible=["Integer"])
-    @Operator("Modulo", compatible=["Integer"])
+    @Operator("InplaceModulo", compatible=["Number"])
+    @Operator("Modulo", compatible=["Number"])
     def modulo(self, other):
-        return Integer(self._obj % other._obj)
+        return Integer.box(self._obj % other._obj)
 
-    @Operator("InplaceLessEqual", compatible=["Integer"])
-    @Operator("LessEqual", compatible=["Integer"])
+    @Operator("InplaceLessEqual", compatible=["Number"])
+    @Operator("LessEqual", compatible=["Number"])
     def less_equal(self, other):
-        return Integer(self._obj <= other._obj)
+        return Integer.box(self._obj <= other._obj)
 
-    @Operator("InplaceGreatEqual", compatible=["Integer"])
-    @Operator("GreatEqual", compatible=["Integer"])
+    @Operator("InplaceGreatEqual", compatible=["Number"])
+    @Operator("GreatEqual", compatible=["Number"])
     def great_equal(self, other):
-        return Integer(self._obj >= other._obj)
+        return Integer.box(self._obj >= other._obj)
 
-    @Operator("InplaceGreaterThan", compatible=["Integer"])
-    @Operator("GreaterThan", compatible=["Integer"])
+    @Operator("InplaceGreaterThan", compatible=["Number"])
+    @Operator("GreaterThan", compatible=["Number"])
     def greater_than(self, other):
-        return Integer(self._obj > other._obj)
+        return Integer.box(self._obj > other._obj)
 
-    @Operator("InplaceLesserThan", compatible=["Integer"])
-    @Operator("LesserThan", compatible=["Integer"])
+    @Operator("InplaceLesserThan", compatible=["Number"])
+    @Operator("LesserThan", compatible=["Number"])
     def lesser_than(self, other):
-        return Integer(self._obj < other._obj)
+        return Integer.box(self._obj < other._obj)
+
+
+class Integer(Number):
+    __slots__ = ()
+
+    # boxes for -5..1024 and True/False are shared, see box
+    small_ints = []
+    bools = ()
+
+    @staticmethod
+    def box(number):
+        # boxes any raw number, floats into a Float
+        if type(number) is int:
+            if -5 <= number <= 1024:
+                return Integer.small_ints[number + 5]
+        elif type(number) is bool:
+            return Integer.bools[number]
+        elif type(number) is float:
+            return Float(number)
+        return Integer(number)
+
+    @Operator("UnaryTilde", compatible=["Integer"])
+    def unary_tilde(self):
+        return Integer.box(~self._obj)
+
+    @Operator("InplaceMultiply", compatible=["Number"])
+    @Operator("Multiply", compatible=["Number", "String"])
+    def multiply(self, other):
+        if isinstance(other, String):
+            return String(self._obj * other._obj)
+        return Integer.box(self._obj * other._obj)
 
     @Operator("InplaceOr", compatible=["Integer"])
     @Operator("Or", compatible=["Integer"])
     def or_(self, other):
-        return Integer(self._obj | other._obj)
+        return Integer.box(self._obj | other._obj)
 
     @Operator("InplaceAnd", compatible=["Integer"])
     @Operator("And", compatible=["Integer"])
     def and_(self, other):
-        return Integer(self._obj & other._obj)
+        return Integer.box(self._obj & other._obj)
 
     @Operator("InplaceXor", compatible=["Integer"])
     @Operator("Xor", compatible=["Integer"])
     def xor(self, other):
-        return Integer(self._obj ^ other._obj)
+        return Integer.box(self._obj ^ other._obj)
 
     @Operator("InplaceLeftShift", compatible=["Integer"])
     @Operator("LeftShift", compatible=["Integer"])
     def left_shift(self, other):
-        return Integer(self._obj << other._obj)
+        return Integer.box(self._obj << other._obj)
 
     @Operator("InplaceRightShift", compatible=["Integer"])
     @Operator("RightShift", compatible=["Integer"])
     def right_shift(self, other):
-        return Integer(self._obj >> other._obj)
-
-class Float(Integer):
-    pass
+        return Integer.box(self._obj >> other._obj)
+
+
+class Float(Number):
+    __slots__ = ()
+
+
+def spaceship(a, b):
+    return (a > b) - (a < b)
+
+
+Integer.small_ints = [Integer(number) for number in range(-5, 1025)]
+Integer.bools = (Integer(False), Integer(True))
+
+# the operators above on raw Python numbers, so the engines don't box intermediate results:
+# op name -> (function, the raw types it takes, the boxes those are unboxed from).
+# Booleans aren't unboxed, an error has to name their type
+numbers, number_boxes = frozenset({int, bool, float}), frozenset({Integer, Float})
+integers, integer_boxes = frozenset({int, bool}), frozenset({Integer})
+kernels = {}
+for names, function in (
+        (("Add", "InplaceAdd"), operator.add), (("Subtract", "InplaceSubtract"), operator.sub),
+        (("Multiply", "InplaceMultiply"), operator.mul), (("Divide", "InplaceDivide"), operator.truediv),
+        (("Modulo", "InplaceModulo"), operator.mod), (("LessEqual", "InplaceLessEqual"), operator.le),
+        (("GreatEqual", "InplaceGreatEqual"), operator.ge), (("GreaterThan", "InplaceGreaterThan"), operator.gt),
+        (("LesserThan", "InplaceLesserThan"), operator.lt), (("Spaceship",), spaceship),
+        (("Equals",), operator.eq), (("NotEqual",), operator.ne)):
+    kernels.update(dict.fromkeys(names, (function, numbers, number_boxes)))
+for names, function in (
+        (("Or", "InplaceOr"), operator.or_), (("And", "InplaceAnd"), operator.and_), (("Xor", "InplaceXor"), operator.xor),
+        (("LeftShift", "InplaceLeftShift"), operator.lshift), (("RightShift", "InplaceRightShift"), operator.rshift)):
+    kernels.update(dict.fromkeys(names, (function, integers, integer_boxes)))
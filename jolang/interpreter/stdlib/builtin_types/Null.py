@@ -2,6 +2,16 @@ from .object import Object
 
 
 class Null(Object):
+    __slots__ = ()
+
+    # there's only one null
+    instance = None
+
+    def __new__(cls, *_):
+        if Null.instance is None:
+            Null.instance = super().__new__(cls)
+        return Null.instance
+
     def __init__(self, *_):
         super().__init__()
         self._obj = "null"
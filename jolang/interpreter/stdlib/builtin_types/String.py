@@ -3,6 +3,8 @@ from .operator import Operator
 
 
 class String(Object):
+    __slots__ = ()
+
     def __init__(self, string):
         super().__init__()
         self._obj = string
@@ -1,2 +1,2 @@
 class BuiltinType:
-    pass
+    __slots__ = ()
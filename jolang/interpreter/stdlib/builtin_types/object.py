@@ -2,46 +2,62 @@ from .builtin import BuiltinType
 from .operator import Operator, Attribute
 from . import empty
 
+# (operator, type of the object, types of the operands) -> the function implementing it, or empty
+dispatch = {}
+
 
 class Object(BuiltinType):
+    __slots__ = ("_obj",)
+
+    # built once per class, see build_tables
+    operators = {}
+    attributes = {}
+    mro_names = ()
+
     def __init__(self):
-        self.operators = self.__find_operators()
-        self.attributes = self.__find_attributes()
         self._obj = None
 
-    def __find_operators(self):
-        return {
-            name: op_.call
-            for op in dir(self) if isinstance(op_ := getattr(self, op), Operator) and not op.startswith("_") for name in op_.f.names
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.build_tables()
+
+    @classmethod
+    def build_tables(cls):
+        cls.mro_names = tuple(c.__name__ for c in cls.mro())
+        cls.operators = {
+            name: op_
+            for op in dir(cls) if isinstance(op_ := getattr(cls, op), Operator) and not op.startswith("_") for name in op_.f.names
         }
+        cls.attributes = {getattr(cls, name).op_name: getattr(cls, name) for name in dir(cls) if isinstance(getattr(cls, name, ""), Attribute)}
 
-    def __find_attributes(self):
-        return {getattr(self, name).op_name: getattr(self, name) for name in dir(self) if isinstance(getattr(self, name, ""), Attribute)}
+    @classmethod
+    def resolve(cls, op_name, types):
+        if not (op := cls.operators.get(op_name)) or not op.accepts(op_name, types):
+            return empty
+        return op.function
 
     def operate(self, op_name, *args):
-        if not (op := self.available_operator(op_name)):
-            return empty
+        if len(args) == 1:
+            key = (op_name, self.__class__, args[0].__class__)
         else:
-            return self.__do_operate(op, op_name, *args)
+            key = (op_name, self.__class__, *[arg.__class__ for arg in args])
+        if (f := dispatch.get(key)) is None:
+            f = dispatch[key] = self.resolve(op_name, key[2:])
+        if f is empty:
+            return empty
+        return f(self, *args)
 
     def available_operator(self, op_name):
-        if not self.operators:
-            self.operators = self.__find_operators()
-        if op := self.operators.get(op_name):
-            return op
-
-    def __do_operate(self, op, op_name, *args):
-        return op(op_name, self, *args)
+        return self.operators.get(op_name)
 
     def inheritance(self):
-        return [cls.__name__ for cls in self.__class__.mro()]
+        return list(self.mro_names)
 
     @Operator("GetAttr", compatible=["Object"])
     def getattr(self, attr):
         obj = self.attributes.get(attr._obj, empty)
         if obj is not empty:
-            obj.init(self)
-            return obj.function
+            return obj.bind(self)
         return obj
 
     def __repr__(self):
@@ -66,3 +82,6 @@ class Object(BuiltinType):
     @Operator("LogicOr", compatible=["Object"])
     def logic_or(self, other):
         pass
+
+
+Object.build_tables()
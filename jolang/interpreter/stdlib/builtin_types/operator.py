@@ -1,5 +1,6 @@
 from . import empty
 import inspect
+import functools
 
 
 class Operator:
@@ -20,18 +21,28 @@ class Operator:
         f.names[self.op_name] = self.compat
         return self
 
-    def call(self, op, *args):
+    @property
+    def function(self):
         f = self.f
         while isinstance(f, Operator):
             f = f.f
-        for arg in args[1:]:
-            if arg and not any(x in f.names[op] for x in arg.inheritance()):
-                return empty
-        return f(*args)
+        return f
+
+    def accepts(self, op, types):
+        compatible = self.function.names[op]
+        return all(
+            cls is type(None) or any(x in compatible for x in cls.mro_names)
+            for cls in types
+        )
+
+    def call(self, op, *args):
+        if not self.accepts(op, [arg.__class__ for arg in args[1:]]):
+            return empty
+        return self.function(*args)
 
 
 class Attribute:
-    function = Function = ...
+    Function = ...
 
     def __init__(self, op_name):
         self.op_name = op_name
@@ -40,16 +51,15 @@ class Attribute:
     def __call__(self, function):
         function.attr = self.op_name
         self.f = function
-        self.function = Attribute.Function(self.op_name, py_bind=self.func, method_of=function.__module__.rsplit(".", 1)[-1], restype=empty)
+        self.method_of = function.__module__.rsplit(".", 1)[-1]
+        # the arguments of the method, the object it's bound to isn't one
+        self.n_args = len(inspect.getfullargspec(function).args) - 1
         return self
 
-    def init(self, obj):
-        self.obj = obj
-
-    def func(self, *items):
-        if len(inspect.getfullargspec(self.f).args) - 1 != len(items):
-            return empty, f"{self.f.attr!r} requires {len(inspect.getfullargspec(self.f).args) - 1} arguments but {len(items)} arguments were supplied",
-        return self.f(self.obj, *items)
+    def bind(self, obj):
+        # a method of its own for every access, the object isn't kept on the Attribute shared by the whole class
+        return Attribute.Function(self.op_name, py_bind=functools.partial(self.f, obj), method_of=self.method_of,
+                                  restype=empty, n_args=self.n_args)
 
     def __repr__(self):
-        return str(self.function)
+        return f"<Method {self.op_name!r} of object {self.method_of!r}>"
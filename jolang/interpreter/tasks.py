@@ -0,0 +1,61 @@
+import threading
+import contextvars
+import concurrent.futures
+from .stdlib.builtin_types.Future import Future
+
+# the threads `spawn` runs calls on; a blocking py_bind (I/O, sleeping) lets the others run meanwhile
+max_workers = 32
+executor = None
+lock = threading.Lock()
+# worker is set on the threads of executor
+local = threading.local()
+
+
+class Task(concurrent.futures.Future):
+    """
+    A spawned call, run by whichever comes first: a thread of the pool, or a spawned call waiting for its result.
+    A call waiting on the pool would hold its thread, and calls spawning and waiting on calls would take every thread.
+    """
+
+    def __init__(self, function, *args):
+        super().__init__()
+        self.function, self.args = function, args
+        self.started = False
+        self.start_lock = threading.Lock()
+
+    def run(self):
+        with self.start_lock:
+            if self.started:
+                return
+            self.started = True
+        self.set_running_or_notify_cancel()
+        try:
+            result = self.function(*self.args)
+        except BaseException as error:
+            self.set_exception(error)
+        else:
+            self.set_result(result)
+        finally:
+            self.function = self.args = None
+
+    def result(self, timeout=None):
+        if getattr(local, "worker", False):
+            self.run()
+        return super().result(timeout)
+
+
+def start_worker():
+    local.worker = True
+
+
+def spawn(function, *args) -> Future:
+    global executor
+    if executor is None:
+        with lock:
+            if executor is None:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers, thread_name_prefix="jolang-spawn", initializer=start_worker)
+    # the call sees the context variables of the spawning code, like errors.print_traceback
+    task = Task(contextvars.copy_context().run, function, *args)
+    executor.submit(task.run)
+    return Future(task)
@@ -0,0 +1,164 @@
+import types
+from .interpreter import Interpreter, wait
+from .vm import rebox
+from .scope import TailCall, unbound
+from . import tasks
+from .budget import current_budget
+from .errors import NameError, StackCall, AttributeError, OperatorError, RuntimeError, BudgetError
+from ..parser import ast
+from ..transpiler import Transpiler, transpile
+from .stdlib.builtin_types.Integer import Integer, Float, numbers, integers, number_boxes, integer_boxes
+from .stdlib.builtin_types.String import String
+from .stdlib.builtin_types.Null import Null
+from .stdlib.builtin_types import empty
+from .stdlib.builtin_types.Function import Function
+from .stdlib.builtin_types.Boolean import Boolean
+from .stdlib.builtin_types.Array import Array
+
+
+def trampoline(call):
+    while call.__class__ is TailCall:
+        call = call.function(*call.args)
+    return call
+
+
+def spawn(function, args):
+    return tasks.spawn(lambda: trampoline(function(*args)))
+
+
+class TranspiledInterpreter(Interpreter):
+    """
+    Transpiles the program to Python (see jolang.transpiler) and runs it.
+    The methods below are the helpers the generated code calls whenever a value isn't a plain number,
+    they take the index of the node in Program.positions to report errors.
+    """
+
+    events = frozenset()
+
+    def __init__(self, file):
+        super().__init__(file)
+        self.program = None
+        # the Program of file's AST, transpiled (or found in the transpiler's cache) once
+        self.module = None
+
+    def stack(self, position):
+        line, column, scope, _ = self.program.positions[position]
+        return [StackCall(self.file.name, line, column, f"<scope: {scope}>", self.file.line(line))]
+
+    def name_error(self, name, position):
+        line, column, _, scope = self.program.positions[position]
+        # make_stack's format
+        NameError(f"{name!r} doesn't exist in the current scope",
+                  stack=[StackCall(self.file.name, line, column, scope, self.file.line(line))]).throw()
+
+    def inplace_name_error(self, name, position):
+        NameError(f"{name!r} doesn't exist in the current scope", stack=self.stack(position)).throw()
+
+    def operate(self, left, right, op_name, position):
+        left, right = rebox(left), rebox(right)
+        result = left.operate(op_name, right)
+        if result is empty:
+            OperatorError(f"Can't {op_name} with {left.__class__.__name__!r} and {right.__class__.__name__!r}",
+                          stack=self.stack(position)).throw()
+        if op_name == "Equals" or op_name == "NotEqual":
+            return Integer.box(result)
+        return rebox(result)
+
+    def inplace(self, left, right, op_name, position):
+        if (result := left.operate(op_name, rebox(right))) is empty:
+            OperatorError(f"Can't {op_name} with {left.__class__.__name__!r} and {result.__class__.__name__!r}",
+                          stack=self.stack(position)).throw()
+        return result
+
+    def unary(self, obj, op_name, position):
+        result = obj.operate(op_name)
+        if result is empty:
+            OperatorError(f"Can't {op_name} with {obj.__class__.__name__!r}", stack=self.stack(position)).throw()
+        if op_name == "UnaryLogicalNot":
+            return Boolean.box(result)
+        return result
+
+    def callable_(self, f, n_args, position):
+        if f.operate("Call") is empty:
+            OperatorError(f"Object of type {f.__class__.__name__!r} is not callable", stack=self.stack(position)).throw()
+        if f.py_bind:
+            return lambda *args: self.call_py_bind(f, args, position)
+        RuntimeError(f"{f.name} requires {len(f.parameters)} arguments but {n_args} arguments were supplied",
+                     stack=self.stack(position)).throw()
+
+    def call_py_bind(self, f, args, position):
+        restype = f.restype
+        if restype is empty:
+            restype = lambda x: x
+        if (arity := f.arity()) is not None:
+            if arity != len(args):
+                RuntimeError(f"{f.name!r} requires {arity} arguments "
+                             f"but {len(args)} arguments were supplied", stack=self.stack(position)).throw()
+        ret = restype(wait(f.py_bind(*[getattr(arg, "_obj", Null()) for arg in args])))
+        if isinstance(ret, tuple) and ret[0] is empty:
+            RuntimeError(ret[1], stack=self.stack(position)).throw()
+        return ret
+
+    def tick(self, budget, position):
+        if (message := budget.tick()) is not None:
+            BudgetError(message, stack=self.stack(position)).throw()
+        return True
+
+    def index(self, obj, start, stop, step, position):
+        res = obj.operate("Index", start, stop, step)
+        if res is empty:
+            OperatorError(f"Can't slice '{obj}'", stack=self.stack(position)).throw()
+        return res
+
+    def attribute(self, obj, name, position):
+        res = obj.operate("GetAttr", name)
+        if res is empty:
+            AttributeError(f"{obj.__class__.__name__!r} has no attribute {name._obj!r}", stack=self.stack(position)).throw()
+        return res
+
+    @staticmethod
+    def const(value):
+        if isinstance(value, tuple):
+            # the parameters of a function
+            return [ast.Name(line, column, name) for name, line, column in value]
+        if isinstance(value, str):
+            return String(value)
+        if isinstance(value, float):
+            return Float(value)
+        return Integer.box(value)
+
+    def namespace(self, scope):
+        namespace = {f"k{i}": self.const(value) for i, value in enumerate(self.program.consts)}
+        g = scope.globals
+
+        def assign(name, value):
+            g[name] = value
+            return value
+
+        namespace.update(
+            g=g, assign=assign, unbound=unbound, null=Null(), once=(None,), box=Integer.box, rebox=rebox,
+            numbers=numbers, integers=integers, number_boxes=number_boxes, integer_boxes=integer_boxes,
+            TailCall=TailCall, trampoline=trampoline, spawn=spawn, current_budget=current_budget, Function=Function,
+            python_function=types.FunctionType, Array=Array,
+            function=lambda name, parameters, code: Function(name, parameters, code=code),
+            name_error=self.name_error, inplace_name_error=self.inplace_name_error, operate=self.operate,
+            inplace=self.inplace, unary=self.unary, callable_=self.callable_, tick=self.tick, index=self.index,
+            attribute=self.attribute,
+        )
+        return namespace
+
+    def eval(self, node=None, scope=None):
+        if not node:
+            node = self.node
+        if not scope:
+            scope = self.scope
+        if node is self.node:
+            if self.module is None:
+                self.module = transpile(node, self.file.name)
+            self.program = self.module
+        else:
+            self.program = Transpiler.transpile(ast.Body(node.line, node.column, [ast.Return(node.line, node.column, node)]),
+                                                self.file.name)
+        namespace = self.namespace(scope)
+        exec(self.program.code, namespace)
+        return namespace["module"]()
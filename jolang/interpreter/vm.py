@@ -0,0 +1,306 @@
+import inspect
+from .interpreter import Interpreter, wait
+from .scope import Scope, FuncScope, Frame as CallFrame
+from . import tasks
+from .budget import current_budget
+from .errors import NameError, StackCall, AttributeError, OperatorError, RuntimeError, BudgetError, make_stack
+from ..bytecode import Compiler
+from ..bytecode.opcodes import *
+from ..parser import ast
+from .stdlib.builtin_types.Integer import Integer, kernels
+from .stdlib.builtin_types.String import String
+from .stdlib.builtin_types.Null import Null
+from .stdlib.builtin_types import empty
+from .stdlib.builtin_types.Function import Function
+from .stdlib.builtin_types.Boolean import Boolean
+from .stdlib.builtin_types.Array import Array
+
+
+def rebox(value):
+    if isinstance(value, (int, float)):
+        return Integer.box(value)
+    elif isinstance(value, str):
+        return String(value)
+    return value
+
+
+class Frame:
+    def __init__(self, code, scope):
+        self.code = code
+        self.scope = scope
+        self.stack = []
+        self.scopes = []  # the scopes ENTER_SCOPE replaced
+        self.pc = 0
+
+
+class VirtualMachine(Interpreter):
+    """
+    Compiles the AST to bytecode (see jolang.bytecode) and runs it in a single dispatch loop.
+    JoLang calls push a Frame instead of recursing in Python, so the call depth is only bounded by max_depth.
+    """
+    max_depth = 10000
+    events = frozenset()
+
+    def __init__(self, file, max_depth=None):
+        super().__init__(file)
+        self.code = None
+        if max_depth is not None:
+            self.max_depth = max_depth
+
+    def error(self, error, message, frame, offset, scope=None):
+        line, column = frame.code.positions[offset // 2]
+        scope = scope or frame.scope
+        error(message, stack=[StackCall(self.file.name, line, column, repr(scope), self.file.line(line))]).throw()
+
+    def overflow(self, frames, frame, offset):
+        # make_stack wants the calls that led here most recent first, followed by one it leaves out
+        scope = Scope(frame.scope.name)
+        scope.frames = [CallFrame(caller.scope.name, line, column)
+                        for caller in reversed(frames) for line, column in [caller.code.positions[caller.pc // 2 - 1]]] + [None]
+        line, column = frame.code.positions[offset // 2]
+        RuntimeError(f"maximum call depth ({self.max_depth}) exceeded",
+                     stack=make_stack(self.file, ast.Node(line, column), scope)).throw()
+
+    def call_py_bind(self, f, args, frame, offset):
+        # what the py_bind returns, an awaitable is waited for by whoever drives execute
+        if (arity := f.arity()) is not None:
+            if arity != len(args):
+                self.error(RuntimeError, f"{f.name!r} requires {arity} arguments "
+                                         f"but {len(args)} arguments were supplied", frame, offset)
+        return f.py_bind(*[getattr(arg, "_obj", Null()) for arg in args])
+
+    def py_bind_result(self, f, ret, frame, offset):
+        restype = f.restype
+        if restype is empty:
+            restype = lambda x: x
+        ret = restype(ret)
+        if isinstance(ret, tuple) and ret[0] is empty:
+            self.error(RuntimeError, ret[1], frame, offset)
+        return ret
+
+    def run_py_bind(self, f, args, frame, offset):
+        # the whole of a py_bind call, for SPAWN
+        return self.py_bind_result(f, wait(self.call_py_bind(f, args, frame, offset)), frame, offset)
+
+    def run(self, code, scope):
+        steps = self.execute(code, scope)
+        try:
+            awaitable = steps.send(None)
+            while True:
+                # not on an event loop, the awaitable is waited for right here
+                try:
+                    value = wait(awaitable)
+                except Exception as e:
+                    awaitable = steps.throw(e)
+                else:
+                    awaitable = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+    async def run_async(self, code, scope):
+        steps = self.execute(code, scope)
+        try:
+            awaitable = steps.send(None)
+            while True:
+                try:
+                    value = await awaitable
+                except Exception as e:
+                    awaitable = steps.throw(e)
+                else:
+                    awaitable = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+    def execute(self, code, scope):
+        # a generator running code in scope: it yields the awaitables py_binds return and is sent their results,
+        # its return value is the program's
+        frame = Frame(code, scope)
+        frames = []
+        instructions, consts, names, stack = code.instructions, code.consts, code.names, frame.stack
+        pc = 0
+        # jumping back (a loop) and calling a JoLang function tick it
+        budget = current_budget.get()
+        while True:
+            op = instructions[pc]
+            arg = instructions[pc + 1]
+            pc += 2
+            if op == LOAD_NAME:
+                namespace = frame.scope.namespace
+                name = names[arg]
+                if name in namespace:
+                    stack.append(namespace[name])
+                else:
+                    line, column = code.positions[pc // 2 - 1]
+                    NameError(f"{name!r} doesn't exist in the current scope",
+                              stack=make_stack(self.file, ast.Name(line, column, name), frame.scope)).throw()
+            elif op == LOAD_CONST:
+                stack.append(consts[arg])
+            elif op == BINARY_OP:
+                right = stack.pop()
+                left = stack[-1]
+                op_name = names[arg]
+                if (kernel := kernels.get(op_name)) and left.__class__ in kernel[2] and right.__class__ in kernel[2]:
+                    stack[-1] = Integer.box(kernel[0](left._obj, right._obj))
+                    continue
+                result = left.operate(op_name, right)
+                if result is empty:
+                    self.error(OperatorError, f"Can't {op_name} with {left.__class__.__name__!r} and {right.__class__.__name__!r}",
+                               frame, pc - 2)
+                if op_name == "Equals" or op_name == "NotEqual":
+                    result = Integer.box(result)
+                stack[-1] = rebox(result)
+            elif op == STORE_NAME:
+                frame.scope.namespace[names[arg]] = stack[-1]
+            elif op == POP_JUMP_IF_FALSE:
+                if not stack.pop()._obj:
+                    pc = arg
+            elif op == JUMP:
+                if arg < pc and budget is not None and (message := budget.tick()) is not None:
+                    self.error(BudgetError, message, frame, pc - 2)
+                pc = arg
+            elif op == POP_TOP:
+                stack.pop()
+            elif op == LOAD_INPLACE:
+                namespace = frame.scope.namespace
+                name = names[arg]
+                if name not in namespace:
+                    self.error(NameError, f"{name!r} doesn't exist in the current scope", frame, pc - 2)
+                stack.append(namespace[name])
+            elif op == INPLACE_OP:
+                right = stack.pop()
+                left = stack[-1]
+                if (kernel := kernels.get(names[arg])) and left.__class__ in kernel[2] and right.__class__ in kernel[2]:
+                    result = Integer.box(kernel[0](left._obj, right._obj))
+                elif (result := left.operate(names[arg], right)) is empty:
+                    self.error(OperatorError, f"Can't {names[arg]} with {left.__class__.__name__!r} and {result.__class__.__name__!r}",
+                               frame, pc - 2)
+                stack[-1] = result
+            elif op == CALL or op == TAIL_CALL:
+                args = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                f = stack[-1]
+                if f.operate("Call") is empty:
+                    self.error(OperatorError, f"Object of type {f.__class__.__name__!r} is not callable", frame, pc - 2)
+                if f.py_bind:
+                    frame.pc = pc
+                    ret = self.call_py_bind(f, args, frame, pc - 2)
+                    if inspect.isawaitable(ret):
+                        ret = yield ret
+                    stack[-1] = self.py_bind_result(f, ret, frame, pc - 2)
+                    continue
+                if arg != len(f.parameters):
+                    self.error(RuntimeError, f"{f.name} requires {len(f.parameters)} arguments but {arg} arguments were supplied",
+                               frame, pc - 2)
+                if budget is not None and (message := budget.tick()) is not None:
+                    self.error(BudgetError, message, frame, pc - 2)
+                stack.pop()
+                f_scope = f.scope.merge(Scope(f, dict(zip([x.argument for x in f.parameters], args))))
+                f_scope.func = FuncScope(f)
+                if op == CALL:
+                    if len(frames) >= self.max_depth:
+                        self.overflow(frames, frame, pc - 2)
+                    frame.pc = pc
+                    frames.append(frame)
+                frame = Frame(f.code, f_scope)
+                code = f.code
+                instructions, consts, names, stack = code.instructions, code.consts, code.names, frame.stack
+                pc = 0
+            elif op == RETURN_VALUE:
+                value = stack.pop()
+                if not frames:
+                    return value
+                frame = frames.pop()
+                code = frame.code
+                instructions, consts, names, stack = code.instructions, code.consts, code.names, frame.stack
+                pc = frame.pc
+                stack.append(value)
+            elif op == UNARY_OP:
+                obj = stack[-1]
+                op_name = names[arg]
+                result = obj.operate(op_name)
+                if result is empty:
+                    self.error(OperatorError, f"Can't {op_name} with {obj.__class__.__name__!r}", frame, pc - 2)
+                if op_name == "UnaryLogicalNot":
+                    result = Boolean.box(result)
+                stack[-1] = result
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if not stack[-1]._obj:
+                    stack[-1] = rebox(stack[-1]._obj)
+                    pc = arg
+                else:
+                    stack.pop()
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]._obj:
+                    stack[-1] = rebox(stack[-1]._obj)
+                    pc = arg
+                else:
+                    stack.pop()
+            elif op == REBOX:
+                stack[-1] = rebox(stack[-1]._obj)
+            elif op == ENTER_SCOPE:
+                frame.scopes.append(frame.scope)
+                frame.scope = frame.scope.merge(Scope(frame.scope.name, func=frame.scope.func))
+            elif op == EXIT_SCOPE:
+                frame.scope = frame.scopes.pop()
+            elif op == LOAD_NULL:
+                stack.append(Null())
+            elif op == MAKE_FUNCTION:
+                function = consts[arg]
+                frame.scope.register(function.name, Function(function.name, function.parameters, function.body,
+                                                              scope=frame.scope, code=function))
+            elif op == BUILD_ARRAY:
+                items = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                stack.append(Array(items))
+            elif op == INDEX:
+                parts = [stack.pop() if arg & bit else None for bit in (4, 2, 1)]
+                obj = stack[-1]
+                res = obj.operate("Index", *parts[::-1])
+                if res is empty:
+                    self.error(OperatorError, f"Can't slice '{obj}'", frame, pc - 2)
+                stack[-1] = res
+            elif op == GET_ATTR:
+                obj = stack[-1]
+                res = obj.operate("GetAttr", consts[arg])
+                if res is empty:
+                    self.error(AttributeError, f"{obj.__class__.__name__!r} has no attribute {consts[arg]._obj!r}", frame, pc - 2)
+                stack[-1] = res
+            elif op == SPAWN:
+                args = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                f = stack[-1]
+                if f.operate("Call") is empty:
+                    self.error(OperatorError, f"Object of type {f.__class__.__name__!r} is not callable", frame, pc - 2)
+                if f.py_bind:
+                    stack[-1] = tasks.spawn(self.run_py_bind, f, args, frame, pc - 2)
+                    continue
+                if arg != len(f.parameters):
+                    self.error(RuntimeError, f"{f.name} requires {len(f.parameters)} arguments but {arg} arguments were supplied",
+                               frame, pc - 2)
+                f_scope = f.scope.merge(Scope(f, dict(zip([x.argument for x in f.parameters], args))))
+                f_scope.func = FuncScope(f)
+                stack[-1] = tasks.spawn(self.run, f.code, f_scope)
+            else:
+                raise SystemError(f"Unknown opcode {op}")
+
+    def compile(self, node):
+        if node is self.node:
+            if self.code is None:
+                self.code = Compiler.compile(node)
+            return self.code
+        return Compiler.compile(ast.Body(node.line, node.column, [ast.Return(node.line, node.column, node)]))
+
+    def eval(self, node=None, scope=None):
+        if not node:
+            node = self.node
+        result = self.run(self.compile(node), scope or self.scope)
+        if node is not self.node:
+            return result
+
+    async def eval_async(self, node=None, scope=None):
+        # like eval, but the awaitables py_binds return are awaited, so other tasks run meanwhile
+        if not node:
+            node = self.node
+        result = await self.run_async(self.compile(node), scope or self.scope)
+        if node is not self.node:
+            return result
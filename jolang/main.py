@@ -1,16 +1,40 @@
-from .tokenizer import Tokenizer, tokens_generator, tokens
+import os
+import typing
+from .tokenizer import Tokenizer
 from .preprocessor import preprocess
 from .parser import Parser
-from .interpreter import Interpreter, file
+from .interpreter import engines, file
+from .cache import Cache
 
 
 def untokenize(stream):
     for i in stream:
-        yield getattr(tokens, tokens_generator.uppercase_to_pascal_case(i.name)).value or i.content
+        yield i.value or i.content
 
 
-def main(code: str):
-    stream = Tokenizer(code).tokenize()
-    interpreter = Interpreter(file.File(code, "shell", Parser(preprocess(stream)).parse()))
-    return interpreter.eval()
+def engine_options(engine: str, max_depth: int = None) -> dict:
+    # the keyword arguments of the engine's constructor
+    if max_depth is None:
+        return {}
+    if not hasattr(engines[engine], "max_depth"):
+        raise ValueError(f"the {engine!r} engine has no max_depth, calls nest as deep as Python's recursion limit")
+    return {"max_depth": max_depth}
+
 
+def main(code: typing.Union[str, os.PathLike], engine: str = "tree", macros: dict = None,
+         cache: typing.Union[Cache, str] = None, name: str = "shell", max_depth: int = None):
+    # code: the source, or the path of a file to tokenize as it's read
+    # cache: a Cache or its directory, to skip tokenizing and parsing a script that was run before
+    # max_depth: the deepest JoLang call the vm engine runs before a RuntimeError (VirtualMachine.max_depth)
+    if cache is not None:
+        if isinstance(cache, str):
+            cache = Cache(cache)
+        if isinstance(code, os.PathLike):
+            # the cache's key is the whole source
+            with open(code, encoding="utf-8") as f:
+                code = f.read()
+        node = cache.parse(code, macros)
+    else:
+        node = Parser(preprocess(Tokenizer(code).tokenize(), macros)).parse()
+    interpreter = engines[engine](file.File(code, name, node), **engine_options(engine, max_depth))
+    return interpreter.eval()
@@ -1,8 +1,15 @@
 import inspect
 import typing
+import functools
 
 
 class Ast:
+    @classmethod
+    @functools.cache
+    def fields(cls) -> typing.Tuple[str, ...]:
+        # the parameters of __init__, line and column first
+        return tuple(inspect.signature(cls.__init__).parameters)[1:]
+
     @staticmethod
     def format_arg(argument):
         if isinstance(argument, str):
@@ -10,7 +17,7 @@ class Ast:
         return argument
 
     def format_args(self):
-        return ", ".join(f"{x}={self.format_arg(getattr(self, x, None))}" for x in inspect.signature(self.__init__).parameters)
+        return ", ".join(f"{x}={self.format_arg(getattr(self, x, None))}" for x in self.fields())
 
     def __repr__(self):
         return f"ast.{self.__class__.__name__}({self.format_args()})"
@@ -18,8 +25,7 @@ class Ast:
     def __eq__(self, other):
         if not type(self) is type(other):
             return False
-        params = inspect.signature(self.__init__).parameters.keys()
-        return all((getattr(self, param) == getattr(other, param)) for param in params)
+        return all((getattr(self, param) == getattr(other, param)) for param in self.fields())
 
 class Operator(Ast):
     def __init__(self, line, column):
@@ -173,6 +179,7 @@ class Name(Node): pass
 class Return(Node): pass
 class Break(Node): pass
 class Continue(Node): pass
+class Spawn(Node): pass
 
 # containers
 
@@ -7,5 +7,6 @@ keywords = [
     "while",
     "continue",
     "break",
-    "return"
+    "return",
+    "spawn"
 ]
@@ -0,0 +1,27 @@
+import typing
+import collections
+from ..tokenizer.tokens import Token
+
+
+class Lookahead:
+    """
+    The tokens of a stream, None once it's over. The tokens pushed back or peeked at wait in a ring buffer that's read
+    before the stream: taking and pushing back a token are O(1), peeking k tokens ahead reads at most k + 1 of them.
+    """
+
+    def __init__(self, stream: typing.Iterator[Token]):
+        self.stream = stream
+        self.buffer: typing.Deque[typing.Optional[Token]] = collections.deque()
+
+    def take(self) -> typing.Optional[Token]:
+        return self.buffer.popleft() if self.buffer else next(self.stream, None)
+
+    def peek(self, k: int = 0) -> typing.Optional[Token]:
+        # the token k after the next one taken
+        while len(self.buffer) <= k:
+            self.buffer.append(next(self.stream, None))
+        return self.buffer[k]
+
+    def push(self, token: typing.Optional[Token]):
+        # token is the next one taken
+        self.buffer.appendleft(token)
@@ -1,11 +1,9 @@
 import typing
 from .keywords import keywords
-from ..tokenizer.tokens import Identifier, Token
+from ..tokenizer.tokens import Token, Keyword, IDENTIFIER, KEYWORD
 from ..tokenizer import tokens
 from . import ast, errors
-
-
-Keyword = Token("KEYWORD")
+from .lookahead import Lookahead
 
 
 class Parser:
@@ -31,10 +29,27 @@ class Parser:
         tokens.InplaceBinAnd: ast.InplaceBinAnd,
         tokens.InplaceXor: ast.InplaceXor
     }
+    # a binary operator's kind -> its precedence (the higher, the tighter it binds), the node it makes, its operator
+    # and how far past the operator a missing operand is reported
+    binary_op_table = {
+        tokens.LOGIC_OR: (1, ast.BinaryNode, ast.LogicOr, 1),
+        tokens.LOGIC_AND: (2, ast.BinaryNode, ast.LogicAnd, 1),
+        **{token.kind: (3, ast.Compare, op, len(token.value)) for token, op in comp_op_table.items()},
+        tokens.BIN_OR: (4, ast.BinaryNode, ast.Or, 1),
+        tokens.XOR: (5, ast.BinaryNode, ast.Xor, 1),
+        tokens.BIN_AND: (6, ast.BinaryNode, ast.And, 1),
+        tokens.LEFT_SHIFT: (7, ast.BinaryNode, ast.LeftShift, 2),
+        tokens.RIGHT_SHIFT: (7, ast.BinaryNode, ast.RightShift, 2),
+        tokens.ADD: (8, ast.BinaryNode, ast.Add, 1),
+        tokens.SUBTRACT: (8, ast.BinaryNode, ast.Subtract, 1),
+        tokens.MULTIPLY: (9, ast.BinaryNode, ast.Multiply, 1),
+        tokens.DIVIDE: (9, ast.BinaryNode, ast.Divide, 1),
+        tokens.MODULO: (9, ast.BinaryNode, ast.Modulo, 1),
+    }
 
     def __init__(self, stream: typing.Iterable[Token]):
         self.macros: typing.Dict[typing.Tuple[str, str], typing.List[tokens.Token]] = {}
-        self.tokens_stream = self.cast_identifier_to_keyword(stream)
+        self.tokens = Lookahead(self.cast_identifier_to_keyword(stream))
         self._current_token: typing.Optional[Token] = None
         self.next_token: typing.Optional[Token] = None
         self.advance()
@@ -48,11 +63,14 @@ class Parser:
         self._current_token = item
 
     def advance(self) -> None:
-        self.current_token, self.next_token = self.next_token, next(self.tokens_stream, None)
+        self.current_token, self.next_token = self.next_token, self.tokens.take()
 
     def push_token_back(self):
-        self.tokens_stream = iter([self.current_token, self.next_token] + list(self.tokens_stream))
-        self.advance()
+        # the current token is the next one again, and the next one after it
+        # (the current token is left as the next one was, the one before isn't kept)
+        current = self.current_token
+        self.tokens.push(self.next_token)
+        self.current_token, self.next_token = self.next_token, current
 
     def is_eof(self) -> bool:
         return not self.next_token
@@ -62,13 +80,13 @@ class Parser:
             if isinstance(token, dict):
                 self.macros = token
                 continue
-            if token.name == Identifier.name and token.content in keywords:
-                yield Keyword.set_content(token.line, token.col, token.content)
+            if token.kind == IDENTIFIER and token.content in keywords:
+                yield Token(KEYWORD, token.content, token.line, token.col)
             else:
                 yield token
 
     def accept(self, token: Token):
-        if self.next_token and isinstance(self.next_token, token):
+        if (next_token := self.next_token) is not None and next_token.kind == token.kind:
             self.advance()
             return True
         return False
@@ -91,7 +109,7 @@ class Parser:
     def parse_atom(self):
         node = None
         unary_op = True
-        # Atom: ({'~'|'-'|'+'|'!'} Atom) | '(' [Assignment] ')' | Literal | (Literal '(' [Args] ')')
+        # Atom: ({'~'|'-'|'+'|'!'} Atom) | '(' [Assignment] ')' | Literal | (Literal '(' [Args] ')') | Spawn
         if self.accept(tokens.UnaryTilde):
             node = ast.UnaryTilde(self.current_token.line, self.current_token.col, self.parse_atom())
         elif self.accept(tokens.LogicNot):
@@ -115,7 +133,10 @@ class Parser:
             elif self.accept(tokens.LeftBracket):
                 self.push_token_back()
                 node = self.parse_array()
-            while not self.is_eof() and isinstance(self.next_token, (tokens.LeftParen, tokens.LeftBracket, tokens.Dot)):
+            elif not self.is_eof() and self.next_token.kind == KEYWORD and self.next_token.content == "spawn":
+                self.advance()
+                node = self.parse_spawn()
+            while not self.is_eof() and self.next_token.kind in (tokens.LEFT_PAREN, tokens.LEFT_BRACKET, tokens.DOT):
                 while self.accept(tokens.LeftParen):
                     if self.accept(tokens.RightParen):
                         node = ast.Call(self.current_token.line, self.current_token.col - 1, node, ast.Arguments(self.current_token.line, self.current_token.col, []))
@@ -140,69 +161,17 @@ class Parser:
             self.throw(None)
         return node
 
-    def parse_comp_op(self):
-        # CompOp: '==' | '!=' | '<=' | '>=' | '<' | '>' | '<=>'
-        for i, l in (
-                (tokens.IsEqual, 2), (tokens.NotEqual, 2),
-                (tokens.LessEqual, 2), (tokens.GreatEqual, 2),
-                (tokens.LesserThan, 1), (tokens.GreaterThan, 1),
-                (tokens.Spaceship, 3),
-        ):
-            if self.accept(i):
-                return self.comp_op_table[i], l
-
-    def parse_comp(self):
-        # CompExpr: BinaryOrExpr {CompOp BinaryOrExpr}
-        node = self.parse_binary_or()
-        while op := self.parse_comp_op():
-            node = ast.Compare(self.current_token.line, self.current_token.col, node, op[0](self.current_token.line, self.current_token.col), self.parse_binary_or())
-            if not node.right or not node.left:
-                self.current_token.col += op[1]
-                self.throw(None)
-        return node
-
-    def parse_binary_or(self):
-        # BinaryOrExpr: BinaryXorExpr {'||' BinaryXorExpr}
-        node = self.parse_binary_xor()
-        while self.accept(tokens.BinOr):
-            node = ast.BinaryNode(self.current_token.line, self.current_token.col, node, ast.Or(self.current_token.line, self.current_token.col), self.parse_binary_xor())
-            if not node.right or not node.left:
-                self.current_token.col += 1
-                self.throw(None)
-        return node
-
-    def parse_binary_xor(self):
-        # BinaryXorExpr: BinaryAndExpr {'^' BinaryAndExpr}
-        node = self.parse_binary_and()
-        while self.accept(tokens.Xor):
-            node = ast.BinaryNode(self.current_token.line, self.current_token.col, node, ast.Xor(self.current_token.line, self.current_token.col), self.parse_binary_and())
-            if not node.right or not node.left:
-                self.current_token.col += 1
-                self.throw(None)
-        return node
-
-    def parse_binary_and(self):
-        # BinaryAndExpr: ShiftExpr {'&&' ShiftExpr}
-        node = self.parse_shift_expr()
-        while self.accept(tokens.BinAnd):
-            node = ast.BinaryNode(self.current_token.line, self.current_token.col, node, ast.And(self.current_token.line, self.current_token.col), self.parse_shift_expr())
-            if not node.right or not node.left:
-                self.current_token.col += 1
-                self.throw(None)
-        return node
-
-    def parse_shift_expr(self):
-        # ShiftExpr: Expr {('<<' | '>>') Expr}
-        node = self.parse_expr()
-        while not self.is_eof():
-            if self.accept(tokens.RightShift):
-                node = ast.BinaryNode(self.current_token.line, self.current_token.col, node, ast.RightShift(self.current_token.line, self.current_token.col), self.parse_expr())
-            elif self.accept(tokens.LeftShift):
-                node = ast.BinaryNode(self.current_token.line, self.current_token.col, node, ast.RightShift(self.current_token.line, self.current_token.col), self.parse_expr())
-            else:
-                break
+    def parse_binary(self, precedence: int = 0):
+        # LogicalOrExpr down to Term in one loop: the operators binding tighter than precedence, left-associative
+        node = self.parse_atom()
+        while (token := self.next_token) is not None and (op := self.binary_op_table.get(token.kind)) is not None \
+                and op[0] > precedence:
+            self.advance()
+            op_precedence, node_type, op_type, length = op
+            line, col = self.current_token.line, self.current_token.col
+            node = node_type(line, col, node, op_type(line, col), self.parse_binary(op_precedence))
             if not node.right or not node.left:
-                self.current_token.col += 2
+                self.current_token.col += length
                 self.throw(None)
         return node
 
@@ -210,26 +179,6 @@ class Parser:
         # 'return' Assignment
         return ast.Return(line=self.current_token.line, column=self.current_token.col, argument=self.parse_assignment())
 
-    def parse_logical_and(self):
-        # LogicalAndExpr: CompExpr {'||' CompExpr}
-        node = self.parse_comp()
-        while self.accept(tokens.LogicAnd):
-            node = ast.BinaryNode(self.current_token.line, self.current_token.col, node, ast.LogicAnd(self.current_token.line, self.current_token.col), self.parse_comp())
-            if not node.right or not node.left:
-                self.current_token.col += 1
-                self.throw(None)
-        return node
-
-    def parse_logical_or(self):
-        # LogicalOrExpr: LogicalAndExpr {'||' LogicalAndExpr}
-        node = self.parse_logical_and()
-        while self.accept(tokens.LogicOr):
-            node = ast.BinaryNode(self.current_token.line, self.current_token.col, node, ast.LogicOr(self.current_token.line, self.current_token.col), self.parse_logical_and())
-            if not node.right or not node.left:
-                self.current_token.col += 1
-                self.throw(None)
-        return node
-
     def parse_args(self):
         # Args: Atom {',' Atom}
         args = [self.parse_assignment()]
@@ -237,38 +186,6 @@ class Parser:
             args.append(self.parse_assignment())
         return ast.Arguments(self.current_token.line, self.current_token.col, args)
 
-    def parse_term(self):
-        # Term: Atom {'*'|'/'|'%' Atom}
-        node = self.parse_atom()
-        while not self.is_eof():
-            if self.accept(tokens.Multiply):
-                node = ast.BinaryNode(line=self.current_token.line, column=self.current_token.col,left=node, op=ast.Multiply(self.current_token.line, column=self.current_token.col), right=self.parse_atom())
-            elif self.accept(tokens.Divide):
-                node = ast.BinaryNode(line=self.current_token.line, column=self.current_token.col, left=node, op=ast.Divide(self.current_token.line, column=self.current_token.col), right=self.parse_atom())
-            elif self.accept(tokens.Modulo):
-                node = ast.BinaryNode(line=self.current_token.line, column=self.current_token.col,left=node, op=ast.Modulo(self.current_token.line, column=self.current_token.col), right=self.parse_atom())
-            else:
-                break
-            if not node.right or not node.left:
-                self.current_token.col += 1
-                self.throw(None)
-        return node
-
-    def parse_expr(self):
-        # Expr: Term {'+'|'-' Term}
-        node = self.parse_term()
-        while not self.is_eof():
-            if self.accept(tokens.Add):
-                node = ast.BinaryNode(self.current_token.line, self.current_token.col, left=node, op=ast.Add(self.current_token.line, self.current_token.col, ), right=self.parse_term())
-            elif self.accept(tokens.Subtract):
-                node = ast.BinaryNode(self.current_token.line, self.current_token.col, left=node, op=ast.Subtract(self.current_token.line, self.current_token.col, ), right=self.parse_term())
-            else:
-                break
-            if not node.right or not node.left:
-                self.current_token.col += 1
-                self.throw(None)
-        return node
-
     def parse_assignment(self):
         # Assignment: {Identifier AssignOp} LogicalOrExpr
         asses = []
@@ -286,14 +203,14 @@ class Parser:
                     asses.append(name)
                     break
             else:
-                if isinstance(self.current_token, tokens.Identifier):
+                if self.current_token.kind == IDENTIFIER:
                     self.push_token_back()
                     break
             if not asses:
                 self.push_token_back()
                 break
         line = self.current_token.line
-        node = self.parse_logical_or()
+        node = self.parse_binary()
         while asses:
             if not node:
                 self.current_token.col += l
@@ -338,6 +255,14 @@ class Parser:
         else:
             self.throw(f"Expected an identifier, got {self.next_token.name}")
 
+    def parse_spawn(self, keywords=None):
+        # Spawn: 'spawn' Atom, where the atom is a call
+        line, col = self.current_token.line, self.current_token.col
+        call = self.parse_atom()
+        if not isinstance(call, ast.Call):
+            self.throw("Expected a call after 'spawn'")
+        return ast.Spawn(line, col, call)
+
     def parse_block(self, keywords=None):
         # Block: {Assignment | Func | IfStmt | WhileLoop | ForLoop | NEWLINE}
         statements = []
@@ -348,6 +273,7 @@ class Parser:
             "func": self.parse_func,
             "for": self.parse_for_loop,
             "while": self.parse_while_loop,
+            "spawn": self.parse_spawn,
             **keywords
         }
         while not self.is_eof():
@@ -360,12 +286,12 @@ class Parser:
                     self.throw("Did not expect a keyword.")
             elif assignment := self.parse_assignment():
                 statements.append(assignment)
-            elif isinstance((self.next_token or self.current_token), tokens.RightBrace):
+            elif (self.next_token or self.current_token).kind == tokens.RIGHT_BRACE:
                 break
             else:
                 break
-            if (not isinstance(self.current_token, tokens.RightBrace)) and self.next_token and (not isinstance(self.next_token, tokens.RightBrace)) and (not self.accept(tokens.Newline)):
-                if not isinstance(self.current_token, tokens.Newline):
+            if self.current_token.kind != tokens.RIGHT_BRACE and self.next_token and self.next_token.kind != tokens.RIGHT_BRACE and (not self.accept(tokens.Newline)):
+                if self.current_token.kind != tokens.NEWLINE:
                     self.throw(f"Expected a newline, got {self.next_token}")
         return statements
 
@@ -462,12 +388,12 @@ class Parser:
             col = self.current_token.col
             if self.accept(tokens.RightBracket):
                 return ast.Array(line=line, column=col, items=[])
-            if isinstance(self.next_token, tokens.Comma):
+            if self.next_token.kind == tokens.COMMA:
                 self.throw("Syntax Error")
             items = [self.parse_assignment()]
             while self.accept(tokens.Comma):
                 items.append(self.parse_assignment())
-            if isinstance(self.current_token, tokens.Comma):
+            if self.current_token.kind == tokens.COMMA:
                 items.pop()
             if not self.accept(tokens.RightBracket):
                 self.throw("Syntax Error")
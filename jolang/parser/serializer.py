@@ -0,0 +1,196 @@
+"""
+A compact binary encoding of ASTs:
+
+    MAGIC VERSION
+    strings: count, then each string as its length in bytes and its UTF-8
+    classes: count, then the index of each node class' name in strings
+    the value
+
+a value is a tag byte, followed by (lengths and indices are varints, line and column numbers zigzag varints):
+
+    NONE, FALSE, TRUE
+    INT     zigzag varint
+    FLOAT   8 bytes little endian double
+    STR     index in strings
+    LIST, TUPLE
+            length, the items
+    NODE+k  line, column, then the fields after them (see ast.Ast.fields) of the k-th class
+
+strings and classes are numbered in the order the encoder meets them, so a tree always encodes to the same bytes
+and can be compared by digest.
+"""
+import struct
+import hashlib
+import itertools
+from . import ast
+
+MAGIC = b"JOAST"
+VERSION = 2
+
+NONE, FALSE, TRUE, INT, FLOAT, STR, LIST, TUPLE = range(8)
+NODE = 16
+MAX_CLASSES = 256 - NODE
+
+double = struct.Struct("<d")
+
+
+def dumps(value) -> bytes:
+    strings, classes = {}, {}
+    out = bytearray()
+    write = out.append
+
+    def varint(n):
+        while n > 0x7f:
+            write(n & 0x7f | 0x80)
+            n >>= 7
+        write(n)
+
+    def signed(n):
+        varint(n << 1 if n >= 0 else ~n << 1 | 1)
+
+    def string(s):
+        if (index := strings.get(s)) is None:
+            index = strings[s] = len(strings)
+        varint(index)
+
+    def encode(value):
+        cls = value.__class__
+        if (k := classes.get(cls)) is not None:
+            write(NODE + k)
+            signed(value.line)
+            signed(value.column)
+            for field in cls.fields()[2:]:
+                encode(getattr(value, field))
+        elif cls is str:
+            write(STR)
+            string(value)
+        elif cls is list or cls is tuple:
+            write(LIST if cls is list else TUPLE)
+            varint(len(value))
+            for item in value:
+                encode(item)
+        elif value is None:
+            write(NONE)
+        elif cls is bool:
+            write(TRUE if value else FALSE)
+        elif cls is int:
+            write(INT)
+            signed(value)
+        elif cls is float:
+            write(FLOAT)
+            out.extend(double.pack(value))
+        elif isinstance(value, ast.Ast):
+            if len(classes) == MAX_CLASSES:
+                raise ValueError(f"more than {MAX_CLASSES} node classes")
+            classes[cls] = len(classes)
+            encode(value)
+        else:
+            raise TypeError(f"can't serialize {cls.__name__!r}")
+
+    encode(value)
+    body = bytes(out)
+    names = [strings.setdefault(cls.__name__, len(strings)) for cls in classes]
+    # the tables go before the value
+    out.clear()
+    out.extend(MAGIC)
+    write(VERSION)
+    varint(len(strings))
+    for s in strings:
+        data = s.encode()
+        varint(len(data))
+        out.extend(data)
+    varint(len(names))
+    for index in names:
+        varint(index)
+    out.extend(body)
+    return bytes(out)
+
+
+def loads(data: bytes):
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a serialized AST")
+    if data[len(MAGIC):len(MAGIC) + 1] != bytes([VERSION]):
+        raise ValueError(f"unsupported AST format version, expected {VERSION}")
+    stream = iter(data)
+    next_byte, islice = stream.__next__, itertools.islice
+    for _ in range(len(MAGIC) + 1):
+        next_byte()
+
+    def varint(byte):
+        # the rest of a varint starting with byte, the callers read the first byte themselves
+        n, shift = byte & 0x7f, 7
+        while True:
+            byte = next_byte()
+            n |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    def signed():
+        if (n := next_byte()) > 0x7f:
+            n = varint(n)
+        return ~(n >> 1) if n & 1 else n >> 1
+
+    def take(n):
+        chunk = bytes(islice(stream, n))
+        if len(chunk) != n:
+            raise StopIteration
+        return chunk
+
+    def size():
+        if (n := next_byte()) > 0x7f:
+            n = varint(n)
+        return n
+
+    def decode():
+        tag = next_byte()
+        if tag >= NODE:
+            cls, n = classes[tag - NODE]
+            line, column = signed(), signed()
+            if n == 1:
+                return cls(line, column, decode())
+            if n == 3:
+                return cls(line, column, decode(), decode(), decode())
+            if n == 0:
+                return cls(line, column)
+            if n == 2:
+                return cls(line, column, decode(), decode())
+            return cls(line, column, *[decode() for _ in range(n)])
+        if tag == STR:
+            if (index := next_byte()) > 0x7f:
+                index = varint(index)
+            return strings[index]
+        if tag == LIST:
+            if (n := next_byte()) > 0x7f:
+                n = varint(n)
+            return [decode() for _ in range(n)]
+        if tag == NONE:
+            return None
+        if tag == INT:
+            return signed()
+        if tag == FLOAT:
+            return double.unpack(take(8))[0]
+        if tag == TUPLE:
+            return tuple([decode() for _ in range(size())])
+        if tag == TRUE or tag == FALSE:
+            return tag == TRUE
+        raise ValueError(f"unknown tag {tag}")
+
+    try:
+        strings = [take(size()).decode() for _ in range(size())]
+        classes = []
+        for _ in range(size()):
+            cls = getattr(ast, strings[size()], None)
+            if not (isinstance(cls, type) and issubclass(cls, ast.Ast)):
+                raise ValueError("unknown node class")
+            classes.append((cls, len(cls.fields()) - 2))
+        value = decode()
+    except (StopIteration, IndexError):
+        raise ValueError("truncated or corrupt AST") from None
+    if next(stream, None) is not None:
+        raise ValueError("trailing data after the AST")
+    return value
+
+
+def digest(value) -> str:
+    return hashlib.sha256(dumps(value)).hexdigest()
@@ -1,27 +1,28 @@
 import typing
 from ..tokenizer import tokens
+from ..tokenizer.tokens import NEWLINE, IDENTIFIER, MODULO
 
 
 def preprocess(stream: typing.Iterator[tokens.Token], macros=None):
     # Macro: '%macro' Identifier {Statement}
     if not macros:
         macros = {}
-    copy = list(stream)
-    stream = iter(copy.copy())
-    c = 0
-    for idx, token in enumerate(stream, 0):
-        if isinstance(token, tokens.Modulo) and isinstance(copy[idx + c + bool(c) - 1], tokens.Newline):
+    # macros is keyed by (name, content), expansions by (kind, content) to look tokens up without their names
+    expansions = {(tokens.kinds.get(name), content): replace_with for (name, content), replace_with in macros.items()}
+    stream = iter(stream)
+    # the token before token, a macro is a line of its own
+    previous = tokens.Newline
+    for token in stream:
+        if token.kind == MODULO and previous.kind == NEWLINE:
             try:
                 macro = next(stream)
-                c += 1
                 if macro.content == "macro":
                     replace, replace_with = next(stream), []
-                    c += 1
-                    assert isinstance(replace, tokens.Identifier), "A macro replace must be an identifier!"
-                    while not isinstance(tok := next(stream, tokens.Newline), tokens.Newline):
-                        c += 1
+                    assert replace.kind == IDENTIFIER, "A macro replace must be an identifier!"
+                    while (tok := next(stream, None)) is not None and tok.kind != NEWLINE:
                         replace_with.append(tok)
-                    macros[replace.name, replace.content] = replace_with
+                    previous = tok
+                    macros[replace.name, replace.content] = expansions[IDENTIFIER, replace.content] = replace_with
                 else:
                     raise SyntaxError(f"Couldn't process a preprocessor command at line {token.line}") from None
             except StopIteration:
@@ -31,8 +32,9 @@ def preprocess(stream: typing.Iterator[tokens.Token], macros=None):
                 except UnboundLocalError:
                     raise SyntaxError(f"Couldn't process a preprocessor command at line {token.line}") from None
         else:
-            if (macro := macros.get((token.name, token.content))) is not None:
+            if expansions and (macro := expansions.get((token.kind, token.content))) is not None:
                 yield from macro
             else:
                 yield token
+            previous = token
     yield macros
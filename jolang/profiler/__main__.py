@@ -0,0 +1,34 @@
+"""
+Profiles a JoLang script by function and line.
+
+    python -m jolang.profiler [--sampling] [--interval SECONDS] [--collapsed FILE] [-n LIMIT] script.jo
+"""
+import sys
+import argparse
+from .profiler import Profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("script", help="the script to profile")
+    parser.add_argument("--sampling", action="store_true", help="sample the running function and line instead of timing all of them")
+    parser.add_argument("--interval", type=float, default=0.001, help="seconds between samples")
+    parser.add_argument("--collapsed", default=None, help="write the stacks for a flamegraph to this file")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="functions and lines to report")
+    args = parser.parse_args(argv)
+    with open(args.script, encoding="utf-8") as f:
+        code = f.read()
+    profiler = Profiler(args.sampling, args.interval)
+    try:
+        profiler.run(code, args.script)
+    finally:
+        # the report goes to stderr, after whatever the script printed
+        sys.stderr.write(profiler.report(args.limit))
+        if args.collapsed:
+            with open(args.collapsed, "w", encoding="utf-8") as f:
+                f.write(profiler.collapsed())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
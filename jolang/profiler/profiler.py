@@ -0,0 +1,151 @@
+import time
+import typing
+import threading
+import collections
+from ..tokenizer import Tokenizer
+from ..preprocessor import preprocess
+from ..parser import Parser, ast
+from ..interpreter import Interpreter, file
+
+MODULE = "<module>"
+# statements whose position isn't where they start (the parser gives them the previous or their last token's),
+# the nodes inside them tell the line instead
+compound = {ast.Body, ast.If, ast.While, ast.For, ast.Function}
+
+
+class Profiler:
+    """
+    Attributes the time a program takes to the JoLang functions and lines it spends it in.
+    The program keeps a stack of the functions it's in and the line it's at up to date, the time in between is added to
+    that stack and line:
+    deterministic: on every call, return and change of line
+    sampling: every `interval` seconds, by a thread of its own, so the program doesn't read the clock itself
+    Times are self times in seconds, lines are numbered from 0 like tracebacks do.
+    """
+
+    def __init__(self, sampling: bool = False, interval: float = 0.001):
+        self.sampling = sampling
+        self.interval = interval
+        self.stacks = collections.Counter()  # (function names, outermost first) -> seconds
+        self.lines = collections.Counter()  # (function name, line) -> seconds
+        self.calls = collections.Counter()  # function name -> calls
+        self.files = []
+        # the running functions (as stacks' keys) and the line every caller was at
+        self.stack = [(MODULE,)]
+        self.callers = []
+        self.line = 0
+        self.last = 0.0
+        self.running = False
+
+    def charge(self):
+        now = time.perf_counter()
+        key = self.stack[-1]
+        self.stacks[key] += now - self.last
+        self.lines[key[-1], self.line] += now - self.last
+        self.last = now
+
+    def enter(self, name: str):
+        if not self.sampling:
+            self.charge()
+        self.calls[name] += 1
+        self.stack.append(self.stack[-1] + (name,))
+        self.callers.append(self.line)
+
+    def leave(self):
+        if not self.sampling:
+            self.charge()
+        self.stack.pop()
+        self.line = self.callers.pop()
+
+    def at(self, line: int):
+        if not self.sampling:
+            self.charge()
+        self.line = line
+
+    def sample(self):
+        while self.running:
+            time.sleep(self.interval)
+            self.charge()
+
+    def run(self, code: str, name: str = "shell", macros: dict = None):
+        node = Parser(preprocess(Tokenizer(code).tokenize(), macros)).parse()
+        interpreter = ProfiledInterpreter(file.File(code, name, node), self)
+        self.files.append(interpreter.file)
+        self.last = time.perf_counter()
+        sampler = None
+        if self.sampling:
+            self.running = True
+            sampler = threading.Thread(target=self.sample, name="jolang-profiler", daemon=True)
+            sampler.start()
+        try:
+            return interpreter.eval()
+        finally:
+            if sampler is not None:
+                self.running = False
+                sampler.join()
+            self.charge()
+
+    def functions(self) -> typing.Dict[str, typing.Tuple[int, float, float]]:
+        # function name -> calls, self time, total time (counted once however many times it's on a stack)
+        own, total = collections.Counter(), collections.Counter()
+        for stack, seconds in self.stacks.items():
+            own[stack[-1]] += seconds
+            for name in set(stack):
+                total[name] += seconds
+        return {name: (self.calls[name], own[name], total[name]) for name in total}
+
+    def collapsed(self) -> str:
+        # one "outer;inner microseconds" line per stack, the input of flamegraph.pl and speedscope
+        return "".join(f"{';'.join(stack)} {round(seconds * 1e6)}\n"
+                       for stack, seconds in sorted(self.stacks.items()) if round(seconds * 1e6))
+
+    def source(self, line: int) -> str:
+        lines = self.files[-1].lines if self.files else []
+        return lines[line].strip() if 0 <= line < len(lines) else ""
+
+    def report(self, limit: int = 20) -> str:
+        functions = sorted(self.functions().items(), key=lambda item: -item[1][1])
+        lines = [f"{'function':<30} {'calls':>8} {'self':>10} {'total':>10}"]
+        for name, (calls, own, total) in functions[:limit]:
+            lines.append(f"{name:<30} {calls:>8} {own:>9.4f}s {total:>9.4f}s")
+        lines.append("")
+        lines.append(f"{'line':<36} {'self':>10}")
+        for (name, line), seconds in self.lines.most_common(limit):
+            lines.append(f"{f'{name}:{line}':<36} {seconds:>9.4f}s  {self.source(line)}")
+        return "\n".join(lines) + "\n"
+
+
+class ProfiledInterpreter(Interpreter):
+    """
+    The tree-walking Interpreter telling profiler about every call and line it evaluates.
+    Only the thread that runs the program is profiled, calls `spawn` runs elsewhere aren't.
+    """
+
+    def __init__(self, file, profiler: Profiler):
+        super().__init__(file)
+        self.profiler = profiler
+        self.thread = threading.get_ident()
+
+    def eval(self, node=None, scope=None):
+        if (node is not None and node.line != self.profiler.line and node.__class__ not in compound
+                and threading.get_ident() == self.thread):
+            self.profiler.at(node.line)
+        return super().eval(node, scope)
+
+    def call_function(self, f, name, args):
+        if threading.get_ident() != self.thread:
+            return super().call_function(f, name, args)
+        self.profiler.enter(f.name)
+        try:
+            return super().call_function(f, name, args)
+        finally:
+            self.profiler.leave()
+
+    def call_py_bind(self, f, restype, values, node, scope):
+        if threading.get_ident() != self.thread:
+            return super().call_py_bind(f, restype, values, node, scope)
+        self.profiler.enter(f.name)
+        try:
+            return super().call_py_bind(f, restype, values, node, scope)
+        finally:
+            self.profiler.leave()
@@ -1,8 +1,10 @@
-import string
+import os
 import re
+import sys
+import codecs
+import typing
 from . import tokens
-
-TokenStream = iter
+from .tokens import Token, IDENTIFIER, INTEGER, FLOAT, STRING
 
 
 class Tokenizer:
@@ -13,52 +15,32 @@ class Tokenizer:
     BIN_PATTERN = re.compile(r"0b[10]+", re.IGNORECASE)
 
     map_re_to_tokens = {
-        INTEGER_PATTERN: lambda self, content: tokens.Integer.set_content(self.line, self.col, content),
-        FLOAT_PATTERN: lambda self, content: tokens.Float.set_content(self.line, self.col, content),
-        HEX_PATTERN: lambda self, content: tokens.Integer.set_content(self.line, self.col, int(content, 16)),
-        OCTAL_PATTERN: lambda self, content: tokens.Integer.set_content(self.line, self.col, int(content, 8)),
-        BIN_PATTERN: lambda self, content: tokens.Integer.set_content(self.line, self.col, int(content, 2))
+        INTEGER_PATTERN: lambda self, content: Token(INTEGER, content, self.line, self.col),
+        FLOAT_PATTERN: lambda self, content: Token(FLOAT, content, self.line, self.col),
+        HEX_PATTERN: lambda self, content: Token(INTEGER, int(content, 16), self.line, self.col),
+        OCTAL_PATTERN: lambda self, content: Token(INTEGER, int(content, 8), self.line, self.col),
+        BIN_PATTERN: lambda self, content: Token(INTEGER, int(content, 2), self.line, self.col)
     }
+    # an operator's text -> its kind
+    OPERATORS = {text: token.kind for text, token in tokens.operators.items()}
 
-    def __init__(self, stream: str):
-        self.tokens = TokenStream(stream)
-        self.current_token = None
-        self.col = -1
-        self.line = 0
-        self.advance()
-
-    def throw(self):
-        raise SyntaxError("Invalid syntax at {}:{} [{!r}]".format(self.line, self.col, self.current_token))
-
-    def advance(self):
-        try:
-            self.current_token = next(self.tokens)
-            self.col += 1
-            if self.current_token == '\n':
-                self.line += 1
-        except StopIteration:
-            self.current_token = None
-        return self.current_token
+    CHUNK_SIZE = 1 << 16
 
-    def is_eof(self):
-        return not self.current_token
+    def __init__(self, stream: typing.Union[str, os.PathLike, typing.BinaryIO], encoding: str = "utf-8",
+                 chunk_size: int = CHUNK_SIZE):
+        # stream: the code, or a path, binary file or mmap to read it from chunk_size bytes at a time
+        self.code = stream
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.line = 0
+        self.col = 0
+        # where the current line starts in code
+        self.line_start = 0
 
-    def tokenize_string(self):
-        char = self.current_token
-        self.advance()
-        while self.current_token != char:
-            yield self.current_token
-            self.advance()
-            if self.is_eof():
-                raise SyntaxError("String was never closed")
-        self.advance()
+    def throw(self, char: str):
+        raise SyntaxError("Invalid syntax at {}:{} [{!r}]".format(self.line, self.col, char))
 
-    def tokenize_number(self):
-        number = ""
-        col = self.col
-        while not self.is_eof() and self.current_token in string.ascii_letters + string.digits + '.':
-            number += self.current_token
-            self.advance()
+    def tokenize_number(self, number: str):
         for regex in (
                 self.INTEGER_PATTERN,
                 self.FLOAT_PATTERN,
@@ -67,62 +49,76 @@ class Tokenizer:
                 self.BIN_PATTERN
         ):
             if regex.fullmatch(number):
-                self.col = col
                 return self.map_re_to_tokens[regex](self, number)
         raise SyntaxError(f"Couldn't tokenize the number {number!r}")
 
-    def tokenize_identifier(self):
-        while not self.is_eof() and self.current_token in string.ascii_letters + string.digits + "_":
-            yield self.current_token
-            self.advance()
-
-    def _get_op_one_char(self):
-        tok = tokens.one_char(self.current_token)
-        if tok == tokens.Comment:
-            while not self.is_eof() and self.current_token != '\n':
-                self.advance()
-        return tok
-
-    def _get_op_two_chars(self, first: tokens.Token):
-        if first.value and self.current_token and (tok := tokens.two_chars(first.value + self.current_token)):
-            return tok
-
-    def _get_op_three_chars(self, first: tokens.Token):
-        if first.value and self.current_token and (tok := tokens.three_chars(first.value + self.current_token)):
-            return tok
+    def chunks(self) -> typing.Iterator[str]:
+        if isinstance(self.code, os.PathLike):
+            with open(self.code, "rb") as f:
+                yield from self.read(f)
+        else:
+            yield from self.read(self.code)
 
-    def tokenize_op(self):
-        three_tok = two_tok = None
-        col = self.col
-        if tok := self._get_op_one_char():
-            self.advance()
-            if self.current_token and (two_tok := self._get_op_two_chars(tok)):
-                self.advance()
-                if self.current_token and (three_tok := self._get_op_three_chars(two_tok)):
-                    self.advance()
-            self.col = col
-        return three_tok or two_tok or tok
+    def read(self, f) -> typing.Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        while chunk := f.read(self.chunk_size):
+            yield decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+        yield decoder.decode(b"", final=True)
 
     def tokenize(self):
-        while not self.is_eof():
-            if self.current_token in ['\'', '"']:
-                yield tokens.String.set_content(self.line, self.col, "".join(self.tokenize_string()))
-            elif self.current_token in string.whitespace:
-                if self.current_token == '\n':
-                    yield tokens.Newline
-                    self.col = -1
-                self.advance()
-            elif self.current_token in string.digits:
-                number = self.tokenize_number()
-                self.col += len(str(number.content))
-                yield number
-            elif self.current_token in string.ascii_letters + "_":
-                yield tokens.Identifier.set_content(self.line, self.col, "".join(self.tokenize_identifier()))
+        if isinstance(self.code, str):
+            yield from self.scan(self.code, len(self.code), True)
+            return
+        # only the lines read whole are scanned, the text after the last newline waits for the next chunk,
+        # text holds that and the rest of a string not closed yet
+        text = ""
+        for chunk in self.chunks():
+            text += chunk
+            scanned = yield from self.scan(text, text.rfind("\n") + 1, False)
+            text = text[scanned:]
+            self.line_start -= scanned
+        yield from self.scan(text, len(text), True)
+
+    def scan(self, text: str, end: int, final: bool):
+        # yields the tokens of text[:end] and returns where it stopped: at end, or before a string it doesn't close
+        # unless that's the last of the code.
+        # Every match of the scanner is a token (or the spaces before end), spaces before it included.
+        # The position is kept in locals, self.line and self.col are only up to date for tokenize_number and throw
+        # identifiers are interned, a program repeats its names
+        operators, newline, intern = self.OPERATORS, tokens.Newline, sys.intern
+        line, line_start = self.line, self.line_start
+        for match in tokens.scanner.finditer(text, 0, end):
+            kind = match.lastgroup
+            if kind == "identifier":
+                yield Token(IDENTIFIER, intern(match.group(kind)), line, match.start(kind) - line_start)
+            elif kind == "operator":
+                yield Token(operators[match.group(kind)], None, line, match.start(kind) - line_start)
+            elif kind == "newline":
+                yield newline
+                line += 1
+                line_start = match.end()
+            elif kind == "number" and (value := match.group(kind)).isdigit():
+                yield Token(INTEGER, value, line, match.start(kind) - line_start)
+            elif kind == "end":
+                break
             else:
-                if op := self.tokenize_op():
-                    if op == tokens.Comment:
-                        continue
-                    yield op.set_content(self.line, self.col)
-                    self.col += len(str(op.value))
+                self.line, self.col = line, match.start(kind) - line_start
+                value = match.group(kind)
+                if kind == "number":
+                    yield self.tokenize_number(value)
+                elif kind == "string" or kind == "comment":
+                    if kind == "string":
+                        yield Token(STRING, value[1:-1], line, self.col)
+                    # both can span lines
+                    if (count := value.count("\n")) != 0:
+                        line += count
+                        line_start = match.end() - len(value) + value.rindex("\n") + 1
+                elif value in "'\"":
+                    if not final:
+                        self.line_start = line_start
+                        return match.start(kind)
+                    raise SyntaxError("String was never closed")
                 else:
-                    self.throw()
+                    self.throw(value)
+        self.line, self.line_start = line, line_start
+        return end
@@ -1,23 +1,30 @@
 # This file was automatically generated, any changes to it will be overridden!
 
 
+import re
 import typing
 
 
 class Token:
-    col = line = 0
-    
-    def __init__(self, name: str, value: str = None):
-        self.name = name
-        self.value = value
-        self.content = None
-        
+    # kind: the token's index in names, content: what an identifier, string or number holds
+    __slots__ = ("kind", "content", "line", "col")
+
+    def __init__(self, kind: int, content: typing.Any = None, line: int = 0, col: int = 0):
+        self.kind = kind
+        self.content = content
+        self.line = line
+        self.col = col
+
+    @property
+    def name(self) -> str:
+        return names[self.kind]
+
+    @property
+    def value(self) -> typing.Optional[str]:
+        return values[self.kind]
+
     def set_content(self, line: int, col: int, content: typing.Any = None) -> "Token":
-        new_self = type(self)(self.name)
-        new_self.line = line
-        new_self.col = col
-        new_self.content = content
-        return new_self
+        return Token(self.kind, content, line, col)
         
     def __repr__(self) -> str:
         content = ""
@@ -26,60 +33,128 @@ class Token:
         return f"{self.name}{content}"
     
     def __instancecheck__(self, instance: "Token") -> bool:
-        return self.name == instance.name
+        return self.kind == instance.kind
    
     __str__ = __repr__
 
 
-Newline = Token('NEWLINE')  # \n
-Identifier = Token('IDENTIFIER')  # abc_def
-String = Token('STRING')  # "abc_def"
-Integer = Token('INTEGER')  # 123
-Float = Token('FLOAT')  # 123.456
-Semicolon = Token('SEMICOLON', ';')
-Add = Token('ADD', '+')
-Subtract = Token('SUBTRACT', '-')
-Equals = Token('EQUALS', '=')
-Colon = Token('COLON', ':')
-UnaryTilde = Token('UNARY_TILDE', '~')
-Dot = Token('DOT', '.')
-Comma = Token('COMMA', ',')
-Backslash = Token('BACKSLASH', '\\')
-Multiply = Token('MULTIPLY', '*')
-Divide = Token('DIVIDE', '/')
-Comment = Token('COMMENT', '$')
-Modulo = Token('MODULO', '%')
-Xor = Token('XOR', '^')
-BinAnd = Token('BIN_AND', '&')
-BinOr = Token('BIN_OR', '|')
-LeftParen = Token('LEFT_PAREN', '(')
-RightParen = Token('RIGHT_PAREN', ')')
-LeftBracket = Token('LEFT_BRACKET', '[')
-RightBracket = Token('RIGHT_BRACKET', ']')
-LeftBrace = Token('LEFT_BRACE', '{')
-RightBrace = Token('RIGHT_BRACE', '}')
-LesserThan = Token('LESSER_THAN', '<')
-GreaterThan = Token('GREATER_THAN', '>')
-LogicNot = Token('LOGIC_NOT', '!')
-LogicAnd = Token('LOGIC_AND', '&&')
-LogicOr = Token('LOGIC_OR', '||')
-NotEqual = Token('NOT_EQUAL', '!=')
-IsEqual = Token('IS_EQUAL', '==')
-LessEqual = Token('LESS_EQUAL', '<=')
-GreatEqual = Token('GREAT_EQUAL', '>=')
-InplaceAdd = Token('INPLACE_ADD', '+=')
-InplaceSubtract = Token('INPLACE_SUBTRACT', '-=')
-InplaceMultiply = Token('INPLACE_MULTIPLY', '*=')
-InplaceDivide = Token('INPLACE_DIVIDE', '/=')
-InplaceModulo = Token('INPLACE_MODULO', '%=')
-InplaceXor = Token('INPLACE_XOR', '^=')
-InplaceBinAnd = Token('INPLACE_BIN_AND', '&=')
-InplaceBinOr = Token('INPLACE_BIN_OR', '|=')
-LeftShift = Token('LEFT_SHIFT', '<<')
-RightShift = Token('RIGHT_SHIFT', '>>')
-InplaceLeftShift = Token('INPLACE_LEFT_SHIFT', '<<=')
-InplaceRightShift = Token('INPLACE_RIGHT_SHIFT', '>>=')
-Spaceship = Token('SPACESHIP', '<=>')
+NEWLINE = 0
+IDENTIFIER = 1
+STRING = 2
+INTEGER = 3
+FLOAT = 4
+KEYWORD = 5
+SEMICOLON = 6
+ADD = 7
+SUBTRACT = 8
+EQUALS = 9
+COLON = 10
+UNARY_TILDE = 11
+DOT = 12
+COMMA = 13
+BACKSLASH = 14
+MULTIPLY = 15
+DIVIDE = 16
+COMMENT = 17
+MODULO = 18
+XOR = 19
+BIN_AND = 20
+BIN_OR = 21
+LEFT_PAREN = 22
+RIGHT_PAREN = 23
+LEFT_BRACKET = 24
+RIGHT_BRACKET = 25
+LEFT_BRACE = 26
+RIGHT_BRACE = 27
+LESSER_THAN = 28
+GREATER_THAN = 29
+LOGIC_NOT = 30
+LOGIC_AND = 31
+LOGIC_OR = 32
+NOT_EQUAL = 33
+IS_EQUAL = 34
+LESS_EQUAL = 35
+GREAT_EQUAL = 36
+INPLACE_ADD = 37
+INPLACE_SUBTRACT = 38
+INPLACE_MULTIPLY = 39
+INPLACE_DIVIDE = 40
+INPLACE_MODULO = 41
+INPLACE_XOR = 42
+INPLACE_BIN_AND = 43
+INPLACE_BIN_OR = 44
+LEFT_SHIFT = 45
+RIGHT_SHIFT = 46
+INPLACE_LEFT_SHIFT = 47
+INPLACE_RIGHT_SHIFT = 48
+SPACESHIP = 49
+
+names = ['NEWLINE', 'IDENTIFIER', 'STRING', 'INTEGER', 'FLOAT', 'KEYWORD', 'SEMICOLON',
+'ADD', 'SUBTRACT', 'EQUALS', 'COLON', 'UNARY_TILDE', 'DOT', 'COMMA',
+'BACKSLASH', 'MULTIPLY', 'DIVIDE', 'COMMENT', 'MODULO', 'XOR', 'BIN_AND',
+'BIN_OR', 'LEFT_PAREN', 'RIGHT_PAREN', 'LEFT_BRACKET', 'RIGHT_BRACKET',
+'LEFT_BRACE', 'RIGHT_BRACE', 'LESSER_THAN', 'GREATER_THAN', 'LOGIC_NOT',
+'LOGIC_AND', 'LOGIC_OR', 'NOT_EQUAL', 'IS_EQUAL', 'LESS_EQUAL', 'GREAT_EQUAL',
+'INPLACE_ADD', 'INPLACE_SUBTRACT', 'INPLACE_MULTIPLY', 'INPLACE_DIVIDE',
+'INPLACE_MODULO', 'INPLACE_XOR', 'INPLACE_BIN_AND', 'INPLACE_BIN_OR',
+'LEFT_SHIFT', 'RIGHT_SHIFT', 'INPLACE_LEFT_SHIFT', 'INPLACE_RIGHT_SHIFT',
+'SPACESHIP']
+values = [None, None, None, None, None, None, ';', '+', '-', '=', ':', '~', '.', ',',
+'\\', '*', '/', '$', '%', '^', '&', '|', '(', ')', '[', ']', '{', '}', '<', '>',
+'!', '&&', '||', '!=', '==', '<=', '>=', '+=', '-=', '*=', '/=', '%=', '^=',
+'&=', '|=', '<<', '>>', '<<=', '>>=', '<=>']
+kinds = {name: kind for kind, name in enumerate(names)}
+
+Newline = Token(NEWLINE)  # \n
+Identifier = Token(IDENTIFIER)  # abc_def
+String = Token(STRING)  # "abc_def"
+Integer = Token(INTEGER)  # 123
+Float = Token(FLOAT)  # 123.456
+Keyword = Token(KEYWORD)  # func
+Semicolon = Token(SEMICOLON)  # ;
+Add = Token(ADD)  # +
+Subtract = Token(SUBTRACT)  # -
+Equals = Token(EQUALS)  # =
+Colon = Token(COLON)  # :
+UnaryTilde = Token(UNARY_TILDE)  # ~
+Dot = Token(DOT)  # .
+Comma = Token(COMMA)  # ,
+Backslash = Token(BACKSLASH)  # \
+Multiply = Token(MULTIPLY)  # *
+Divide = Token(DIVIDE)  # /
+Comment = Token(COMMENT)  # $
+Modulo = Token(MODULO)  # %
+Xor = Token(XOR)  # ^
+BinAnd = Token(BIN_AND)  # &
+BinOr = Token(BIN_OR)  # |
+LeftParen = Token(LEFT_PAREN)  # (
+RightParen = Token(RIGHT_PAREN)  # )
+LeftBracket = Token(LEFT_BRACKET)  # [
+RightBracket = Token(RIGHT_BRACKET)  # ]
+LeftBrace = Token(LEFT_BRACE)  # {
+RightBrace = Token(RIGHT_BRACE)  # }
+LesserThan = Token(LESSER_THAN)  # <
+GreaterThan = Token(GREATER_THAN)  # >
+LogicNot = Token(LOGIC_NOT)  # !
+LogicAnd = Token(LOGIC_AND)  # &&
+LogicOr = Token(LOGIC_OR)  # ||
+NotEqual = Token(NOT_EQUAL)  # !=
+IsEqual = Token(IS_EQUAL)  # ==
+LessEqual = Token(LESS_EQUAL)  # <=
+GreatEqual = Token(GREAT_EQUAL)  # >=
+InplaceAdd = Token(INPLACE_ADD)  # +=
+InplaceSubtract = Token(INPLACE_SUBTRACT)  # -=
+InplaceMultiply = Token(INPLACE_MULTIPLY)  # *=
+InplaceDivide = Token(INPLACE_DIVIDE)  # /=
+InplaceModulo = Token(INPLACE_MODULO)  # %=
+InplaceXor = Token(INPLACE_XOR)  # ^=
+InplaceBinAnd = Token(INPLACE_BIN_AND)  # &=
+InplaceBinOr = Token(INPLACE_BIN_OR)  # |=
+LeftShift = Token(LEFT_SHIFT)  # <<
+RightShift = Token(RIGHT_SHIFT)  # >>
+InplaceLeftShift = Token(INPLACE_LEFT_SHIFT)  # <<=
+InplaceRightShift = Token(INPLACE_RIGHT_SHIFT)  # >>=
+Spaceship = Token(SPACESHIP)  # <=>
 
 
 groups = {1: {'!': LogicNot,
@@ -136,3 +211,19 @@ def two_chars(chars: str) -> typing.Optional[Token]:
     
 def three_chars(chars: str) -> typing.Optional[Token]:
     return groups[3].get(chars)
+
+
+operators = {**groups[1], **groups[2], **groups[3]}
+# matches the spaces before a token and the token, the name of the group that matched is the kind of token:
+# the longest operator wins, a comment takes the newline ending it along, the spaces ending the code match as end
+# and any other character is an error
+scanner = re.compile('[ \\t\\r\\x0b\\x0c]*' + "(?:" + "|".join([
+    '(?P<identifier>[A-Za-z_][A-Za-z0-9_]*)',
+    '(?P<operator><<=|>>=|<=>|\\&\\&|\\|\\||!=|==|<=|>=|\\+=|\\-=|\\*=|/=|%=|\\^=|\\&=|\\|=|<<|>>|[;\\+\\-=:\\~\\.,\\\\\\*/%\\^\\&\\|\\(\\)\\[\\]\\{\\}<>!])',
+    '(?P<newline>\\n)',
+    '(?P<number>[0-9][A-Za-z0-9.]*)',
+    '(?P<string>\\"[^\\"]*\\"|\'[^\']*\')',
+    '(?P<comment>\\$[^\\n]*\\n?)',
+    '(?P<end>\\Z)',
+    '(?P<error>[\\s\\S])',
+]) + ")")
@@ -1,3 +1,4 @@
+import re
 import typing
 from pprint import pformat
 from collections import defaultdict
@@ -6,23 +7,30 @@ from collections import defaultdict
 TEMPLATE: str = """# This file was automatically generated, any changes to it will be overridden!
 
 
+import re
 import typing
 
 
 class Token:
-    col = line = 0
-    
-    def __init__(self, name: str, value: str = None):
-        self.name = name
-        self.value = value
-        self.content = None
-        
+    # kind: the token's index in names, content: what an identifier, string or number holds
+    __slots__ = ("kind", "content", "line", "col")
+
+    def __init__(self, kind: int, content: typing.Any = None, line: int = 0, col: int = 0):
+        self.kind = kind
+        self.content = content
+        self.line = line
+        self.col = col
+
+    @property
+    def name(self) -> str:
+        return names[self.kind]
+
+    @property
+    def value(self) -> typing.Optional[str]:
+        return values[self.kind]
+
     def set_content(self, line: int, col: int, content: typing.Any = None) -> "Token":
-        new_self = type(self)(self.name)
-        new_self.line = line
-        new_self.col = col
-        new_self.content = content
-        return new_self
+        return Token(self.kind, content, line, col)
         
     def __repr__(self) -> str:
         content = ""
@@ -31,7 +39,7 @@ class Token:
         return f"{{self.name}}{{content}}"
     
     def __instancecheck__(self, instance: "Token") -> bool:
-        return self.name == instance.name
+        return self.kind == instance.kind
    
     __str__ = __repr__
 
@@ -48,8 +56,25 @@ def two_chars(chars: str) -> typing.Optional[Token]:
     
 def three_chars(chars: str) -> typing.Optional[Token]:
     return groups[3].get(chars)
+
+
+operators = {{**groups[1], **groups[2], **groups[3]}}
+# matches the spaces before a token and the token, the name of the group that matched is the kind of token:
+# the longest operator wins, a comment takes the newline ending it along, the spaces ending the code match as end
+# and any other character is an error
+scanner = re.compile({!r} + "(?:" + "|".join([
+{}]) + ")")
 """
 
+SPACES: str = r"[ \t\r\x0b\x0c]*"
+# the patterns of the tokens the spec only gives examples of
+LITERALS: typing.Dict[str, str] = {
+    "newline": r"\n",
+    "identifier": r"[A-Za-z_][A-Za-z0-9_]*",
+    "number": r"[0-9][A-Za-z0-9.]*",
+    "string": r"\"[^\"]*\"|'[^']*'",
+}
+
 
 class Repr(str):
     def __repr__(self):
@@ -60,11 +85,32 @@ def uppercase_to_pascal_case(string: str) -> str:
     return "".join(chunk.title() for chunk in string.split("_"))
 
 
+def scanner_alternatives(groups: typing.Dict[int, typing.Dict[str, str]], comment: str) -> str:
+    # one group per kind of token, the most common ones first as they're tried in order
+    operators = sorted((op for group in groups.values() for op in group if op != comment), key=len, reverse=True)
+    alternatives = [
+        ("identifier", LITERALS["identifier"]),
+        ("operator", "|".join(map(re.escape, (op for op in operators if len(op) > 1)))
+         + "|[" + "".join(map(re.escape, (op for op in operators if len(op) == 1))) + "]"),
+        ("newline", LITERALS["newline"]),
+        ("number", LITERALS["number"]),
+        ("string", LITERALS["string"]),
+        ("comment", re.escape(comment) + r"[^\n]*\n?"),
+        ("end", r"\Z"),
+        ("error", r"[\s\S]"),
+    ]
+    return "".join(f"    {f'(?P<{name}>{pattern})'!r},\n" for name, pattern in alternatives)
+
+
 def generate_tokens(
         gen_to_file: str = "tokens.py",
         read_from_file: str = "tokens"
 ):
     tokens = ""
+    kinds = ""
+    names: typing.List[str] = []
+    values: typing.List[typing.Optional[str]] = []
+    comment_mark = None
     groups: typing.DefaultDict[int, typing.Dict[str, str]] = defaultdict(dict)
 
     with open(gen_to_file, "w") as gen_file:
@@ -74,13 +120,18 @@ def generate_tokens(
                 if not token or token.startswith('#'):
                     continue
                 n_group, token_type, comment = token.split(" ", 2)
-                if comment and not int(n_group):
-                    tokens += f"{uppercase_to_pascal_case(token_type)} = Token({token_type!r})  # {comment}\n"
-                elif comment and int(n_group):
-                    tokens += f"{uppercase_to_pascal_case(token_type)} = Token({token_type!r}, {comment!r})\n"
+                kinds += f"{token_type} = {len(names)}\n"
+                names.append(token_type)
+                values.append(comment if int(n_group) else None)
+                tokens += f"{uppercase_to_pascal_case(token_type)} = Token({token_type})  # {comment}\n"
+                if comment and int(n_group):
                     groups[int(n_group)][comment] = Repr(uppercase_to_pascal_case(token_type))
+                    if token_type == "COMMENT":
+                        comment_mark = comment
         formatted_groups = f"\n\ngroups = {pformat(dict(groups), indent=0)}\n"
-        gen_file.write(TEMPLATE.format(tokens, formatted_groups))
+        kinds += f"\nnames = {pformat(names, indent=0, compact=True)}\nvalues = {pformat(values, indent=0, compact=True)}\n"
+        kinds += "kinds = {name: kind for kind, name in enumerate(names)}\n\n"
+        gen_file.write(TEMPLATE.format(kinds + tokens, formatted_groups, SPACES, scanner_alternatives(groups, comment_mark)))
 
 
 if __name__ == '__main__':
@@ -0,0 +1 @@
+from .transpiler import Transpiler, Program, transpile
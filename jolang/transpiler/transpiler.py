@@ -0,0 +1,323 @@
+import ast as pyast
+import math
+import typing
+import collections
+from ..parser import ast, serializer
+from ..interpreter.resolver import Resolver, Layout
+from ..interpreter.stdlib.builtin_types.Integer import kernels, integers
+
+# code: the module's code object, defining module(); consts: the literals it uses as k0, k1..., plain values
+# the interpreter boxes; positions: (line, column, str and repr of the scope's name) of every node that can fail,
+# for error stacks; source: the Python source code was compiled from
+Program = collections.namedtuple("Program", "code consts positions source")
+
+# the Python operator of every kernel (see builtin_types/Integer.py)
+symbols = {
+    "Add": "+", "Subtract": "-", "Multiply": "*", "Divide": "/", "Modulo": "%", "LessEqual": "<=", "GreatEqual": ">=",
+    "GreaterThan": ">", "LesserThan": "<", "Equals": "==", "NotEqual": "!=", "Or": "|", "And": "&", "Xor": "^",
+    "LeftShift": "<<", "RightShift": ">>",
+}
+
+# (filename, digest of the AST) -> Program, the last max_programs compiled; the AST and not the source is the key,
+# the same source preprocessed with other macros is another program
+cache: typing.Dict[typing.Tuple[str, str], Program] = collections.OrderedDict()
+max_programs = 256
+
+
+def transpile(node: ast.Body, filename: str) -> Program:
+    key = filename, serializer.digest(node)
+    if (program := cache.get(key)) is not None:
+        cache.move_to_end(key)
+        return program
+    program = cache[key] = Transpiler.transpile(node, filename)
+    if len(cache) > max_programs:
+        cache.popitem(last=False)
+    return program
+
+
+def continues(statements) -> bool:
+    # whether the loop running statements has a continue of its own
+    for node in statements:
+        if isinstance(node, ast.Continue):
+            return True
+        if isinstance(node, ast.If) and (continues(node.body) or continues(node.elifs) or continues(node.else_block or [])):
+            return True
+    return False
+
+
+class Transpiler:
+    """
+    Lowers the AST to Python source and compiles it, so CPython runs the loops.
+    Control flow is the VM's (break, continue and return are Python's own); names are resolved like
+    the closure engine does it, every slot of a Layout becomes a Python local and the module's names
+    stay in its namespace, g. Arithmetic on numbers is inlined on raw Python values, everything else
+    calls into the builtin types through the helpers of TranspiledInterpreter.
+    """
+
+    def __init__(self):
+        self.resolver = Resolver()
+        self.lines: typing.List[str] = []
+        self.linemap: typing.List[int] = []  # the JoLang line of every Python line
+        self.consts = []
+        self.const_indexes = {}
+        self.positions = []
+        self.layout_ids: typing.Dict[int, int] = {}
+        self.layout: typing.Optional[Layout] = None
+        self.scope_name = ("module", repr("module"))
+        self.indent = 0
+        self.temps = 0
+
+    @classmethod
+    def transpile(cls, node: ast.Body, filename: str) -> Program:
+        self = cls()
+        self.resolver.resolve(node)
+        self.emit("def module():", node)
+        self.indent += 1
+        # b: the budget (see jolang.interpreter.budget) loops and calls tick, every function reads it once
+        self.emit("b = current_budget.get()", node)
+        self.block(node.statements)
+        self.emit("return null", node)
+        source = "\n".join(self.lines)
+        tree = pyast.parse(source)
+        for py_node in pyast.walk(tree):
+            if hasattr(py_node, "lineno"):
+                py_node.lineno, py_node.end_lineno = self.linemap[py_node.lineno - 1] + 1, self.linemap[py_node.end_lineno - 1] + 1
+                if py_node.end_lineno <= py_node.lineno:
+                    py_node.end_lineno = py_node.lineno
+                    py_node.end_col_offset = max(py_node.col_offset, py_node.end_col_offset)
+        return Program(compile(tree, filename, "exec"), self.consts, self.positions, source)
+
+    def emit(self, line: str, node):
+        self.lines.append("    " * self.indent + line)
+        self.linemap.append(node.line)
+
+    def temp(self) -> str:
+        self.temps += 1
+        return f"t{self.temps}"
+
+    def const(self, value) -> str:
+        key = (type(value), value)
+        if key not in self.const_indexes:
+            self.const_indexes[key] = len(self.consts)
+            self.consts.append(value)
+        return f"k{self.const_indexes[key]}"
+
+    def position(self, node) -> int:
+        self.positions.append((node.line, node.column, *self.scope_name))
+        return len(self.positions) - 1
+
+    def var(self, name: str, layout: Layout) -> str:
+        if id(layout) not in self.layout_ids:
+            self.layout_ids[id(layout)] = len(self.layout_ids)
+        return f"{name}_{self.layout_ids[id(layout)]}"
+
+    def target(self, depth: int, layout: Layout) -> Layout:
+        for _ in range(depth):
+            layout = layout.parent
+        return layout
+
+    def copy_in(self, layout: Layout, node):
+        for slot, ref, name in layout.copy_in:
+            if ref is None:
+                self.emit(f"{self.var(name, layout)} = g.get({name!r}, unbound)", node)
+            else:
+                self.emit(f"{self.var(name, layout)} = {self.var(name, self.target(ref[0], layout.parent))}", node)
+
+    def load(self, node, error="name_error", at=None) -> str:
+        # at: the node the error is reported at, node itself by default
+        name, at = node.argument, at or node
+        if (ref := self.resolver.refs.get(id(node))) is None:
+            return f"(t if (t := g.get({name!r}, unbound)) is not unbound else {error}({name!r}, {self.position(at)}))"
+        layout = self.target(ref[0], self.layout)
+        var = self.var(name, layout)
+        if ref[1] < layout.n_parameters:
+            return var
+        return f"({var} if {var} is not unbound else {error}({name!r}, {self.position(at)}))"
+
+    def block(self, statements):
+        if not statements:
+            self.emit("pass", ast.Node(self.linemap[-1], 0))
+        for statement in statements:
+            self.statement(statement)
+
+    def statement(self, node):
+        if isinstance(node, ast.Function):
+            self.function(node)
+        elif isinstance(node, ast.If):
+            self.if_(node)
+        elif isinstance(node, ast.While):
+            layout, self.layout = self.layout, self.resolver.layouts[id(node)]
+            self.copy_in(self.layout, node)
+            self.loop(node, node.condition, node.body)
+            self.layout = layout
+        elif isinstance(node, ast.For):
+            init, condition, step = node.parts
+            layout, self.layout = self.layout, self.resolver.layouts[id(node)]
+            self.copy_in(self.layout, node)
+            if type(init) is not ast.Node:
+                self.statement(init)
+            self.loop(node, condition, node.body, step)
+            self.layout = layout
+        elif isinstance(node, ast.Return):
+            if isinstance(node.argument, ast.Call) and self.layout is not None:
+                args = self.args(node.argument)
+                self.emit(f"return TailCall({self.callee(node.argument)}, None, {f'({args},)' if args else '()'})", node)
+            else:
+                self.emit(f"return {self.value(node.argument) if node.argument else 'null'}", node)
+        elif isinstance(node, ast.Break):
+            self.emit("break", node)
+        elif isinstance(node, ast.Continue):
+            self.emit("continue", node)
+        elif isinstance(node, ast.Assignment):
+            self.emit(f"{self.store(node.name)} = {self.assignment_value(node)}", node)
+        else:
+            self.emit(self.value(node), node)
+
+    def store(self, node) -> str:
+        if (ref := self.resolver.refs.get(id(node))) is None:
+            return f"g[{node.argument!r}]"
+        return self.var(node.argument, self.target(ref[0], self.layout))
+
+    def function(self, node):
+        name = node.name.argument
+        fn = f"function_{self.temp()}"
+        params = node.params.items
+        layout, scope_name = self.layout, self.scope_name
+        self.layout, self.scope_name = self.resolver.layouts[id(node)], (f"<Function {name!r}>",) * 2
+        # a name given twice is bound to the last argument
+        args = [self.var(param.argument, self.layout) if param.argument not in [p.argument for p in params[i + 1:]]
+                else f"_{i}" for i, param in enumerate(params)]
+        self.emit(f"def {fn}({', '.join(args)}):", node)
+        self.indent += 1
+        self.emit("b = current_budget.get()", node)
+        self.copy_in(self.layout, node)
+        self.block(node.body)
+        self.emit("return null", node)
+        self.indent -= 1
+        self.layout, self.scope_name = layout, scope_name
+        spec = self.const(tuple((param.argument, param.line, param.column) for param in params))
+        self.emit(f"{self.store(node.name)} = function({name!r}, {spec}, {fn})", node)
+
+    def if_(self, node):
+        # like the other engines, every elif is tried once the condition is false, then the else block runs
+        self.emit(f"if {self.condition(node.condition)}:", node.condition)
+        self.indent += 1
+        self.block(node.body)
+        self.indent -= 1
+        if node.elifs or node.else_block:
+            self.emit("else:", node.condition)
+            self.indent += 1
+            for elif_node in node.elifs:
+                self.if_(elif_node)
+            for statement in node.else_block or []:
+                self.statement(statement)
+            self.indent -= 1
+
+    def loop(self, node, condition, body, step=None):
+        self.emit(f"while {'True' if type(condition) is ast.Node else self.condition(condition)}:", node)
+        self.indent += 1
+        self.emit(f"if b is not None: tick(b, {self.position(condition)})", node)
+        if step is None or type(step) is ast.Node:
+            self.block(body)
+        elif not continues(body):
+            self.block(body)
+            self.statement(step)
+        else:
+            # continue has to run the step: the body runs in a loop of its own, the same for-else as eval_for
+            self.emit(f"for {self.temp()} in once:", node)
+            self.indent += 1
+            self.block(body)
+            self.indent -= 1
+            self.emit("else:", node)
+            self.indent += 1
+            self.statement(step)
+            self.emit("continue", node)
+            self.indent -= 1
+            self.emit("break", node)
+        self.indent -= 1
+
+    def condition(self, node) -> str:
+        if self.is_arithmetic(node):
+            return f"(t if (t := {self.number(node)}).__class__ in numbers else t._obj)"
+        return f"{self.value(node)}._obj"
+
+    @staticmethod
+    def is_arithmetic(node) -> bool:
+        return isinstance(node, ast.BinaryNode) and node.op.__class__.__name__ in kernels
+
+    def number(self, node) -> str:
+        # a raw Python number if node evaluates to one, its value otherwise (see Interpreter.eval_number)
+        if isinstance(node, (ast.Integer, ast.Float)) and math.isfinite(node.argument):
+            return repr(node.argument)
+        if self.is_arithmetic(node):
+            op_name = node.op.__class__.__name__
+            raw = "integers" if kernels[op_name][1] is integers else "numbers"
+            left, right = self.temp(), self.temp()
+            if op_name == "Spaceship":
+                operation = f"({left} > {right}) - ({left} < {right})"
+            else:
+                operation = f"{left} {symbols[op_name]} {right}"
+            return (f"({operation} if (({left} := {self.number(node.left)}).__class__ in {raw}) & "
+                    f"(({right} := {self.number(node.right)}).__class__ in {raw}) "
+                    f"else operate({left}, {right}, {op_name!r}, {self.position(node)}))")
+        return f"(t._obj if (t := {self.value(node)}).__class__ in number_boxes else t)"
+
+    def assignment_value(self, node) -> str:
+        if isinstance(node.op, ast.Assign):
+            return self.value(node.content)
+        op_name = node.op.__class__.__name__
+        old = self.load(node.name, "inplace_name_error", node)
+        position = self.position(node)
+        if op_name not in kernels:
+            return f"inplace({old}, {self.value(node.content)}, {op_name!r}, {position})"
+        _, raw, boxes = kernels[op_name]
+        raw, boxes = ("integers", "integer_boxes") if raw is integers else ("numbers", "number_boxes")
+        left, right = self.temp(), self.temp()
+        return (f"(box({left}._obj {symbols[op_name[len('Inplace'):]]} {right}) "
+                f"if (({left} := {old}).__class__ in {boxes}) & (({right} := {self.number(node.content)}).__class__ in {raw}) "
+                f"else inplace({left}, {right}, {op_name!r}, {position}))")
+
+    def callee(self, node) -> str:
+        # the Python function to call, callable_ checks anything that isn't a JoLang function taking that many arguments
+        position = self.position(node)
+        return (f"(t.code if (t := {self.value(node.name)}).__class__ is Function and t.code.__class__ is python_function "
+                f"and len(t.parameters) == {len(node.args.items)} and (b is None or tick(b, {position})) "
+                f"else callable_(t, {len(node.args.items)}, {position}))")
+
+    def args(self, node) -> str:
+        return ", ".join(self.value(arg) for arg in node.args.items if arg)
+
+    def value(self, node) -> str:
+        if isinstance(node, (ast.Integer, ast.Float, ast.String)):
+            return self.const(node.argument)
+        if isinstance(node, ast.Name):
+            return self.load(node)
+        if isinstance(node, ast.Assignment):
+            if (ref := self.resolver.refs.get(id(node.name))) is None:
+                return f"assign({node.name.argument!r}, {self.assignment_value(node)})"
+            return f"({self.var(node.name.argument, self.target(ref[0], self.layout))} := {self.assignment_value(node)})"
+        if isinstance(node, ast.Call):
+            # a call in tail position returns a TailCall instead of running it, the call that gets it runs it
+            return f"(t if (t := {self.callee(node)}({self.args(node)})).__class__ is not TailCall else trampoline(t))"
+        if isinstance(node, ast.Spawn):
+            return f"spawn({self.callee(node.argument)}, [{self.args(node.argument)}])"
+        if self.is_arithmetic(node):
+            return f"(box(t) if (t := {self.number(node)}).__class__ in numbers else t)"
+        if isinstance(node, ast.BinaryNode):
+            if isinstance(node.op, ast.LogicAnd):
+                return f"rebox({self.value(node.left)}._obj and {self.value(node.right)}._obj)"
+            if isinstance(node.op, ast.LogicOr):
+                return f"rebox({self.value(node.left)}._obj or {self.value(node.right)}._obj)"
+            return f"operate({self.value(node.left)}, {self.value(node.right)}, {node.op.__class__.__name__!r}, {self.position(node)})"
+        if isinstance(node, ast.Array):
+            return f"Array([{', '.join(self.value(item) for item in node.items)}])"
+        if isinstance(node, ast.Index):
+            parts = ", ".join(self.value(part) if part else "None" for part in (node.start, node.end, node.step))
+            return f"index({self.value(node.obj)}, {parts}, {self.position(node)})"
+        if isinstance(node, ast.Attribute):
+            return f"attribute({self.value(node.obj)}, {self.const(node.attribute.argument)}, {self.position(node.attribute)})"
+        if isinstance(node, ast.Node):
+            if type(node) is ast.Node:
+                return "null"
+            return f"unary({self.value(node.argument)}, {node.__class__.__name__!r}, {self.position(node)})"
+        raise RuntimeError("Unknown node")
@@ -0,0 +1,32 @@
+from unittest import TestCase
+from jolang.batch import run, run_script
+from jolang.interpreter.budget import Budget
+
+tests_pass = {
+    "print(1)\nprint('a' * 2)": (True, "1\naa\n", None),
+    "print(1)\nx = 1 + 'a'": (False, "1\n", "Traceback (old-to-recent calls):\n"
+                                            "\t File 'a.jo', line 1 column 6 in <scope: module>:\n\t\tx = 1 + 'a'\n"
+                                            "\t\t      ^\nOperatorError: Can't Add with 'Integer' and 'String'\n"),
+    "print(input())": (True, "line\n", None),
+    "x = (": (False, "", "SyntaxError: Parenthesis were not closed at line 0 column 4\n"),
+}
+
+
+class TestBatch(TestCase):
+    def test_run_script(self):
+        for code, expect in tests_pass.items():
+            result = run_script("a.jo", code, "tree", stdin="line\n")
+            self.assertEqual((result.ok, result.stdout, result.error), expect, code)
+
+    def test_run(self):
+        scripts = [(f"{i}.jo", f"x = {i}\nprint(x / {i % 3})") for i in range(6)]
+        results = list(run(scripts, "closure", workers=2))
+        self.assertEqual([result.name for result in results], [name for name, _ in scripts])
+        self.assertEqual([result.ok for result in results], [i % 3 != 0 for i in range(6)])
+        self.assertEqual(results[1].stdout, "1.0\n")
+        # a worker runs scripts one after the other, nothing is left behind
+        results = list(run([("a.jo", "x = 1"), ("b.jo", "print(x)")] * 2, workers=1))
+        self.assertEqual([result.ok for result in results], [True, False] * 2)
+        results = list(run([("a.jo", "while (1) {\n}"), ("b.jo", "print(1)")], "vm", workers=1, budget=Budget(steps=10)))
+        self.assertEqual([result.ok for result in results], [False, True])
+        self.assertTrue(results[0].error.endswith("BudgetError: exceeded the limit of 10 steps\n"))
@@ -0,0 +1,55 @@
+from unittest import TestCase
+from jolang.interpreter.stdlib.builtin_types import empty
+from jolang.interpreter.stdlib.builtin_types.object import dispatch
+from jolang.interpreter.stdlib.builtin_types.Integer import Integer, Float
+from jolang.interpreter.stdlib.builtin_types.String import String
+from jolang.interpreter.stdlib.builtin_types.Array import Array
+from jolang.interpreter.stdlib.builtin_types.Null import Null
+from jolang.interpreter.stdlib.builtin_types.Boolean import Boolean
+from jolang.interpreter.stdlib.builtin_types.Function import Function
+from jolang.interpreter import engines
+from tests.test_interpreter import run
+
+
+class TestBuiltinTypes(TestCase):
+    def test_operate(self):
+        self.assertEqual(Integer(1).operate("Add", Integer(2))._obj, 3)
+        self.assertEqual(Integer(2).operate("Multiply", String("ab"))._obj, "abab")
+        self.assertEqual(Float(1.5).operate("Add", Integer(2))._obj, 3.5)
+        self.assertIs(Integer(1).operate("Add", String("a")), empty)
+        self.assertIs(String("a").operate("Subtract", String("a")), empty)
+        self.assertIs(Array([]).operate("Index", Null(), None, None), empty)
+        self.assertIs(type(Integer(7).operate("Divide", Integer(2))), Float)
+        self.assertIs(type(Float(1.5).operate("Add", Integer(2))), Float)
+        self.assertIs(Integer(1).operate("Or", Float(1.5)), empty)
+        self.assertIs(Float(1.5).operate("UnaryTilde"), empty)
+        self.assertEqual(Array([1, 2, 3]).operate("Index", Integer(1), None, None), 2)
+
+    def test_tables_are_per_class(self):
+        self.assertIs(Integer(1).operators, Integer(2).operators)
+        self.assertIn("InplaceAdd", Integer.operators)
+        self.assertIn("append", Array.attributes)
+        Integer(1).operate("Subtract", Integer(1))
+        self.assertIn(("Subtract", Integer, Integer), dispatch)
+
+    def test_slots(self):
+        for obj in (Integer(1), Float(1.5), String("a"), Array([]), Boolean.true, Null(), Function("f")):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+        self.assertEqual(Function("f", py_bind=print).py_bind, print)
+
+    def test_shared_boxes(self):
+        self.assertIs(Integer.box(7), Integer.box(7))
+        self.assertIs(Integer.box(1).operate("Add", Integer.box(2)), Integer.box(3))
+        self.assertIs(Integer.box(1 == 1), Integer.box(True))
+        self.assertIsNot(Integer.box(True), Integer.box(1))
+        self.assertEqual(repr(Integer.box(True)), "True")
+        self.assertIs(Boolean.box(False), Boolean.false)
+        self.assertIs(Null(), Null())
+
+    def test_big_ints_are_not_shared(self):
+        # a box outside the small ints is never reused, whatever else still refers to it
+        big = Integer.box(10 ** 6)
+        for engine in engines:
+            self.assertEqual(run("x = 2000\ny = x\nx += 1\nz = 5000\nz += 1\nprint(x, y, z)", engine), "2001 2000 5001\n")
+        self.assertIsNot(Integer.box(10 ** 6), big)
+        self.assertEqual(big._obj, 10 ** 6)
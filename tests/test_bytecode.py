@@ -0,0 +1,76 @@
+import io
+import contextlib
+from unittest import TestCase
+from jolang.bytecode import Compiler, dis
+from jolang.bytecode.opcodes import *
+from jolang.parser import Parser
+from jolang.tokenizer import Tokenizer
+from jolang.preprocessor import preprocess
+from jolang.interpreter import VirtualMachine, file
+from jolang import main, Runtime
+from tests.test_interpreter import run
+
+
+def compile_code(code):
+    return Compiler.compile(Parser(preprocess(Tokenizer(code).tokenize())).parse())
+
+
+class TestBytecode(TestCase):
+    tests_pass = {
+        "a = 1 + 2": [LOAD_CONST, LOAD_CONST, BINARY_OP, STORE_NAME, POP_TOP, LOAD_NULL, RETURN_VALUE],
+        "a += 1": [LOAD_INPLACE, LOAD_CONST, INPLACE_OP, STORE_NAME, POP_TOP, LOAD_NULL, RETURN_VALUE],
+        "while (1) {break}": [ENTER_SCOPE, LOAD_CONST, POP_JUMP_IF_FALSE, JUMP, JUMP, EXIT_SCOPE, LOAD_NULL, RETURN_VALUE],
+        "func f() {return 1}": [MAKE_FUNCTION, LOAD_NULL, RETURN_VALUE],
+        "x && y": [LOAD_NAME, JUMP_IF_FALSE_OR_POP, LOAD_NAME, REBOX, POP_TOP, LOAD_NULL, RETURN_VALUE],
+    }
+
+    def test_compile(self):
+        for test, expect in self.tests_pass.items():
+            self.assertEqual(compile_code(test).instructions[::2], expect, test)
+
+    def test_tail_call(self):
+        f = compile_code("func f(n) {return f(n)}").consts[0]
+        self.assertEqual(f.instructions[::2], [LOAD_NAME, LOAD_NAME, TAIL_CALL, RETURN_VALUE, LOAD_NULL, RETURN_VALUE])
+        self.assertEqual(run("func f(n) {\nif (n) {return f(n - 1)}\nreturn print\n}\nf(3000)('done')", "vm"), "done\n")
+
+    def test_constants_are_pooled(self):
+        code = compile_code("a = 1 + 1 + 'x' + 'x'")
+        self.assertEqual([const._obj for const in code.consts], [1, "x"])
+
+    def test_dis(self):
+        out = io.StringIO()
+        dis(compile_code("func f(a) {return a}\nprint(f(1))"), out)
+        self.assertIn("MAKE_FUNCTION", out.getvalue())
+        self.assertIn("Disassembly of <code 'f'>:", out.getvalue())
+
+    def test_jumps(self):
+        # continue and return are real jumps in the vm
+        self.assertEqual(run("for (i = 0; i < 4; i += 1) {\nif (i == 1) {continue}\nprint(i)\nprint(i)\n}", "vm"),
+                         "0\n0\n2\n2\n3\n3\n")
+        self.assertEqual(run("func f() {\nwhile (1) {return 3}\n}\nprint(f())", "vm"), "3\n")
+
+    def test_max_depth(self):
+        code = "func f(n) {\nreturn 1 + f(n)\n}\nf(1)"
+        vm = VirtualMachine(file.File(code, "shell", Parser(preprocess(Tokenizer(code).tokenize())).parse()), max_depth=2)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertRaises(SystemExit):
+            vm.eval()
+        self.assertEqual(stdout.getvalue(), "Traceback (old-to-recent calls):\n"
+                                            "\t File 'shell', line 3 column 1 in 'module':\n\t\tf(1)\n\t\t ^\n"
+                                            + "\t File 'shell', line 1 column 12 in <Function 'f'>:\n\t\treturn 1 + f(n)\n\t\t            ^\n" * 2
+                                            + "RuntimeError: maximum call depth (2) exceeded\n")
+
+    def test_max_depth_option(self):
+        # main takes the depth, a runaway recursion's traceback shows the repeated call three times
+        code = "func f(n) {\nreturn 1 + f(n)\n}\nf(1)"
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertRaises(SystemExit):
+            main(code, "vm", max_depth=50)
+        self.assertEqual(stdout.getvalue(), "Traceback (old-to-recent calls):\n"
+                                            "\t File 'shell', line 3 column 1 in 'module':\n\t\tf(1)\n\t\t ^\n"
+                                            + "\t File 'shell', line 1 column 12 in <Function 'f'>:\n\t\treturn 1 + f(n)\n\t\t            ^\n" * 3
+                                            + "\t [previous call repeated 47 more times]\n"
+                                            + "RuntimeError: maximum call depth (50) exceeded\n")
+        self.assertEqual(Runtime("vm", max_depth=50).interpreter(code, "shell").max_depth, 50)
+        with self.assertRaises(ValueError):
+            main(code, "tree", max_depth=50)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest import mock
+from jolang.cache import Cache, key
+from jolang.cache import cache
+from jolang.tokenizer import Tokenizer
+from jolang.preprocessor import preprocess
+from jolang.parser import Parser
+
+
+def parse(code):
+    return Parser(preprocess(Tokenizer(code).tokenize())).parse()
+
+
+def parse_macros(code):
+    parser = Parser(preprocess(Tokenizer(code).tokenize()))
+    parser.parse()
+    return parser.macros
+
+
+class TestCache(TestCase):
+    def setUp(self):
+        self.cache = Cache(tempfile.mkdtemp())
+
+    def test_parse(self):
+        code = "\n%macro X 5\na = X + 1\nprint(a)"
+        macros = {}
+        self.assertEqual(self.cache.parse(code, macros), parse(code))
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+        loaded = {}
+        with mock.patch.object(cache, "Parser") as parser:
+            self.assertEqual(self.cache.parse(code, loaded), parse(code))
+            parser.assert_not_called()
+        self.assertEqual(repr(loaded), repr(macros))
+
+    def test_key(self):
+        self.assertEqual(key("a = 1"), key("a = 1", {}))
+        self.assertNotEqual(key("a = 1"), key("a = 2"))
+        self.assertNotEqual(key("a = X"), key("a = X", parse_macros("\n%macro X 1\n")))
+        k = key("a = 1")
+        with mock.patch.object(cache, "__version__", "0"):
+            self.assertNotEqual(key("a = 1"), k)
+
+    def test_invalid(self):
+        code = "print(1)"
+        k = key(code)
+        self.cache.parse(code)
+        for data in (b"", cache.MAGIC + k + b"garbage", cache.MAGIC + key("print(2)") + open(self.cache.path(k), "rb").read()[40:]):
+            with open(self.cache.path(k), "wb") as f:
+                f.write(data)
+            self.assertIsNone(self.cache.load(k))
+            self.assertEqual(self.cache.parse(code), parse(code))
+            self.assertIsNotNone(self.cache.load(k))
+
+    def test_unserializable(self):
+        # a tree that can't be stored is parsed again next time
+        code = "print(1)"
+        with mock.patch.object(cache.serializer, "dumps", side_effect=ValueError):
+            self.assertEqual(self.cache.parse(code), parse(code))
+        self.assertEqual(os.listdir(self.cache.directory), [])
+        self.assertIsNone(self.cache.load(key(code)))
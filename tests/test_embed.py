@@ -0,0 +1,100 @@
+import time
+import asyncio
+from unittest import TestCase
+from jolang.embed import Runtime, ScriptError, Budget
+from jolang.interpreter import engines
+from jolang.interpreter.stdlib.std_functions.functions import functions
+
+
+class TestEmbed(TestCase):
+    def test_run(self):
+        for engine in engines:
+            runtime = Runtime(engine)
+            runtime.register("double", lambda x: x * 2)
+            runtime["n"] = 20
+            runtime.run("func f(x) { return double(x) + 1 }\ny = f(n)")
+            runtime.run("y += 1\nz = [y, 'a', 1.5]")
+            self.assertEqual((runtime["y"], runtime["z"]), (42, [42, "a", 1.5]), engine)
+            with self.assertRaises(ScriptError) as error:
+                runtime.run("q = y + 'a'", "q.jo")
+            self.assertEqual(error.exception.error.message, "Can't Add with 'Integer' and 'String'")
+            self.assertIn("File 'q.jo', line 0 column 6", str(error.exception))
+            runtime.reset()
+            self.assertNotIn("y", runtime)
+            self.assertIn("double", runtime)
+            self.assertNotIn("double", functions)
+            with self.assertRaises(ScriptError):
+                runtime.run("y += 1")
+
+    def test_programs(self):
+        runtime = Runtime("closure", programs=2)
+        runtime["x"] = 0
+        for code in ("x += 1", "x += 2", "x += 1", "x += 3"):
+            runtime.run(code)
+        self.assertEqual(runtime["x"], 7)
+        self.assertEqual(list(runtime.programs), [("<embedded>", "x += 1"), ("<embedded>", "x += 3")])
+
+    def test_run_async(self):
+        order = []
+
+        async def fetch(x):
+            order.append(x)
+            await asyncio.sleep(0)
+            order.append(-x)
+            return x * 10
+
+        async def run_all():
+            runtimes = [Runtime("vm") for _ in range(3)]
+            for i, runtime in enumerate(runtimes, 1):
+                runtime.register("fetch", fetch)
+                runtime["i"] = i
+            await asyncio.gather(*(runtime.run_async("func f(n) { return fetch(n) + 1 }\nx = f(i)") for runtime in runtimes))
+            return [runtime["x"] for runtime in runtimes]
+
+        self.assertEqual(asyncio.run(run_all()), [11, 21, 31])
+        # every script got to its await before any went on
+        self.assertEqual(order, [1, 2, 3, -1, -2, -3])
+        runtime = Runtime("tree")
+        runtime.register("fetch", fetch)
+        runtime.run("y = fetch(2)")
+        self.assertEqual(runtime["y"], 20)
+        with self.assertRaises(TypeError):
+            asyncio.run(runtime.run_async("y = 1"))
+
+    def test_spawn(self):
+        # blocking builtins run side by side, this takes the time of one of them
+        for engine in engines:
+            runtime = Runtime(engine)
+            runtime.register("sleep", lambda seconds: time.sleep(seconds) or seconds)
+            start = time.perf_counter()
+            runtime.run("tasks = [spawn sleep(0.2), spawn sleep(0.2), spawn sleep(0.2)]\n"
+                        "x = tasks[0].result() + tasks[1].result() + tasks[2].result()")
+            self.assertLess(time.perf_counter() - start, 0.5, engine)
+            self.assertAlmostEqual(runtime["x"], 0.6)
+
+    def test_budget(self):
+        for engine in engines:
+            runtime = Runtime(engine)
+            for code in ("while (1) {\n}", "for (;;) {\n}", "func f(n) {\nreturn f(n + 1)\n}\nf(0)"):
+                with self.assertRaises(ScriptError) as error:
+                    runtime.run(code, budget=Budget(steps=100))
+                self.assertEqual(error.exception.error.message, "exceeded the limit of 100 steps", engine)
+            self.assertIn("line 1 column 8 in <scope: <Function 'f'>>", str(error.exception))
+            start = time.perf_counter()
+            with self.assertRaises(ScriptError) as error:
+                runtime.run("while (1) {\n}", budget=Budget(seconds=0.1))
+            self.assertEqual(error.exception.error.message, "exceeded the limit of 0.1 seconds")
+            self.assertLess(time.perf_counter() - start, 0.5, engine)
+            # every step takes about three times the last one
+            start = time.perf_counter()
+            with self.assertRaises(ScriptError) as error:
+                runtime.run("x = 3\nwhile (1) {\nx *= x\n}", budget=Budget(seconds=0.2))
+            self.assertEqual(error.exception.error.message, "exceeded the limit of 0.2 seconds")
+            self.assertLess(time.perf_counter() - start, 2, engine)
+            with self.assertRaises(ScriptError) as error:
+                runtime.run("a = []\nwhile (1) {\na.append('abcdef' * 100)\n}", budget=Budget(memory=10 ** 6))
+            self.assertEqual(error.exception.error.message, "exceeded the limit of 1000000 bytes of memory")
+            # exactly 100 steps are allowed, and a budget can be used again
+            budget = Budget(steps=100)
+            runtime.run("for (i = 0; i < 99; i += 1) {}", budget=budget)
+            runtime.run("func g() {\nreturn 0\n}\nfor (i = 0; i < 49; i += 1) {\ng()\n}", budget=budget)
@@ -0,0 +1,73 @@
+from unittest import TestCase
+from jolang.tokenizer import Tokenizer
+from jolang.preprocessor import preprocess
+from jolang.parser import Parser
+from jolang.interpreter import Interpreter, VirtualMachine, file, hooks
+
+code = """x = 0
+func f(a) {
+return a + 1
+}
+func g(n) {
+if (n == 0) {
+return 0
+}
+return g(n - 1)
+}
+while (x < 1) {
+x = f(x)
+}
+for (i = 0; i < 2; i += 1) {
+}
+g(1)"""
+
+
+def interpreter(engine=Interpreter):
+    return engine(file.File(code, "shell", Parser(preprocess(Tokenizer(code).tokenize())).parse()))
+
+
+class TestHooks(TestCase):
+    def trace(self, *events):
+        program, trace = interpreter(), []
+        callback = lambda event, node, scope, value: trace.append((event, node.__class__.__name__, node.line, scope, value))
+        for event in events:
+            program.add_hook(event, callback)
+        program.eval()
+        return program, trace
+
+    def test_calls(self):
+        _, trace = self.trace(hooks.CALL, hooks.RETURN)
+        trace = [(event, line, scope, getattr(value, "_obj", value)) for event, _, line, scope, value in trace]
+        # the tail call returns like any other
+        self.assertEqual(trace, [
+            ("call", 11, "module", "<Function 'f'>"), ("return", 11, "module", 1),
+            ("call", 15, "module", "<Function 'g'>"), ("call", 8, "<Function 'g'>", "<Function 'g'>"),
+            ("return", 8, "<Function 'g'>", 0), ("return", 15, "module", 0),
+        ])
+
+    def test_lines(self):
+        _, trace = self.trace(hooks.LINE, hooks.ITERATION)
+        self.assertEqual([(event, cls, line) for event, cls, line, _, _ in trace[:7]], [
+            ("line", "Assignment", 0), ("line", "Name", 1), ("line", "Name", 4),
+            ("line", "Compare", 10), ("iteration", "While", 12), ("line", "Assignment", 11), ("line", "Return", 2),
+        ])
+        iterations = [(cls, value._obj) for event, cls, _, _, value in trace if event == "iteration"]
+        self.assertEqual(iterations, [("While", True), ("While", False), ("For", True), ("For", True), ("For", False)])
+
+    def test_remove(self):
+        program, trace = self.trace(hooks.LINE, hooks.CALL)
+        self.assertIn("eval", vars(program))
+        callback = program.hooks[hooks.LINE][0]
+        program.remove_hook(hooks.LINE, callback)
+        program.remove_hook(hooks.CALL, callback)
+        self.assertNotIn("eval", vars(program))
+        self.assertNotIn("call", vars(program))
+        count = len(trace)
+        program.eval()
+        self.assertEqual(len(trace), count)
+
+    def test_engines(self):
+        with self.assertRaises(ValueError):
+            interpreter(VirtualMachine).add_hook(hooks.LINE, print)
+        with self.assertRaises(ValueError):
+            interpreter().add_hook("exception", print)
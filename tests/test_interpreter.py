@@ -0,0 +1,59 @@
+import io
+import contextlib
+from unittest import TestCase
+from jolang import main
+from jolang.interpreter import engines
+
+
+def run(code, engine):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        try:
+            main(code, engine)
+        except SystemExit:
+            pass
+    return stdout.getvalue()
+
+
+class TestInterpreter(TestCase):
+    tests_pass = {
+        "func fib(n) {\nif (n < 2) {\nreturn n\n}\nreturn fib(n - 1) + fib(n - 2)\n}\nprint(fib(10))": "55\n",
+        "func mk(a) {\nfunc inner(b) { return a + b }\nreturn inner\n}\nprint(mk(10)(5))": "15\n",
+        "j = 0\nwhile (j < 10) {\nj += 1\nif (j > 3) { break }\nprint(j)\n}\nprint(j)": "1\n2\n3\n0\n",
+        "for (i = 0; i < 3; i += 1) {\nprint(i)\n}": "0\n1\n2\n",
+        "x = 1\nfunc f(a) {\nif (a > 1) { x = a }\ni = 0\nwhile (i < 2) {\ni += 1\nfunc g() { return x + i }\nprint(g())\n}\n"
+        "return i\n}\nprint(f(0), f(5), x)": "2\n3\n6\n7\n0 0 1\n",
+        "func outer(n) {\nfunc mid(m) {\nfunc inner(k) { return n + m + k }\nreturn inner\n}\nreturn mid(n * 2)\n}\n"
+        "print(outer(1)(10))": "13\n",
+        "a = [1, 2, 3]\na.append(4)\nprint(a, a[1], 'ab' * 3)": "[1, 2, 3, 4] 2 ababab\n",
+        "print(7 / 2, 1 == 1, !0, -3, 5 <=> 2, 0 && 1, 0 || 3)": "3.5 True True -3 1 0 3\n",
+        "print(1 + 'a')": "Traceback (old-to-recent calls):\n"
+                         "\t File 'shell', line 0 column 8 in <scope: module>:\n\t\tprint(1 + 'a')\n\t\t        ^\n"
+                         "OperatorError: Can't Add with 'Integer' and 'String'\n",
+        "x = 2\nx += 0.5\nprint(x, 4 / 2, 1 + 2.5 * 2, (1 < 2) + 1, !0 + 1, 2000 * 2000 % 7, 1.5 <=> 2)": "2.5 2.0 6.0 2 2 4 -1\n",
+        "print(1 + 1.5 | 1)": "Traceback (old-to-recent calls):\n"
+                              "\t File 'shell', line 0 column 14 in <scope: module>:\n\t\tprint(1 + 1.5 | 1)\n\t\t              ^\n"
+                              "OperatorError: Can't Or with 'Float' and 'Integer'\n",
+        # deeper than Python's recursion limit allows without tail calls
+        "func count(n, acc) {\nif (n == 0) { return acc }\nreturn count(n - 1, acc + n)\n}\nprint(count(5000, 0))": "12502500\n",
+        "func even(n) {\nif (n == 0) { return 1 }\nreturn odd(n - 1)\n}\nfunc odd(n) {\nif (n == 0) { return 0 }\n"
+        "return even(n - 1)\n}\nprint(even(3001), odd(3001))": "0 1\n",
+        "c = [0]\nfunc count() {\nif (c[-1] == 3000) { return c[-1] }\nc.append(c[-1] + 1)\nreturn count()\n}\nprint(count())":
+            "3000\n",
+        "print(q)": "Traceback (old-to-recent calls):\n"
+                    "\t File 'shell', line 0 column 6 in 'module':\n\t\tprint(q)\n\t\t      ^\n"
+                    "NameError: 'q' doesn't exist in the current scope\n",
+        "func one(a) {\nreturn a + 1\n}\nf = spawn one(1)\nx = [spawn pow(2, 3), spawn one(f.result())]\nspawn one(0)\n"
+        "print(f.result() + x[1].result(), x[0].result(), (spawn one(5)).result(), f, f.done())": "5 8.0 6 <Future done> True\n",
+        # more calls waiting on calls they spawned than the pool has threads
+        "func f(n) {\nif (n < 2) { return n }\na = spawn f(n - 1)\nb = spawn f(n - 2)\nreturn a.result() + b.result()\n}\n"
+        "print(f(9))": "34\n",
+        "func one(a) {\nreturn a\n}\nf = spawn one(1, 2)\nf.result()": "Traceback (old-to-recent calls):\n"
+        "\t File 'shell', line 3 column 13 in <scope: module>:\n\t\tf = spawn one(1, 2)\n\t\t             ^\n"
+        "RuntimeError: one requires 1 arguments but 2 arguments were supplied\n",
+    }
+
+    def test_engines(self):
+        for engine in engines:
+            for test, expect in self.tests_pass.items():
+                self.assertEqual(run(test, engine), expect, f"{engine}: {test!r}")
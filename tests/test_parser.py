@@ -1,31 +1,100 @@
+import time
 from unittest import TestCase
-from jolang.parser import Parser, ast
+from jolang.parser import Parser, ast as parser_ast
+from jolang.parser.lookahead import Lookahead
 from jolang.tokenizer import Tokenizer
 from jolang.preprocessor import preprocess
 
 
+class Positionless:
+    # ast.X(...) builds parser_ast.X without its line and column
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: getattr(parser_ast, name)(None, None, *args, **kwargs)
+
+
+ast = Positionless()
+
+
+def strip(node):
+    # node with the line and column of it and its children set to None
+    if isinstance(node, list):
+        for item in node:
+            strip(item)
+    elif isinstance(node, parser_ast.Ast):
+        for field in node.fields():
+            strip(getattr(node, field))
+        node.line = node.column = None
+    return node
+
+
 class TestParser(TestCase):
     tests_pass = {
         "func a(){for(;;){if(x){x}}}": ast.Body(statements=[ast.Function(name=ast.Name(argument='a'), params=ast.Arguments(items=[]), body=[ast.For(parts=[ast.Node(argument=None), ast.Node(argument=None), ast.Node(argument=None)], body=[ast.If(condition=ast.Name(argument='x'), body=[ast.Name(argument='x')], elifs=[], else_block=None)])])]),
-        "for(1;a=b;){continue\nbreak\nif(x){~y}}": ast.Body(statements=[ast.For(parts=[ast.Number(argument=1), ast.Assignment(name=ast.Name(argument='a'), op=ast.Assign(), content=ast.Name(argument='b')), ast.Node(argument=None)], body=[ast.Continue(argument=None), ast.Break(argument=None), ast.If(condition=ast.Name(argument='x'), body=[ast.UnaryTilde(argument=ast.Name(argument='y'))], elifs=[], else_block=None)])]),
+        "for(1;a=b;){continue\nbreak\nif(x){~y}}": ast.Body(statements=[ast.For(parts=[ast.Integer(argument=1), ast.Assignment(name=ast.Name(argument='a'), op=ast.Assign(), content=ast.Name(argument='b')), ast.Node(argument=None)], body=[ast.Continue(argument=None), ast.Break(argument=None), ast.If(condition=ast.Name(argument='x'), body=[ast.UnaryTilde(argument=ast.Name(argument='y'))], elifs=[], else_block=None)])]),
         "a=b<(c=k)": ast.Body(statements=[ast.Assignment(name=ast.Name(argument='a'), op=ast.Assign(), content=ast.Compare(left=ast.Name(argument='b'), op=ast.LesserThan(), right=ast.Assignment(name=ast.Name(argument='c'), op=ast.Assign(), content=ast.Name(argument='k'))))]),
         "a=b=c=d": ast.Body(statements=[ast.Assignment(name=ast.Name(argument='a'), op=ast.Assign(), content=ast.Assignment(name=ast.Name(argument='b'), op=ast.Assign(), content=ast.Assignment(name=ast.Name(argument='c'), op=ast.Assign(), content=ast.Name(argument='d'))))]),
-        "1<2>3<=4>=5": ast.Body(statements=[ast.Compare(left=ast.Compare(left=ast.Compare(left=ast.Compare(left=ast.Number(argument=1), op=ast.LesserThan(), right=ast.Number(argument=2)), op=ast.GreaterThan(), right=ast.Number(argument=3)), op=ast.LessEqual(), right=ast.Number(argument=4)), op=ast.GreatEqual(), right=ast.Number(argument=5))]),
-        "b - 1": ast.Body(statements=[ast.BinaryNode(left=ast.Name(argument='b'), op=ast.Subtract(), right=ast.Number(argument=1))]),
-        "b += 1": ast.Body(statements=[ast.Assignment(name=ast.Name(argument='b'), op=ast.InplaceAdd(), content=ast.Number(argument=1))]),
-        "~~b---1": ast.Body(statements=[ast.BinaryNode(left=ast.UnaryTilde(argument=ast.UnaryTilde(argument=ast.Name(argument='b'))), op=ast.Subtract(), right=ast.UnarySubtract(argument=ast.UnarySubtract(argument=ast.Number(argument=1))))]),
-        "-b(2, 4, 5) + c(3,4, 4)": ast.Body(statements=[ast.BinaryNode(left=ast.UnarySubtract(argument=ast.Call(name=ast.Name(argument='b'), args=ast.Arguments(items=[ast.Number(argument=2), ast.Number(argument=4), ast.Number(argument=5)]))), op=ast.Add(), right=ast.Call(name=ast.Name(argument='c'), args=ast.Arguments(items=[ast.Number(argument=3), ast.Number(argument=4), ast.Number(argument=4)])))]),
-        "0xcafe+0o567+0b100": ast.Body(statements=[ast.BinaryNode(left=ast.BinaryNode(left=ast.Number(argument=51966), op=ast.Add(), right=ast.Number(argument=375)), op=ast.Add(), right=ast.Number(argument=4))]),
-        "if(x){if(1){}}elif(y){2}else{3}": ast.Body(statements=[ast.If(condition=ast.Name(argument='x'), body=[ast.If(condition=ast.Number(argument=1), body=[], elifs=[], else_block=None)], elifs=[ast.If(condition=ast.Name(argument='y'), body=[ast.Number(argument=2)], elifs=[], else_block=[ast.Number(argument=3)])], else_block=None)]),
+        "1<2>3<=4>=5": ast.Body(statements=[ast.Compare(left=ast.Compare(left=ast.Compare(left=ast.Compare(left=ast.Integer(argument=1), op=ast.LesserThan(), right=ast.Integer(argument=2)), op=ast.GreaterThan(), right=ast.Integer(argument=3)), op=ast.LessEqual(), right=ast.Integer(argument=4)), op=ast.GreatEqual(), right=ast.Integer(argument=5))]),
+        "b - 1": ast.Body(statements=[ast.BinaryNode(left=ast.Name(argument='b'), op=ast.Subtract(), right=ast.Integer(argument=1))]),
+        "b += 1": ast.Body(statements=[ast.Assignment(name=ast.Name(argument='b'), op=ast.InplaceAdd(), content=ast.Integer(argument=1))]),
+        "~~b---1": ast.Body(statements=[ast.BinaryNode(left=ast.UnaryTilde(argument=ast.UnaryTilde(argument=ast.Name(argument='b'))), op=ast.Subtract(), right=ast.UnarySubtract(argument=ast.UnarySubtract(argument=ast.Integer(argument=1))))]),
+        "-b(2, 4, 5) + c(3,4, 4)": ast.Body(statements=[ast.BinaryNode(left=ast.UnarySubtract(argument=ast.Call(name=ast.Name(argument='b'), args=ast.Arguments(items=[ast.Integer(argument=2), ast.Integer(argument=4), ast.Integer(argument=5)]))), op=ast.Add(), right=ast.Call(name=ast.Name(argument='c'), args=ast.Arguments(items=[ast.Integer(argument=3), ast.Integer(argument=4), ast.Integer(argument=4)])))]),
+        "0xcafe+0o567+0b100": ast.Body(statements=[ast.BinaryNode(left=ast.BinaryNode(left=ast.Integer(argument=51966), op=ast.Add(), right=ast.Integer(argument=375)), op=ast.Add(), right=ast.Integer(argument=4))]),
+        "if(x){if(1){}}elif(y){2}else{3}": ast.Body(statements=[ast.If(condition=ast.Name(argument='x'), body=[ast.If(condition=ast.Integer(argument=1), body=[], elifs=[], else_block=None)], elifs=[ast.If(condition=ast.Name(argument='y'), body=[ast.Integer(argument=2)], elifs=[], else_block=[ast.Integer(argument=3)])], else_block=None)]),
+        "a || b && c == d | e ^ f & g << h >> i + j * k": ast.Body(statements=[ast.BinaryNode(left=ast.Name(argument='a'), op=ast.LogicOr(), right=ast.BinaryNode(left=ast.Name(argument='b'), op=ast.LogicAnd(), right=ast.Compare(left=ast.Name(argument='c'), op=ast.Equals(), right=ast.BinaryNode(left=ast.Name(argument='d'), op=ast.Or(), right=ast.BinaryNode(left=ast.Name(argument='e'), op=ast.Xor(), right=ast.BinaryNode(left=ast.Name(argument='f'), op=ast.And(), right=ast.BinaryNode(left=ast.BinaryNode(left=ast.Name(argument='g'), op=ast.LeftShift(), right=ast.Name(argument='h')), op=ast.RightShift(), right=ast.BinaryNode(left=ast.Name(argument='i'), op=ast.Add(), right=ast.BinaryNode(left=ast.Name(argument='j'), op=ast.Multiply(), right=ast.Name(argument='k'))))))))))]),
+        "a * b - c % d / e && f": ast.Body(statements=[ast.BinaryNode(left=ast.BinaryNode(left=ast.BinaryNode(left=ast.Name(argument='a'), op=ast.Multiply(), right=ast.Name(argument='b')), op=ast.Subtract(), right=ast.BinaryNode(left=ast.BinaryNode(left=ast.Name(argument='c'), op=ast.Modulo(), right=ast.Name(argument='d')), op=ast.Divide(), right=ast.Name(argument='e'))), op=ast.LogicAnd(), right=ast.Name(argument='f'))]),
         "%macro name 'xyz'\nprint(name)": ast.Body(statements=[ast.Call(name=ast.Name(argument='print'), args=ast.Arguments(items=[ast.String(argument='xyz')]))])
     }
-    tests_fail = ["%macr", "-", "2-", "2=", "=s", "2+", "a=2=g", "func(){}", "if(){}", "continue", "return", "l&", "@", "{}", "a+a=b", "t>>", "'", '"', '*', "for(;){}", "for{}", "k l", "if(){}", "1 l", "l !r"]
+    tests_fail = ["%macr", "-", "2-", "2=", "=s", "2+", "a=2=g", "func(){}", "if(){}", "continue", "return", "l&", "@", "{}", "a+a=b", "t>>", "t<<", "1 <=>", "'", '"', '*', "for(;){}", "for{}", "k l", "if(){}", "1 l", "l !r"]
 
     def test_parser_pass(self):
         for test, expect in self.tests_pass.items():
-            t = Parser(preprocess(Tokenizer(test).tokenize())).parse()
+            t = strip(Parser(preprocess(Tokenizer(test).tokenize())).parse())
             self.assertEqual(t, expect)
 
     def test_parser_fail(self):
         for test in self.tests_fail:
             self.assertRaises(SyntaxError, lambda: Parser(preprocess(Tokenizer(test).tokenize())).parse())
+
+
+class TestLookahead(TestCase):
+    def tokens(self):
+        return list(Tokenizer("a b c d").tokenize())
+
+    def test_take_and_peek(self):
+        a, b, c, d = self.tokens()[:4]
+        stream = iter([a, b, c, d])
+        lookahead = Lookahead(stream)
+        self.assertIs(lookahead.peek(2), c)
+        self.assertIs(lookahead.peek(), a)
+        # peeking only reads as far as it looks
+        self.assertIs(next(stream), d)
+        self.assertEqual([lookahead.take() for _ in range(4)], [a, b, c, None])
+        self.assertIsNone(lookahead.peek(3))
+
+    def test_push(self):
+        a, b, c = self.tokens()[:3]
+        lookahead = Lookahead(iter([c]))
+        lookahead.push(b)
+        lookahead.push(a)
+        self.assertIs(lookahead.peek(1), b)
+        self.assertIs(lookahead.peek(2), c)
+        self.assertIsNone(lookahead.peek(3))
+        self.assertEqual([lookahead.take() for _ in range(5)], [a, b, c, None, None])
+        # a token pushed back once the stream is over is still taken first
+        lookahead.push(a)
+        self.assertIs(lookahead.take(), a)
+        self.assertIsNone(lookahead.take())
+
+    def test_push_is_constant(self):
+        # pushing back and taking a token costs the same in front of 10 buffered tokens as in front of 10 ** 6
+        a = self.tokens()[0]
+
+        def push_and_take(buffered):
+            lookahead = Lookahead(iter([a] * buffered))
+            lookahead.peek(buffered - 1)
+            start = time.perf_counter()
+            for _ in range(10_000):
+                lookahead.push(lookahead.take())
+            return time.perf_counter() - start
+
+        self.assertLess(push_and_take(10 ** 6), push_and_take(10) * 10)
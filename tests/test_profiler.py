@@ -0,0 +1,61 @@
+import io
+import contextlib
+from unittest import TestCase
+from jolang.profiler import Profiler
+
+code = """func fib(n) {
+if (n < 2) {
+return n
+}
+return fib(n - 1) + fib(n - 2)
+}
+func spin(n) {
+for (i = 0; i < n; i += 1) {
+x = i * i
+}
+return n
+}
+print(fib(10))
+print(spin(20000))"""
+
+
+class TestProfiler(TestCase):
+    def profile(self, profiler):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            profiler.run(code)
+        self.assertEqual(stdout.getvalue(), "55\n20000\n")
+        return profiler
+
+    def test_deterministic(self):
+        profiler = self.profile(Profiler())
+        functions = profiler.functions()
+        self.assertEqual({name: calls for name, (calls, _, _) in functions.items()},
+                         {"<module>": 0, "fib": 177, "spin": 1, "print": 2})
+        calls, own, total = functions["spin"]
+        self.assertEqual(own, total)
+        self.assertGreater(own, functions["print"][1])
+        self.assertAlmostEqual(functions["<module>"][2], sum(profiler.stacks.values()))
+        self.assertEqual(max(profiler.lines, key=profiler.lines.get)[0], "spin")
+        self.assertIn(("fib", 4), profiler.lines)
+        self.assertEqual(profiler.stack, [("<module>",)])
+
+    def test_collapsed(self):
+        lines = self.profile(Profiler()).collapsed().splitlines()
+        stacks = dict(line.rsplit(" ", 1) for line in lines)
+        self.assertIn("<module>;spin", stacks)
+        self.assertIn("<module>;fib;fib;fib", stacks)
+        self.assertTrue(all(count.isdigit() for count in stacks.values()))
+
+    def test_report(self):
+        report = self.profile(Profiler()).report(limit=3)
+        header, spin = report.splitlines()[:2]
+        self.assertEqual(header.split(), ["function", "calls", "self", "total"])
+        self.assertEqual(spin.split()[:2], ["spin", "1"])
+        self.assertIn("x = i * i", report)
+
+    def test_sampling(self):
+        profiler = self.profile(Profiler(sampling=True, interval=0.0005))
+        self.assertEqual(profiler.calls["fib"], 177)
+        self.assertIn(("<module>", "spin"), profiler.stacks)
+        self.assertGreater(profiler.functions()["spin"][1], 0)
@@ -0,0 +1,33 @@
+from unittest import TestCase
+from jolang.parser import ast, serializer
+from tests.test_cache import parse
+
+tests_pass = [
+    "a = 1\nb = -2.5 * a\nprint(a, b, \"é\")",
+    "func f(x, y) {\nif (x > y) {return x} elif (x == y) {return 0} else {y = 1}\nreturn y\n}\nprint(f(1, 2))",
+    "for (i = 0; i < 10; i += 1) {\nif (i % 2) {continue}\nx = [i, [i]][1:]\n}",
+    "while (1) {break}\nprint(12345678901234567890)",
+    # the empty parentheses are at column -1
+    "()\nprint(1)",
+]
+
+
+class TestSerializer(TestCase):
+    def test_round_trip(self):
+        for code in tests_pass:
+            node = parse(code)
+            data = serializer.dumps(node)
+            self.assertEqual(serializer.loads(data), node)
+            self.assertEqual(repr(serializer.loads(data)), repr(node))
+            self.assertEqual(serializer.digest(parse(code)), serializer.digest(node))
+        values = (None, True, False, 0, -1, 2 ** 70, -2 ** 70, 1.5, "", [1, (2, "a")], ast.Add(3, 200), ast.Add(-1, -200))
+        self.assertEqual(serializer.loads(serializer.dumps(values)), values)
+        self.assertNotEqual(serializer.digest(parse("a = 1")), serializer.digest(parse("a = 2")))
+
+    def test_invalid(self):
+        data = serializer.dumps(parse(tests_pass[1]))
+        for bad in (b"", b"JOAST\0", data[:-1], data + b"\0", data.replace(b"Function", b"Fnuction")):
+            with self.assertRaises(ValueError):
+                serializer.loads(bad)
+        with self.assertRaises(TypeError):
+            serializer.dumps(object())
@@ -1,7 +1,68 @@
+import io
+import random
+import string
 from unittest import TestCase
 from jolang.tokenizer import Tokenizer, tokens
 
 
+def reference_tokenize(code):
+    # a character at a time with no regex, like the tokenizer before the generated scanner; the scanner must agree
+    # (positions as (name, content, line, col), or the SyntaxError's message)
+    out, i, line, line_start = [], 0, 0, 0
+    while i < len(code):
+        char, col = code[i], i - line_start
+        if char in "'\"":
+            end = code.find(char, i + 1)
+            if end == -1:
+                return "String was never closed"
+            out.append(("STRING", code[i + 1:end], line, col))
+            if (newlines := code.count("\n", i, end)) > 0:
+                line, line_start = line + newlines, code.rfind("\n", i, end) + 1
+            i = end + 1
+        elif char == "\n":
+            out.append(("NEWLINE", None, 0, 0))
+            i, line, line_start = i + 1, line + 1, i + 1
+        elif char in string.whitespace:
+            i += 1
+        elif char in string.digits:
+            end = i
+            while end < len(code) and code[end] in string.ascii_letters + string.digits + ".":
+                end += 1
+            try:
+                number = Tokenizer("").tokenize_number(code[i:end])
+            except SyntaxError as error:
+                return str(error)
+            out.append((number.name, number.content, line, col))
+            i = end
+        elif char in string.ascii_letters + "_":
+            end = i
+            while end < len(code) and code[end] in string.ascii_letters + string.digits + "_":
+                end += 1
+            out.append(("IDENTIFIER", code[i:end], line, col))
+            i = end
+        elif (op := tokens.one_char(char)) is None:
+            return f"Invalid syntax at {line}:{col} [{char!r}]"
+        elif op == tokens.Comment:
+            # the newline ending a comment is skipped with it
+            end = code.find("\n", i)
+            if end == -1:
+                break
+            i, line, line_start = end + 1, line + 1, end + 1
+        else:
+            if (two := tokens.two_chars(code[i:i + 2])) is not None:
+                op = tokens.three_chars(code[i:i + 3]) or two
+            out.append((op.name, None, line, col))
+            i += len(op.value)
+    return out
+
+
+def scan(code):
+    try:
+        return [(t.name, t.content, t.line, t.col) for t in Tokenizer(code).tokenize()]
+    except SyntaxError as error:
+        return str(error)
+
+
 class TestTokenizer(TestCase):
     tests_pass = {
         "+": [tokens.Add],
@@ -29,3 +90,32 @@ class TestTokenizer(TestCase):
     def test_tokenizer_fail(self):
         for test in self.tests_fail:
             self.assertRaises(SyntaxError, lambda: list(Tokenizer(test).tokenize()))
+
+    def test_tokenizer_stream(self):
+        code = "func f(a) {\n\treturn a <<= 0x1f $ é\n}\ns = 'x\ny€' + f(1.5)\n"
+        expect = [(t.name, t.content, t.line, t.col) for t in Tokenizer(code).tokenize()]
+        for chunk_size in (1, 2, 3, 64):
+            stream = Tokenizer(io.BytesIO(code.encode()), chunk_size=chunk_size).tokenize()
+            self.assertEqual([(t.name, t.content, t.line, t.col) for t in stream], expect)
+        self.assertRaises(SyntaxError, lambda: list(Tokenizer(io.BytesIO(b"a = 'b\nc"), chunk_size=2).tokenize()))
+
+    def test_tokenizer_kinds(self):
+        first, operator, second = Tokenizer("name += " + "".join(["na", "me"])).tokenize()
+        self.assertEqual((first.kind, operator.kind, second.kind), (tokens.IDENTIFIER, tokens.INPLACE_ADD, tokens.IDENTIFIER))
+        self.assertIs(first.content, second.content)
+        self.assertEqual((operator.name, operator.value, operator.line, operator.col), ("INPLACE_ADD", "+=", 0, 5))
+
+    def test_scanner(self):
+        # the generated scanner against reference_tokenize
+        for code in ("a<<=b>>=c<=>d", "a+++b---c", "a==b!=c<=d>=e<f>g", "a&&b||c&b|c^d", "x=-1", "!~a", "<=>=", ">>>", "<<<",
+                     "===", "a=>b", "1 2.5 0o17 0xFF 0B11", "1.", "1a", "12abc", "1.5.2", "0x1fz", "0b102", "a1b2 _x __y9",
+                     "'abc", "\"abc", "'a\"b' \"a'b\"", "x = 'a\nb' + c\nd", "x = 'é€' + \"\"", "a $ comment\nb", "a $",
+                     "a\n\n  b\n c+\n", "f(1,2)[3:4:5]\n", "a.b.c()", "a @ b", "\t a\t=\t1", "a\r\nb", "a;b",
+                     "if(x){y}elif(z){w}else{v}"):
+            self.assertEqual(scan(code), reference_tokenize(code), repr(code))
+        # and on random ones
+        pieces = list("_0f. \n'\"$<>=!+-&|*%/^~()[]{},:;é") + ["b1", "12", "0x"]
+        generator = random.Random(0)
+        for _ in range(1000):
+            code = "".join(generator.choices(pieces, k=generator.randint(1, 12)))
+            self.assertEqual(scan(code), reference_tokenize(code), repr(code))
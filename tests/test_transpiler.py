@@ -0,0 +1,61 @@
+import io
+import traceback
+import contextlib
+import collections
+from unittest import TestCase
+from unittest import mock
+from jolang import main
+from jolang.transpiler import transpile, transpiler
+from jolang.parser import Parser, serializer
+from jolang.tokenizer import Tokenizer, tokens
+from jolang.preprocessor import preprocess
+from tests.test_interpreter import run
+
+
+def parse(code):
+    return Parser(preprocess(Tokenizer(code).tokenize())).parse()
+
+
+class TestTranspiler(TestCase):
+    def test_cache(self):
+        code = "a = 1\nprint(a + 2)"
+        program = transpile(parse(code), "shell")
+        self.assertIs(transpile(parse(code), "shell"), program)
+        self.assertIsNot(transpile(parse(code), "other"), program)
+        self.assertTrue(program.source.startswith("def module():"))
+
+    def test_cache_macros(self):
+        # the source is the same, the program isn't
+        code = "print(X)\n"
+        outputs = []
+        for value in ("1", "2"):
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                main(code, "python", macros={("IDENTIFIER", "X"): [tokens.Token(tokens.INTEGER, value, 0, 0)]})
+            outputs.append(stdout.getvalue())
+        self.assertEqual(outputs, ["1\n", "2\n"])
+
+    def test_cache_size(self):
+        # the least recently used program is dropped
+        with mock.patch.object(transpiler, "max_programs", 2), mock.patch.object(transpiler, "cache", collections.OrderedDict()):
+            first = transpile(parse("print(1)"), "shell")
+            transpile(parse("print(2)"), "shell")
+            self.assertIs(transpile(parse("print(1)"), "shell"), first)
+            transpile(parse("print(3)"), "shell")
+            self.assertEqual(list(transpiler.cache), [("shell", serializer.digest(parse(f"print({n})"))) for n in (1, 3)])
+
+    def test_lines(self):
+        # Python's own errors point at the JoLang line
+        try:
+            run("a = 1\n\nfunc f(x) {\nreturn x / 0\n}\nf(a)", "python")
+        except ZeroDivisionError as error:
+            frames = traceback.extract_tb(error.__traceback__)
+            self.assertEqual([(frame.filename, frame.lineno) for frame in frames[-2:]], [("shell", 6), ("shell", 4)])
+        else:
+            self.fail("no ZeroDivisionError")
+
+    def test_control_flow(self):
+        # like the vm
+        self.assertEqual(run("for (i = 0; i < 4; i += 1) {\nif (i == 1) {continue}\nif (i == 3) {break}\nprint(i)\n}", "python"),
+                         "0\n2\n")
+        self.assertEqual(run("func f() {\nwhile (1) {return 3}\n}\nprint(f())", "python"), "3\n")